@@ -4,10 +4,18 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from fastapi import HTTPException, Request
 import logging
 
+from services.core.query_stats import instrument_engine
+from services.core.db_pool import pool_monitor, pool_options
+from services.core.query_profile import query_profiler  # noqa: F401 - fingerprint 통계 리스너 등록
+from services.core.db_routing import ReplicaRouter
+from services.core.sharding import ShardRouter, ShardNotFoundError, load_shard_map, shard_for_id
+
 logging.basicConfig()  # 로깅 레벨 설정
 logging.getLogger('sqlalchemy.engine').setLevel(logging.ERROR)
 
@@ -27,23 +35,69 @@ def get_ssl_config():
         }
     return None
 
+ssl_config = get_ssl_config()
+
+def _create_engine(url: str, name: str, pool_prefix: str):
+    """풀 설정(services/core/db_pool.py) + SSL + 쿼리 계측을 적용한 엔진 생성 (예열/ping 대상으로 등록)"""
+    if ssl_config:
+        new_engine = create_engine(url, connect_args={"ssl": ssl_config}, **pool_options(url, pool_prefix))
+    else:
+        new_engine = create_engine(url, **pool_options(url, pool_prefix))
+    # 요청별 쿼리 수/DB 시간 집계 및 N+1 탐지 (services/core/query_stats.py)
+    instrument_engine(new_engine, name.split(":")[0])
+    return pool_monitor.register(name, new_engine, pool_prefix)
+
 # 기존 로또 앱용 데이터베이스 연결
 SQLALCHEMY_DATABASE_URL = os.getenv("mysql")
-ssl_config = get_ssl_config()
-if ssl_config:
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True, connect_args={"ssl": ssl_config})
-else:
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+engine = _create_engine(SQLALCHEMY_DATABASE_URL, "lotto", "LOTTO")
 
 # SmallStep 전용 데이터베이스 연결
 SMALLSTEP_DATABASE_URL = os.getenv("smallstep_mysql")
-if ssl_config:
-    smallstep_engine = create_engine(SMALLSTEP_DATABASE_URL, pool_pre_ping=True, connect_args={"ssl": ssl_config})
-else:
-    smallstep_engine = create_engine(SMALLSTEP_DATABASE_URL, pool_pre_ping=True)
+smallstep_engine = _create_engine(SMALLSTEP_DATABASE_URL, "smallstep", "SMALLSTEP")
+
+# SmallStep 읽기 복제본 (설정하지 않으면 모든 읽기가 primary로 감)
+SMALLSTEP_REPLICA_DATABASE_URL = os.getenv("smallstep_mysql_replica")
+smallstep_read_engine = None
+if SMALLSTEP_REPLICA_DATABASE_URL:
+    smallstep_read_engine = _create_engine(SMALLSTEP_REPLICA_DATABASE_URL, "smallstep_replica", "SMALLSTEP_REPLICA")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 smallstep_SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=smallstep_engine)
+smallstep_read_SessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=smallstep_read_engine)
+    if smallstep_read_engine is not None else smallstep_SessionLocal
+)
+
+# user_id 샤딩 (SMALLSTEP_SHARD_MAP이 없으면 샤드 0 = smallstep_mysql 하나) - services/core/sharding.py
+def _create_shard_engine(url: str):
+    return _create_engine(url, f"smallstep_shard:{make_url(url).database}", "SMALLSTEP_SHARD")
+
+smallstep_shards = ShardRouter(
+    load_shard_map(SMALLSTEP_DATABASE_URL),
+    _create_shard_engine,
+    engines={SMALLSTEP_DATABASE_URL: smallstep_engine},
+)
+
+# 읽기 라우팅 (GET/@read_replica → 복제본, 최근 쓰기/복제 지연 시 primary) - services/core/db_routing.py
+smallstep_replica_router = ReplicaRouter(
+    smallstep_read_engine,
+    max_lag=float(os.getenv("SMALLSTEP_REPLICA_MAX_LAG", "2")),
+    sticky_seconds=float(os.getenv("SMALLSTEP_READ_YOUR_WRITES_SECONDS", "5")),
+)
+
+def _replica_serves_shard0() -> bool:
+    """읽기 복제본은 smallstep_mysql의 복제본이므로 샤드 0이 그 DB일 때만 사용 (샤드 맵에서 0을 옮기면 사용 안 함)"""
+    return smallstep_read_engine is not None and smallstep_shards.engine(0) is smallstep_engine
+
+def smallstep_sessionmakers() -> dict:
+    """SmallStep 읽기 경로의 세션 팩토리 전체 (primary, 복제본, 샤드) - 엔진별 warm-up용"""
+    makers = {"smallstep": smallstep_shards.sessionmaker(0)}
+    if _replica_serves_shard0():
+        makers["smallstep_replica"] = smallstep_read_SessionLocal
+    for shard in smallstep_shards.shards:
+        if shard != 0:
+            makers[f"smallstep_shard{shard}"] = smallstep_shards.sessionmaker(shard)
+    return makers
 
 def get_db():
     db = SessionLocal()
@@ -52,9 +106,49 @@ def get_db():
     finally:
         db.close()
 
-def get_smallstep_db():
-    db = smallstep_SessionLocal()
+def _request_shard(request: Request = None) -> int:
+    """경로/쿼리의 user_id, goal_id, task_id ... 로 샤드 결정 (샤드 키가 없으면 0)"""
+    if request is None or not smallstep_shards.is_sharded:
+        return 0
+    try:
+        shard = smallstep_shards.shard_for_params({**request.query_params, **request.path_params})
+        if shard is not None:
+            smallstep_shards.engine(shard)
+    except ShardNotFoundError:
+        raise HTTPException(status_code=404, detail="요청한 리소스를 찾을 수 없습니다.")
+    return shard or 0
+
+def use_user_shard(db, user_id: int):
+    """요청 본문에만 user_id가 있는 쓰기 핸들러에서 세션을 사용자 샤드로 전환 (첫 쿼리 전에 호출)"""
+    if not smallstep_shards.is_sharded:
+        return db
+    try:
+        return smallstep_shards.bind_session(db, shard_for_id(user_id))
+    except ShardNotFoundError:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+
+def use_new_user_shard(db, email: str = None):
+    """신규 사용자 생성 세션을 배치 대상 샤드로 전환 (생성되는 id가 샤드를 인코딩)"""
+    if not smallstep_shards.is_sharded:
+        return db
+    return smallstep_shards.bind_session(db, smallstep_shards.shard_for_new_user(email))
+
+def get_smallstep_db(request: Request = None):
+    """쓰기 핸들러용 세션 - 샤드 맵을 따르며 샤드 0도 맵의 URL로 연결 (smallstep_mysql과 같으면 smallstep_engine 재사용)"""
+    db = smallstep_shards.session(_request_shard(request))
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_smallstep_read_db(request: Request):
+    """읽기 전용 핸들러용 세션 - 조건이 맞으면 복제본, 아니면 해당 샤드의 primary (복제본은 샤드 0에만 있음)"""
+    shard = _request_shard(request)
+    if shard == 0 and _replica_serves_shard0() and smallstep_replica_router.choose(request) == "replica":
+        db = smallstep_read_SessionLocal()
+    else:
+        db = smallstep_shards.session(shard)
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,57 +1,78 @@
 # gunicorn.conf.py
 from datetime import datetime
 import os
-import logging.handlers
+import sys
+import logging
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.core.logging_queue import queued_file_log, restart_after_fork, stop_all
 
 if not os.path.exists("/app/log"):
     os.makedirs("/app/log")
     #os.makedirs("/app/log/apiServer")
 
+# 파일 로그는 모두 큐 뒤에서 리스너 스레드가 기록 (요청 스레드는 큐에 넣기만 함) - services/core/logging_queue.py
+# 매일 자정 회전(워커 간 잠금으로 한 번만), 최대 30개 파일 보존. LOG_JSON=1이면 JSON lines
 log_file = f"/app/log/access.log"
 
-# Configure the logging handler to use TimedRotatingFileHandler
-log_handler = logging.handlers.TimedRotatingFileHandler(
-    log_file, when="midnight", interval=1, backupCount=30)  # 매일 분리하고 최대 30개 파일 보존
-
-log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-log_handler.setFormatter(logging.Formatter(log_format))
-
 log = logging.getLogger("gunicorn.error")
-log.addHandler(log_handler)
+log.addHandler(queued_file_log("access", log_file))
 log.setLevel(logging.INFO)
 
 # SmallStep 분석 로그 설정
 smallstep_log_file = "/app/log/smallstep_analytics.log"
-smallstep_handler = logging.handlers.TimedRotatingFileHandler(
-    smallstep_log_file, when="midnight", interval=1, backupCount=30
-)
-smallstep_handler.setFormatter(logging.Formatter(log_format))
 
 smallstep_analytics_log = logging.getLogger("smallstep.analytics")
-smallstep_analytics_log.addHandler(smallstep_handler)
+smallstep_analytics_log.addHandler(queued_file_log("analytics", smallstep_log_file))
 smallstep_analytics_log.setLevel(logging.INFO)
 smallstep_analytics_log.propagate = False  # 중복 로깅 방지
 
 # 에러 전용 로그 설정 (모든 ERROR 레벨 통합)
 error_log_file = "/app/log/error.log"
-error_handler = logging.handlers.TimedRotatingFileHandler(
-    error_log_file, when="midnight", interval=1, backupCount=30
-)
-error_handler.setLevel(logging.ERROR)  # ERROR 레벨만 수집
-error_handler.setFormatter(logging.Formatter(log_format))
 
 # 루트 로거에 에러 핸들러 추가 (모든 에러 캐치)
 root_logger = logging.getLogger()
-root_logger.addHandler(error_handler)
+root_logger.addHandler(queued_file_log("error", error_log_file, level=logging.ERROR))  # ERROR 레벨만 수집
 
 bind = "0.0.0.0:80"
 workers = 2
 worker_class = "uvicorn.workers.UvicornWorker"
-reload = True
+# GUNICORN_PRELOAD=1: 마스터가 앱을 한 번 import/준비하고 워커가 copy-on-write로 공유 (services/core/prefork.py)
+# preload 모드에서는 코드 변경 시 재시작이 필요하므로 reload를 끔
+preload_app = os.getenv("GUNICORN_PRELOAD") == "1"
+reload = not preload_app
 loglevel = "info"
 forwarded_allow_ips = "*"
 
 
+def when_ready(server):
+    # fork 직전 마스터에서 무거운 준비 (AI 스택 import, mapper, openapi.json, gc.freeze)
+    if preload_app:
+        from services.core.prefork import prepare_master
+        prepare_master()
+
+
+def post_fork(server, worker):
+    # 로그 리스너 스레드는 fork를 넘어오지 않으므로 워커마다 새로 시작
+    restart_after_fork()
+    # 상속받은 DB 풀/AI 클라이언트를 워커 전용으로 새로 만듦
+    if preload_app:
+        from services.core.prefork import after_fork
+        after_fork()
+
+
+def worker_exit(server, worker):
+    # 버퍼에 남은 분석 이벤트와 큐에 남은 로그를 기록하고 종료
+    from services.core.analytics_sink import event_sink
+    event_sink.flush()
+    stop_all()
+
+
+def on_exit(server):
+    stop_all()
+
+
 
 # from datetime import datetime
 # import os
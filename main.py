@@ -3,13 +3,28 @@
 import logging
 from fastapi.logger import logger as fastapi_logger
 
+from contextlib import asynccontextmanager
+import threading
 from dotenv import load_dotenv
 import os
 from typing import Union
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from router.lotto import lotto
 from router.smallstep import smallstep
+from services.core.responses import DEFAULT_RESPONSE_CLASS
+from services.core.compression import CompressionMiddleware, MessagePackMiddleware
+from services.core.query_stats import QueryStatsMiddleware
+from services.core.db_routing import ReadYourWritesMiddleware
+from services.core.db_pool import pool_monitor
+from services.core.logging_queue import render_metrics as render_log_metrics
+from services.core.analytics_sink import event_sink
+from services.core.admin import require_admin
+from services.core.warmup import OpenAPICache, run_warmup, warmup_state
+from services.ai.client import start_background_warmup as start_ai_warmup
+from database import smallstep_replica_router, smallstep_shards, smallstep_sessionmakers
 
 
 load_dotenv()
@@ -17,6 +32,33 @@ mode = os.getenv("MODE")
 
 VERSION = "2.0.0"
 
+
+def _warmup():
+    run_warmup(app, openapi_cache, smallstep_sessionmakers(), extra_steps={"db_pool": pool_monitor.warm_all})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 워커 시작 시 DB 커넥션 예열 + mapper/핫 쿼리/openapi.json 준비 (services/core/warmup.py)
+    # 샤드 엔진은 지연 생성이므로 먼저 만들어 둠
+    smallstep_shards.engines()
+    if os.getenv("WARMUP", "1") == "0":
+        await run_in_threadpool(pool_monitor.warm_all)
+        warmup_state.ready = True
+    elif os.getenv("WARMUP_BACKGROUND") == "1":
+        threading.Thread(target=_warmup, name="warmup", daemon=True).start()
+    else:
+        await run_in_threadpool(_warmup)
+    # litellm/instructor는 요청 경로 밖에서 미리 로드 (AI_WARMUP=0이면 첫 AI 호출 시 로드)
+    if os.getenv("AI_WARMUP", "1") == "1":
+        start_ai_warmup()
+    pool_monitor.start()
+    yield
+    pool_monitor.stop()
+    # 버퍼에 남은 분석 이벤트 기록 (services/core/analytics_sink.py)
+    await run_in_threadpool(event_sink.flush)
+
+
 app = FastAPI(
     title="API Server",
     version=VERSION,
@@ -80,8 +122,27 @@ app = FastAPI(
     },
     docs_url="/api/docs", 
     openapi_url="/api/openapi.json", 
-    redoc_url=None
+    redoc_url=None,
+    default_response_class=DEFAULT_RESPONSE_CLASS,
+    lifespan=lifespan,
+)
+
+# /api/openapi.json은 warm-up 때 만든 JSON/압축본을 그대로 응답
+openapi_cache = OpenAPICache(app)
+openapi_cache.install()
+
+# 응답 인코딩: MessagePack(Accept: application/msgpack) 변환 후 zstd/br/gzip 압축 (나중에 추가한 미들웨어가 바깥쪽)
+app.add_middleware(MessagePackMiddleware)
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")))
+# 요청별 쿼리 수/DB 시간 (DEV에서 X-DB-* 헤더, QUERY_BUDGET_STRICT=1이면 @query_budget 초과 시 500)
+app.add_middleware(
+    QueryStatsMiddleware,
+    headers=mode == "DEV" or os.getenv("QUERY_STATS_HEADERS") == "1",
+    strict=os.getenv("QUERY_BUDGET_STRICT") == "1",
 )
+# 복제본 사용 시: 쓰기 직후 같은 클라이언트의 읽기를 잠시 primary로 (read-your-writes)
+if smallstep_replica_router.enabled:
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=smallstep_replica_router.sticky_seconds)
 
 if mode == "PROD":
     gunicorn_error_logger = logging.getLogger("gunicorn.error")
@@ -103,6 +164,18 @@ async def root():
         {"version": "1.0.0.0", "detail":"fastApi 시작"},
     ]
 
+@app.get("/api/ready", include_in_schema=False)
+def ready():
+    """readiness probe - warm-up이 끝나기 전에는 503"""
+    return JSONResponse(warmup_state.to_dict(), status_code=200 if warmup_state.ready else 503)
+
+
+@app.get("/metrics", include_in_schema=False, response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+def metrics():
+    """Prometheus 수집용 지표 (DB 커넥션 풀 - services/core/db_pool.py, 로그 큐 - services/core/logging_queue.py,
+    분석 이벤트 - services/core/analytics_sink.py)"""
+    return pool_monitor.render_metrics() + render_log_metrics() + event_sink.render_metrics()
+
 
 app.include_router(lotto.router)
 app.include_router(smallstep)
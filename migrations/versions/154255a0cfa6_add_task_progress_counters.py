@@ -0,0 +1,75 @@
+"""add_task_progress_counters
+
+Revision ID: 154255a0cfa6
+Revises: 4b1df40c231e
+Create Date: 2026-10-19 10:02:47.117392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import INTEGER
+
+
+# revision identifiers, used by Alembic.
+revision: str = '154255a0cfa6'
+down_revision: Union[str, Sequence[str], None] = '4b1df40c231e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PLAN_COUNTERS = ['completed_count', 'skipped_count', 'remaining_count']
+PHASE_COUNTERS = ['completed_task_count', 'skipped_task_count', 'remaining_task_count']
+
+
+def upgrade() -> None:
+    """Add denormalized task progress counters to weekly plans and phases."""
+    for col in PLAN_COUNTERS:
+        op.add_column('SMALLSTEP_WEEKLY_PLANS', sa.Column(col, INTEGER(11), nullable=False, server_default=sa.text('0')))
+    for col in PHASE_COUNTERS:
+        op.add_column('SMALLSTEP_PHASES', sa.Column(col, INTEGER(11), nullable=False, server_default=sa.text('0')))
+
+    # ===== Backfill weekly plan counters from tasks =====
+    op.execute("""
+        UPDATE SMALLSTEP_WEEKLY_PLANS wp
+        LEFT JOIN (
+            SELECT
+                weekly_plan_id,
+                SUM(status = 'COMPLETED') AS completed_count,
+                SUM(status = 'SKIPPED') AS skipped_count,
+                SUM(status IN ('AVAILABLE', 'LOCKED')) AS remaining_count
+            FROM SMALLSTEP_TASKS
+            GROUP BY weekly_plan_id
+        ) t ON t.weekly_plan_id = wp.id
+        SET
+            wp.completed_count = COALESCE(t.completed_count, 0),
+            wp.skipped_count = COALESCE(t.skipped_count, 0),
+            wp.remaining_count = COALESCE(t.remaining_count, 0)
+    """)
+
+    # ===== Roll weekly plan counters up to phases =====
+    op.execute("""
+        UPDATE SMALLSTEP_PHASES p
+        LEFT JOIN (
+            SELECT
+                phase_id,
+                SUM(completed_count) AS completed_count,
+                SUM(skipped_count) AS skipped_count,
+                SUM(remaining_count) AS remaining_count
+            FROM SMALLSTEP_WEEKLY_PLANS
+            GROUP BY phase_id
+        ) wp ON wp.phase_id = p.id
+        SET
+            p.completed_task_count = COALESCE(wp.completed_count, 0),
+            p.skipped_task_count = COALESCE(wp.skipped_count, 0),
+            p.remaining_task_count = COALESCE(wp.remaining_count, 0)
+    """)
+
+
+def downgrade() -> None:
+    """Drop task progress counters."""
+    for col in PHASE_COUNTERS:
+        op.drop_column('SMALLSTEP_PHASES', col)
+    for col in PLAN_COUNTERS:
+        op.drop_column('SMALLSTEP_WEEKLY_PLANS', col)
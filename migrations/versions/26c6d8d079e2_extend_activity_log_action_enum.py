@@ -0,0 +1,39 @@
+"""extend_activity_log_action_enum
+
+Revision ID: 26c6d8d079e2
+Revises: f2b89fb398f9
+Create Date: 2026-10-19 13:05:12.640981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '26c6d8d079e2'
+down_revision: Union[str, Sequence[str], None] = 'f2b89fb398f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Allow weekly/phase bonus actions in SMALLSTEP_ACTIVITY_LOG.
+
+    Task completion now runs in a single transaction, so a rejected bonus
+    log row would roll back the whole completion.
+    """
+    op.execute("""
+        ALTER TABLE SMALLSTEP_ACTIVITY_LOG
+        MODIFY COLUMN action ENUM('COMPLETED', 'SKIPPED', 'WEEKLY_COMPLETED_BONUS', 'PHASE_COMPLETED_BONUS') NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    """Restrict action back to COMPLETED/SKIPPED (bonus rows are removed)."""
+    op.execute("DELETE FROM SMALLSTEP_ACTIVITY_LOG WHERE action IN ('WEEKLY_COMPLETED_BONUS', 'PHASE_COMPLETED_BONUS')")
+    op.execute("""
+        ALTER TABLE SMALLSTEP_ACTIVITY_LOG
+        MODIFY COLUMN action ENUM('COMPLETED', 'SKIPPED') NOT NULL
+    """)
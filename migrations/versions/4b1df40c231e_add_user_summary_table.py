@@ -0,0 +1,55 @@
+"""add_user_summary_table
+
+Revision ID: 4b1df40c231e
+Revises: 6aa5de1290fe
+Create Date: 2026-10-19 09:12:04.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import INTEGER
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1df40c231e'
+down_revision: Union[str, Sequence[str], None] = '6aa5de1290fe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create SMALLSTEP_USER_SUMMARY read model and backfill it."""
+    op.create_table(
+        'SMALLSTEP_USER_SUMMARY',
+        sa.Column('user_id', INTEGER(11), sa.ForeignKey('SMALLSTEP_USERS.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('total_goals', INTEGER(11), nullable=False, server_default=sa.text('0')),
+        sa.Column('completed_goals', INTEGER(11), nullable=False, server_default=sa.text('0')),
+        sa.Column('completed_phases', INTEGER(11), nullable=False, server_default=sa.text('0')),
+        sa.Column('completed_tasks', INTEGER(11), nullable=False, server_default=sa.text('0')),
+        sa.Column('updated_at', sa.DateTime, nullable=False,
+                  server_default=sa.text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')),
+        comment='SmallStep 사용자 대시보드 요약 테이블 (읽기 모델)',
+    )
+
+    # ===== Backfill from source tables =====
+    op.execute("""
+        INSERT INTO SMALLSTEP_USER_SUMMARY (user_id, total_goals, completed_goals, completed_phases, completed_tasks)
+        SELECT
+            u.id,
+            (SELECT COUNT(*) FROM SMALLSTEP_GOALS g WHERE g.user_id = u.id),
+            (SELECT COUNT(*) FROM SMALLSTEP_GOALS g WHERE g.user_id = u.id AND g.status = 'completed'),
+            (SELECT COUNT(*) FROM SMALLSTEP_PHASES p
+                JOIN SMALLSTEP_GOALS g ON g.id = p.goal_id
+                WHERE g.user_id = u.id AND p.status = 'COMPLETED'),
+            (SELECT COUNT(*) FROM SMALLSTEP_TASKS t
+                JOIN SMALLSTEP_GOALS g ON g.id = t.goal_id
+                WHERE g.user_id = u.id AND t.status = 'COMPLETED')
+        FROM SMALLSTEP_USERS u
+    """)
+
+
+def downgrade() -> None:
+    """Drop SMALLSTEP_USER_SUMMARY."""
+    op.drop_table('SMALLSTEP_USER_SUMMARY')
@@ -0,0 +1,58 @@
+"""add_composite_indexes_for_hot_queries
+
+Revision ID: f2b89fb398f9
+Revises: 154255a0cfa6
+Create Date: 2026-10-19 11:24:31.802216
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b89fb398f9'
+down_revision: Union[str, Sequence[str], None] = '154255a0cfa6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns, access path)
+# scripts/explain_hot_queries.py 로 각 경로의 EXPLAIN 결과를 확인할 수 있습니다.
+COMPOSITE_INDEXES = [
+    # /tasks/today: WHERE goal_id = ? AND status = 'AVAILABLE' ORDER BY task_order
+    ('ix_tasks_goal_status_order', 'SMALLSTEP_TASKS', ['goal_id', 'status', 'task_order']),
+    # _activate_next_task: WHERE weekly_plan_id = ? AND task_order > ? ORDER BY task_order LIMIT 1
+    ('ix_tasks_plan_order', 'SMALLSTEP_TASKS', ['weekly_plan_id', 'task_order']),
+    # 스트릭 계산: WHERE user_id = ? AND action = 'COMPLETED' AND completed_at >= ? (커버링)
+    ('ix_activity_log_user_action_completed', 'SMALLSTEP_ACTIVITY_LOG', ['user_id', 'action', 'completed_at']),
+    # 주간 통계 XP 합계: WHERE user_id = ? AND completed_at BETWEEN ? AND ? (xp_earned 포함 커버링)
+    ('ix_activity_log_user_completed', 'SMALLSTEP_ACTIVITY_LOG', ['user_id', 'completed_at', 'xp_earned']),
+    # /weekly-plans/current: WHERE goal_id = ? ORDER BY week_start_date DESC LIMIT 1
+    ('ix_weekly_plans_goal_week', 'SMALLSTEP_WEEKLY_PLANS', ['goal_id', 'week_start_date']),
+    # Phase별 주간 계획 목록: WHERE phase_id = ? ORDER BY week_start_date
+    ('ix_weekly_plans_phase_week', 'SMALLSTEP_WEEKLY_PLANS', ['phase_id', 'week_start_date']),
+    # Phase 목록/다음 Phase 조회: WHERE goal_id = ? [AND phase_order > ?] ORDER BY phase_order
+    ('ix_phases_goal_order', 'SMALLSTEP_PHASES', ['goal_id', 'phase_order']),
+]
+
+
+def upgrade() -> None:
+    """Add composite indexes for SmallStep hot query paths."""
+    conn = op.get_bind()
+
+    for index_name, table, columns in COMPOSITE_INDEXES:
+        existing = conn.execute(sa.text(f"SHOW INDEX FROM {table} WHERE Key_name = :name"), {"name": index_name}).fetchall()
+        if not existing:
+            op.create_index(index_name, table, columns)
+
+
+def downgrade() -> None:
+    """Drop composite indexes."""
+    conn = op.get_bind()
+
+    for index_name, table, columns in reversed(COMPOSITE_INDEXES):
+        existing = conn.execute(sa.text(f"SHOW INDEX FROM {table} WHERE Key_name = :name"), {"name": index_name}).fetchall()
+        if existing:
+            op.drop_index(index_name, table_name=table)
@@ -1,4 +1,4 @@
-from sqlalchemy import CHAR, Column, DateTime, ForeignKey, String, Text, text, Enum, Integer, Boolean, TIMESTAMP, JSON
+from sqlalchemy import CHAR, Column, DateTime, ForeignKey, String, Text, text, Enum, Integer, Boolean, TIMESTAMP, JSON, Index
 from sqlalchemy.dialects.mysql import BIGINT, INTEGER, LONGTEXT
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
@@ -87,7 +87,10 @@ class SMALLSTEP_GOALS(Base):
 
 class SMALLSTEP_PHASES(Base):
     __tablename__ = 'SMALLSTEP_PHASES'
-    __table_args__ = {'comment': 'SmallStep 단계 테이블'}
+    __table_args__ = (
+        Index('ix_phases_goal_order', 'goal_id', 'phase_order'),
+        {'comment': 'SmallStep 단계 테이블'},
+    )
 
     id = Column(INTEGER(11), primary_key=True)
     goal_id = Column(ForeignKey('SMALLSTEP_GOALS.id'), nullable=False, index=True)
@@ -98,6 +101,10 @@ class SMALLSTEP_PHASES(Base):
     status = Column(Enum('PENDING', 'ACTIVE', 'COMPLETED'), default='PENDING')
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
+    # 태스크 진행 롤업 (TaskStateMachine 전환 시 갱신)
+    completed_task_count = Column(INTEGER(11), nullable=False, default=0, server_default=text("0"))
+    skipped_task_count = Column(INTEGER(11), nullable=False, default=0, server_default=text("0"))
+    remaining_task_count = Column(INTEGER(11), nullable=False, default=0, server_default=text("0"))
     created_at = Column(DateTime, nullable=False, server_default=text("current_timestamp()"))
 
     goals = relationship('SMALLSTEP_GOALS', back_populates='phases')
@@ -106,7 +113,11 @@ class SMALLSTEP_PHASES(Base):
 
 class SMALLSTEP_WEEKLY_PLANS(Base):
     __tablename__ = 'SMALLSTEP_WEEKLY_PLANS'
-    __table_args__ = {'comment': 'SmallStep 주간 계획 테이블'}
+    __table_args__ = (
+        Index('ix_weekly_plans_goal_week', 'goal_id', 'week_start_date'),
+        Index('ix_weekly_plans_phase_week', 'phase_id', 'week_start_date'),
+        {'comment': 'SmallStep 주간 계획 테이블'},
+    )
 
     id = Column(INTEGER(11), primary_key=True)
     goal_id = Column(ForeignKey('SMALLSTEP_GOALS.id'), nullable=False, index=True)
@@ -115,6 +126,10 @@ class SMALLSTEP_WEEKLY_PLANS(Base):
     week_end_date = Column(DateTime, nullable=False)
     ai_context = Column(JSON, nullable=True)
     ai_response = Column(JSON, nullable=True)
+    # 태스크 진행 카운터 (TaskStateMachine 전환 시 갱신)
+    completed_count = Column(INTEGER(11), nullable=False, default=0, server_default=text("0"))
+    skipped_count = Column(INTEGER(11), nullable=False, default=0, server_default=text("0"))
+    remaining_count = Column(INTEGER(11), nullable=False, default=0, server_default=text("0"))
     created_at = Column(DateTime, nullable=False, server_default=text("current_timestamp()"))
 
     phases = relationship('SMALLSTEP_PHASES', back_populates='weekly_plans')
@@ -123,7 +138,11 @@ class SMALLSTEP_WEEKLY_PLANS(Base):
 
 class SMALLSTEP_TASKS(Base):
     __tablename__ = 'SMALLSTEP_TASKS'
-    __table_args__ = {'comment': 'SmallStep 작업 테이블'}
+    __table_args__ = (
+        Index('ix_tasks_goal_status_order', 'goal_id', 'status', 'task_order'),
+        Index('ix_tasks_plan_order', 'weekly_plan_id', 'task_order'),
+        {'comment': 'SmallStep 작업 테이블'},
+    )
 
     id = Column(INTEGER(11), primary_key=True)
     weekly_plan_id = Column(ForeignKey('SMALLSTEP_WEEKLY_PLANS.id'), nullable=False, index=True)
@@ -142,14 +161,29 @@ class SMALLSTEP_TASKS(Base):
 
 class SMALLSTEP_ACTIVITY_LOG(Base):
     __tablename__ = 'SMALLSTEP_ACTIVITY_LOG'
-    __table_args__ = {'comment': 'SmallStep 활동 로그 테이블'}
+    __table_args__ = (
+        Index('ix_activity_log_user_action_completed', 'user_id', 'action', 'completed_at'),
+        Index('ix_activity_log_user_completed', 'user_id', 'completed_at', 'xp_earned'),
+        {'comment': 'SmallStep 활동 로그 테이블'},
+    )
 
     id = Column(INTEGER(11), primary_key=True)
     user_id = Column(ForeignKey('SMALLSTEP_USERS.id'), nullable=False, index=True)
     task_id = Column(ForeignKey('SMALLSTEP_TASKS.id'), nullable=True, index=True)
     goal_id = Column(ForeignKey('SMALLSTEP_GOALS.id'), nullable=True, index=True)
-    action = Column(Enum('COMPLETED', 'SKIPPED'), nullable=False)
+    action = Column(Enum('COMPLETED', 'SKIPPED', 'WEEKLY_COMPLETED_BONUS', 'PHASE_COMPLETED_BONUS'), nullable=False)
     xp_earned = Column(INTEGER(11), default=0)
     completed_at = Column(DateTime, nullable=False, server_default=text("current_timestamp()"))
 
-    SMALLSTEP_USERS = relationship('SMALLSTEP_USERS')
\ No newline at end of file
+    SMALLSTEP_USERS = relationship('SMALLSTEP_USERS')
+
+class SMALLSTEP_USER_SUMMARY(Base):
+    __tablename__ = 'SMALLSTEP_USER_SUMMARY'
+    __table_args__ = {'comment': 'SmallStep 사용자 대시보드 요약 테이블 (읽기 모델)'}
+
+    user_id = Column(ForeignKey('SMALLSTEP_USERS.id', ondelete='CASCADE'), primary_key=True)
+    total_goals = Column(INTEGER(11), nullable=False, default=0, server_default=text("0"))
+    completed_goals = Column(INTEGER(11), nullable=False, default=0, server_default=text("0"))
+    completed_phases = Column(INTEGER(11), nullable=False, default=0, server_default=text("0"))
+    completed_tasks = Column(INTEGER(11), nullable=False, default=0, server_default=text("0"))
+    updated_at = Column(DateTime, nullable=False, server_default=text("current_timestamp() ON UPDATE current_timestamp()"))
@@ -12,6 +12,7 @@ router.include_router(goals.router)
 router.include_router(users.router)
 router.include_router(llm.router)
 router.include_router(system.router)
+router.include_router(system.admin_router)
 router.include_router(phases.router)
 router.include_router(weekly_plans.router)
 router.include_router(tasks.router)
@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
-from database import get_smallstep_db
-from models import SMALLSTEP_GOALS
-from schemas.smallstep.goals import Goal, GoalCreate, GoalUpdate
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, BackgroundTasks
+from sqlalchemy.orm import Session, selectinload
+from database import get_smallstep_db, get_smallstep_read_db, use_user_shard
+from models import SMALLSTEP_GOALS, SMALLSTEP_PHASES, SMALLSTEP_WEEKLY_PLANS
+from schemas.smallstep.goals import Goal, GoalCreate, GoalUpdate, GoalTree
+from schemas.smallstep.pagination import CursorPage
+from services.pagination import keyset_paginate, InvalidCursorError, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from services.sparse_fields import sparse_fields, with_fields, narrow, sparse_response
+from services.core.responses import typed_response, dump_json, raw_json_response
+from services.core.query_stats import query_budget
+from services.core.warmup import hot_read
+from services.core.cache import read_cache, goal_tag, user_tag, invalidate_on_commit
+from services.core.etag import make_etag, is_not_modified, not_modified, set_etag
 from services.ai.phase_generator import generate_phases
-from typing import List
+from services.user_summary import UserSummaryService
+from services.analytics import GoalCreated, GoalStatusChanged, emit_on_commit
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -43,6 +53,7 @@ def create_goal(
     db: Session = Depends(get_smallstep_db)
 ):
     """새로운 목표 생성"""
+    use_user_shard(db, goal.user_id)
     try:
         db_goal = SMALLSTEP_GOALS(
             user_id=goal.user_id,
@@ -55,6 +66,12 @@ def create_goal(
             current_level=1
         )
         db.add(db_goal)
+        db.flush()
+        UserSummaryService(db).on_goal_created(goal.user_id)
+        emit_on_commit(db, GoalCreated(
+            user_id=goal.user_id, goal_id=db_goal.id, goal_type=db_goal.goal_type,
+            has_deadline=db_goal.deadline_date is not None,
+        ))
         db.commit()
         db.refresh(db_goal)
         
@@ -67,21 +84,102 @@ def create_goal(
         logger.error(f"Goal creation failed: {str(e)}")
         raise HTTPException(status_code=400, detail="목표 생성 중 오류가 발생했습니다.")
 
-@router.get("/goals", response_model=List[Goal],
+@router.get("/goals", response_model=CursorPage[Goal],
             summary="사용자의 목표 목록 조회")
-def get_user_goals(user_id: int, db: Session = Depends(get_smallstep_db)):
-    """사용자의 목표 목록 조회"""
-    goals = db.query(SMALLSTEP_GOALS).filter(SMALLSTEP_GOALS.user_id == user_id).all()
-    return goals
+def get_user_goals(user_id: int,
+                   cursor: Optional[str] = None,
+                   limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                   fields: Optional[List[str]] = Depends(sparse_fields(Goal)),
+                   db: Session = Depends(get_smallstep_read_db)):
+    """사용자의 목표 목록 조회 (생성 순, 키셋 페이지네이션 - next_cursor를 ?cursor= 로 전달)"""
+    query = with_fields(db.query(SMALLSTEP_GOALS).filter(SMALLSTEP_GOALS.user_id == user_id), SMALLSTEP_GOALS, fields)
+    try:
+        goals, next_cursor = keyset_paginate(query, [SMALLSTEP_GOALS.id], cursor, limit, descending=False)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fields:
+        return sparse_response({"items": [narrow(g, fields) for g in goals], "next_cursor": next_cursor})
+    return {"items": goals, "next_cursor": next_cursor}
 
 @router.get("/goals/{goal_id}", response_model=Goal,
             summary="목표 상세 조회")
-def get_goal(goal_id: int, db: Session = Depends(get_smallstep_db)):
-    """목표 상세 조회"""
-    goal = db.query(SMALLSTEP_GOALS).filter(SMALLSTEP_GOALS.id == goal_id).first()
+def get_goal(goal_id: int, request: Request,
+             fields: Optional[List[str]] = Depends(sparse_fields(Goal)),
+             db: Session = Depends(get_smallstep_read_db)):
+    """목표 상세 조회 (?fields= 로 응답 필드 선택 가능, ETag 지원, 전체 필드 응답은 읽기 캐시 사용)"""
+    cache_key = f"goal:{goal_id}"
+    cached = None if fields else read_cache.get(cache_key)
+    if cached is not None:
+        etag, body = cached
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        return set_etag(raw_json_response(body), etag)
+
+    if request.headers.get("if-none-match"):
+        version = db.query(SMALLSTEP_GOALS.updated_at, SMALLSTEP_GOALS.status).filter(SMALLSTEP_GOALS.id == goal_id).first()
+        if not version:
+            raise HTTPException(status_code=404, detail="목표를 찾을 수 없습니다.")
+        etag = make_etag("goal", goal_id, tuple(version), fields)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+    tag_versions = read_cache.tag_versions([goal_tag(goal_id)])
+    goal = with_fields(db.query(SMALLSTEP_GOALS), SMALLSTEP_GOALS, fields, always=('updated_at', 'status')).filter(SMALLSTEP_GOALS.id == goal_id).first()
+    if not goal:
+        raise HTTPException(status_code=404, detail="목표를 찾을 수 없습니다.")
+    etag = make_etag("goal", goal_id, (goal.updated_at, goal.status), fields)
+    if fields:
+        return set_etag(sparse_response(narrow(goal, fields)), etag)
+    body = dump_json(Goal, goal)
+    read_cache.set(cache_key, (etag, body), tag_versions)
+    return set_etag(raw_json_response(body), etag)
+
+# 트리 단계별 컬럼 목록 (depth로 자르고 한 번에 dict로 직렬화)
+_TREE_PLAN_FIELDS = ('id', 'week_start_date', 'week_end_date', 'completed_count', 'skipped_count',
+                     'remaining_count', 'created_at')
+_TREE_PHASE_FIELDS = ('id', 'phase_order', 'phase_title', 'phase_description', 'estimated_weeks', 'status',
+                      'started_at', 'completed_at', 'completed_task_count', 'skipped_task_count',
+                      'remaining_task_count')
+_TREE_GOAL_FIELDS = ('id', 'user_id', 'title', 'goal_text', 'goal_type', 'deadline_date', 'status',
+                     'current_level', 'created_at', 'updated_at')
+
+@router.get("/goals/{goal_id}/tree", response_model=GoalTree,
+            summary="목표 로드맵 트리 조회")
+@query_budget(4)
+@hot_read(goal_id=SMALLSTEP_GOALS, depth=3)
+def get_goal_tree(goal_id: int,
+                  depth: int = Query(3, ge=0, le=3, description="0=목표, 1=+Phase, 2=+주간 계획, 3=+태스크"),
+                  db: Session = Depends(get_smallstep_read_db)):
+    """목표 → Phase → 주간 계획 → 태스크를 한 번에 조회합니다.
+
+    단계마다 selectinload 한 번씩만 실행하므로 Phase/주간 계획 수와 무관하게 최대 4개의 쿼리로 끝납니다.
+    """
+    query = db.query(SMALLSTEP_GOALS).filter(SMALLSTEP_GOALS.id == goal_id)
+    if depth >= 1:
+        loader = selectinload(SMALLSTEP_GOALS.phases)
+        if depth >= 2:
+            loader = loader.selectinload(SMALLSTEP_PHASES.weekly_plans)
+        if depth >= 3:
+            loader = loader.selectinload(SMALLSTEP_WEEKLY_PLANS.tasks)
+        query = query.options(loader)
+    goal = query.first()
     if not goal:
         raise HTTPException(status_code=404, detail="목표를 찾을 수 없습니다.")
-    return goal
+
+    tree = {field: getattr(goal, field) for field in _TREE_GOAL_FIELDS}
+    if depth >= 1:
+        tree['phases'] = []
+        for phase in sorted(goal.phases, key=lambda p: p.phase_order):
+            phase_node = {field: getattr(phase, field) for field in _TREE_PHASE_FIELDS}
+            if depth >= 2:
+                phase_node['weekly_plans'] = []
+                for plan in sorted(phase.weekly_plans, key=lambda p: p.week_start_date):
+                    plan_node = {field: getattr(plan, field) for field in _TREE_PLAN_FIELDS}
+                    if depth >= 3:
+                        plan_node['tasks'] = sorted(plan.tasks, key=lambda t: t.task_order)
+                    phase_node['weekly_plans'].append(plan_node)
+            tree['phases'].append(phase_node)
+    return typed_response(GoalTree, tree)
 
 @router.put("/goals/{goal_id}/status", response_model=Goal,
             summary="목표 상태 업데이트")
@@ -91,6 +189,7 @@ def update_goal_status(goal_id: int, goal_update: GoalUpdate, db: Session = Depe
     if not db_goal:
         raise HTTPException(status_code=404, detail="목표를 찾을 수 없습니다.")
     
+    old_status = db_goal.status
     update_data = goal_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         if value is not None:
@@ -100,13 +199,31 @@ def update_goal_status(goal_id: int, goal_update: GoalUpdate, db: Session = Depe
                 db_goal.status = value.value
             else:
                 setattr(db_goal, field, value)
+
+    UserSummaryService(db).on_goal_status_changed(db_goal.user_id, old_status, db_goal.status)
+    invalidate_on_commit(db, goal_tag(goal_id), user_tag(db_goal.user_id))
+    if db_goal.status != old_status:
+        emit_on_commit(db, GoalStatusChanged(
+            user_id=db_goal.user_id, goal_id=goal_id, old_status=old_status, new_status=db_goal.status,
+        ))
     
     db.commit()
     db.refresh(db_goal)
     return db_goal
 
-@router.get('/goals/{goal_id}/activity-logs', response_model=List[dict], summary='목표별 활동 로그 조회')
-def get_goal_activity_logs(goal_id: int, db: Session = Depends(get_smallstep_db)):
+@router.get('/goals/{goal_id}/activity-logs', response_model=CursorPage[dict], summary='목표별 활동 로그 조회')
+def get_goal_activity_logs(goal_id: int,
+                           cursor: Optional[str] = None,
+                           limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                           db: Session = Depends(get_smallstep_read_db)):
+    """최신순 활동 로그 (completed_at, id) 키셋 페이지네이션"""
     from models import SMALLSTEP_ACTIVITY_LOG, SMALLSTEP_TASKS
-    logs = (db.query(SMALLSTEP_ACTIVITY_LOG.id, SMALLSTEP_ACTIVITY_LOG.user_id, SMALLSTEP_ACTIVITY_LOG.task_id, SMALLSTEP_ACTIVITY_LOG.action, SMALLSTEP_ACTIVITY_LOG.xp_earned, SMALLSTEP_ACTIVITY_LOG.completed_at.label('created_at'), SMALLSTEP_TASKS.task_title).join(SMALLSTEP_TASKS, SMALLSTEP_ACTIVITY_LOG.task_id == SMALLSTEP_TASKS.id).filter(SMALLSTEP_TASKS.goal_id == goal_id).order_by(SMALLSTEP_ACTIVITY_LOG.completed_at.desc()).limit(20).all())
-    return [dict(log._mapping) for log in logs]
+    query = (db.query(SMALLSTEP_ACTIVITY_LOG.id, SMALLSTEP_ACTIVITY_LOG.user_id, SMALLSTEP_ACTIVITY_LOG.task_id, SMALLSTEP_ACTIVITY_LOG.action, SMALLSTEP_ACTIVITY_LOG.xp_earned, SMALLSTEP_ACTIVITY_LOG.completed_at.label('created_at'), SMALLSTEP_TASKS.task_title).join(SMALLSTEP_TASKS, SMALLSTEP_ACTIVITY_LOG.task_id == SMALLSTEP_TASKS.id).filter(SMALLSTEP_TASKS.goal_id == goal_id))
+    try:
+        logs, next_cursor = keyset_paginate(
+            query, [SMALLSTEP_ACTIVITY_LOG.completed_at, SMALLSTEP_ACTIVITY_LOG.id], cursor, limit,
+            key=lambda log: [log.created_at, log.id]
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": [dict(log._mapping) for log in logs], "next_cursor": next_cursor}
@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_smallstep_db
-from models import SMALLSTEP_PHASES, SMALLSTEP_GOALS
+from sqlalchemy.orm import Session, selectinload
+from database import get_smallstep_read_db
+from models import SMALLSTEP_PHASES, SMALLSTEP_GOALS, SMALLSTEP_WEEKLY_PLANS
 from schemas.smallstep.phases import PhaseResponse
-from typing import List
+from services.sparse_fields import sparse_fields, with_fields, sparse_response
+from services.core.responses import typed_response
+from services.core.query_stats import query_budget
+from services.core.warmup import hot_read
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,107 +17,83 @@ router = APIRouter(
     tags=["SmallStep - Phase 관리"]
 )
 
+_PHASE_COLUMNS = ('id', 'goal_id', 'phase_order', 'phase_title', 'phase_description', 'estimated_weeks',
+                  'status', 'started_at', 'completed_at', 'created_at')
+_PHASE_PLAN_COLUMNS = ('id', 'goal_id', 'phase_id', 'week_start_date', 'week_end_date', 'created_at')
+
+def _phase_to_dict(phase: SMALLSTEP_PHASES, weekly_plans: Optional[list], fields: Optional[List[str]] = None) -> dict:
+    """Phase 응답 dict 생성 (fields가 있으면 해당 컬럼만 접근하여 지연 로딩을 피함)"""
+    phase_dict = {column: getattr(phase, column) for column in _PHASE_COLUMNS if not fields or column in fields}
+    if weekly_plans is not None:
+        phase_dict['weekly_plans'] = [
+            {column: getattr(plan, column) for column in _PHASE_PLAN_COLUMNS}
+            for plan in weekly_plans
+        ]
+    return phase_dict
+
 @router.get("/goals/{goal_id}/phases", response_model=List[PhaseResponse],
             summary="목표의 Phase 목록 조회")
-def get_goal_phases(goal_id: int, db: Session = Depends(get_smallstep_db)):
-    """특정 목표의 전체 Phase 목록을 순서대로 조회합니다."""
+@query_budget(3)
+@hot_read(goal_id=SMALLSTEP_GOALS, fields=None)
+def get_goal_phases(goal_id: int,
+                    fields: Optional[List[str]] = Depends(sparse_fields(PhaseResponse)),
+                    db: Session = Depends(get_smallstep_read_db)):
+    """특정 목표의 전체 Phase 목록을 순서대로 조회합니다. (주간 계획은 selectinload로 한 번에 로드)"""
     # 목표 존재 여부 확인
-    goal = db.query(SMALLSTEP_GOALS).filter(SMALLSTEP_GOALS.id == goal_id).first()
+    goal = db.query(SMALLSTEP_GOALS.id).filter(SMALLSTEP_GOALS.id == goal_id).first()
     if not goal:
         raise HTTPException(status_code=404, detail="목표를 찾을 수 없습니다.")
 
+    include_plans = not fields or 'weekly_plans' in fields
+    query = with_fields(db.query(SMALLSTEP_PHASES), SMALLSTEP_PHASES, fields)
+    if include_plans:
+        query = query.options(selectinload(SMALLSTEP_PHASES.weekly_plans))
     phases = (
-        db.query(SMALLSTEP_PHASES)
+        query
         .filter(SMALLSTEP_PHASES.goal_id == goal_id)
         .order_by(SMALLSTEP_PHASES.phase_order)
         .all()
     )
-    
-    from models import SMALLSTEP_WEEKLY_PLANS
-    
+
+    # dict만 만들고 typed_response에서 한 번만 검증·직렬화 (PhaseResponse 중간 생성 없음)
     result = []
     for phase in phases:
         try:
-            weekly_plans = (
-                db.query(SMALLSTEP_WEEKLY_PLANS)
-                .filter(SMALLSTEP_WEEKLY_PLANS.phase_id == phase.id)
-                .order_by(SMALLSTEP_WEEKLY_PLANS.week_start_date)
-                .all()
-            )
-            
-            phase_dict = {
-                'id': phase.id,
-                'goal_id': phase.goal_id,
-                'phase_order': phase.phase_order,
-                'phase_title': phase.phase_title,
-                'phase_description': phase.phase_description,
-                'estimated_weeks': phase.estimated_weeks,
-                'status': phase.status,
-                'started_at': phase.started_at,
-                'completed_at': phase.completed_at,
-                'created_at': phase.created_at,
-                'weekly_plans': [
-                    {
-                        'id': plan.id,
-                        'goal_id': plan.goal_id,
-                        'phase_id': plan.phase_id,
-                        'week_start_date': plan.week_start_date,
-                        'week_end_date': plan.week_end_date,
-                        'created_at': plan.created_at
-                    }
-                    for plan in weekly_plans
-                ]
-            }
-            result.append(PhaseResponse(**phase_dict))
+            weekly_plans = sorted(phase.weekly_plans, key=lambda plan: plan.week_start_date) if include_plans else None
+            result.append(_phase_to_dict(phase, weekly_plans, fields))
         except Exception as e:
             logger.error(f"Phase {phase.id} 처리 중 오류: {e}")
             raise HTTPException(status_code=500, detail=f"Phase 처리 중 오류: {str(e)}")
-    
-    return result
+
+    if fields:
+        return sparse_response(result)
+    return typed_response(List[PhaseResponse], result)
 
 @router.get("/phases/{phase_id}", response_model=PhaseResponse,
             summary="Phase 상세 조회")
-def get_phase(phase_id: int, db: Session = Depends(get_smallstep_db)):
+def get_phase(phase_id: int,
+              fields: Optional[List[str]] = Depends(sparse_fields(PhaseResponse)),
+              db: Session = Depends(get_smallstep_read_db)):
     """특정 Phase의 상세 정보를 조회합니다. (주간 계획 목록 포함)"""
-    from models import SMALLSTEP_WEEKLY_PLANS
-    
-    phase = db.query(SMALLSTEP_PHASES).filter(SMALLSTEP_PHASES.id == phase_id).first()
+    phase = with_fields(db.query(SMALLSTEP_PHASES), SMALLSTEP_PHASES, fields).filter(SMALLSTEP_PHASES.id == phase_id).first()
     if not phase:
         raise HTTPException(status_code=404, detail="Phase를 찾을 수 없습니다.")
-    
+
     try:
-        weekly_plans = (
-            db.query(SMALLSTEP_WEEKLY_PLANS)
-            .filter(SMALLSTEP_WEEKLY_PLANS.phase_id == phase_id)
-            .order_by(SMALLSTEP_WEEKLY_PLANS.week_start_date)
-            .all()
-        )
-        
-        phase_dict = {
-            'id': phase.id,
-            'goal_id': phase.goal_id,
-            'phase_order': phase.phase_order,
-            'phase_title': phase.phase_title,
-            'phase_description': phase.phase_description,
-            'estimated_weeks': phase.estimated_weeks,
-            'status': phase.status,
-            'started_at': phase.started_at,
-            'completed_at': phase.completed_at,
-            'created_at': phase.created_at,
-            'weekly_plans': [
-                {
-                    'id': plan.id,
-                    'goal_id': plan.goal_id,
-                    'phase_id': plan.phase_id,
-                    'week_start_date': plan.week_start_date,
-                    'week_end_date': plan.week_end_date,
-                    'created_at': plan.created_at
-                }
-                for plan in weekly_plans
-            ]
-        }
-        
-        return PhaseResponse(**phase_dict)
+        weekly_plans = None
+        if not fields or 'weekly_plans' in fields:
+            weekly_plans = (
+                db.query(SMALLSTEP_WEEKLY_PLANS)
+                .filter(SMALLSTEP_WEEKLY_PLANS.phase_id == phase_id)
+                .order_by(SMALLSTEP_WEEKLY_PLANS.week_start_date)
+                .all()
+            )
+
+        phase_dict = _phase_to_dict(phase, weekly_plans, fields)
     except Exception as e:
         logger.error(f"Phase {phase_id} 상세 조회 중 오류: {e}")
         raise HTTPException(status_code=500, detail=f"Phase 상세 조회 중 오류: {str(e)}")
+
+    if fields:
+        return sparse_response(phase_dict)
+    return phase_dict
@@ -1,8 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from database import get_smallstep_db
-from models import SMALLSTEP_USERS, SMALLSTEP_GOALS, SMALLSTEP_PHASES, SMALLSTEP_TASKS, SMALLSTEP_WEEKLY_PLANS, SMALLSTEP_ACTIVITY_LOG
+from database import get_smallstep_read_db
+from models import SMALLSTEP_USERS, SMALLSTEP_GOALS, SMALLSTEP_PHASES, SMALLSTEP_TASKS, SMALLSTEP_WEEKLY_PLANS, SMALLSTEP_ACTIVITY_LOG, SMALLSTEP_USER_SUMMARY
 from schemas.smallstep.stats import StatsOverview, WeeklyStats, StreakInfo
+from services.user_summary import UserSummaryService
+from services.core.responses import dump_json, raw_json_response
+from services.core.cache import read_cache, user_tag
+from services.core.microcache import MicroCache
+from services.core.warmup import hot_read
 from typing import List
 import logging
 from sqlalchemy import func
@@ -15,32 +20,34 @@ router = APIRouter(
     tags=["SmallStep - 통계 관리"]
 )
 
+# 푸시 알림 직후 몰리는 동일 조회를 1초 동안 공유 (스트릭)
+micro_cache = MicroCache("stats", ttl=1.0)
+
+def _cached_stats(key: str, user_id: int, tp, load):
+    """통계 응답 bytes를 사용자 태그로 읽기 캐시 (태스크 완료/계획 생성 등 사용자 쓰기 커밋 시 무효화)"""
+    body = read_cache.get_or_load(key, [user_tag(user_id)], lambda: dump_json(tp, load(), validated=True))
+    return raw_json_response(body)
+
 @router.get("/stats/overview", response_model=StatsOverview,
             summary="전체 통계 조회")
-def get_stats_overview(user_id: int, db: Session = Depends(get_smallstep_db)):
-    user = db.query(SMALLSTEP_USERS).filter(SMALLSTEP_USERS.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
-        
-    goals = db.query(SMALLSTEP_GOALS).filter(SMALLSTEP_GOALS.user_id == user_id).all()
-    total_goals = len(goals)
-    completed_goals = sum(1 for g in goals if g.status == 'COMPLETED')
-    
-    # 조인으로 사용자별 완료된 태스크 수집
-    completed_tasks_count = (
-        db.query(SMALLSTEP_TASKS)
-        .join(SMALLSTEP_GOALS)
-        .filter(SMALLSTEP_GOALS.user_id == user_id, SMALLSTEP_TASKS.status == 'COMPLETED')
-        .count()
-    )
-    
-    # 완료된 Phase 수
-    completed_phases_count = (
-        db.query(SMALLSTEP_PHASES)
-        .join(SMALLSTEP_GOALS)
-        .filter(SMALLSTEP_GOALS.user_id == user_id, SMALLSTEP_PHASES.status == 'COMPLETED')
-        .count()
+def get_stats_overview(user_id: int, db: Session = Depends(get_smallstep_read_db)):
+    return _cached_stats(f"stats_overview:{user_id}", user_id, StatsOverview,
+                         lambda: _load_stats_overview(user_id, db))
+
+@hot_read(user_id=SMALLSTEP_USERS)
+def _load_stats_overview(user_id: int, db: Session) -> StatsOverview:
+    # 조인 집계 대신 증분 갱신되는 요약 행(SMALLSTEP_USER_SUMMARY)을 함께 조회
+    row = (
+        db.query(SMALLSTEP_USERS, SMALLSTEP_USER_SUMMARY)
+        .outerjoin(SMALLSTEP_USER_SUMMARY, SMALLSTEP_USER_SUMMARY.user_id == SMALLSTEP_USERS.id)
+        .filter(SMALLSTEP_USERS.id == user_id)
+        .first()
     )
+    if not row:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    user, summary = row
+    if summary is None:
+        summary = UserSummaryService(db).get(user_id)
     
     # 다음 레벨까지 필요한 XP 계산
     current_level = user.level or 1
@@ -50,21 +57,26 @@ def get_stats_overview(user_id: int, db: Session = Depends(get_smallstep_db)):
         next_level_xp = 0
     
     return StatsOverview(
-        total_goals=total_goals,
-        completed_goals=completed_goals,
-        completed_phases_count=completed_phases_count,
+        total_goals=summary.total_goals,
+        completed_goals=summary.completed_goals,
+        completed_phases_count=summary.completed_phases,
         current_level=current_level,
         experience_points=current_xp,
         xp_to_next_level=next_level_xp,
-        completed_tasks_count=completed_tasks_count,
+        completed_tasks_count=summary.completed_tasks,
         current_streak=user.current_streak or 0,
         longest_streak=user.longest_streak or 0
     )
 
 @router.get("/stats/weekly", response_model=List[WeeklyStats],
             summary="주간 통계 조회")
-def get_weekly_stats(user_id: int, db: Session = Depends(get_smallstep_db)):
+def get_weekly_stats(user_id: int, db: Session = Depends(get_smallstep_read_db)):
     """최근 4주의 주간 통계(완료, 스킵, 완료율 등)를 반환합니다."""
+    return _cached_stats(f"stats_weekly:{user_id}", user_id, List[WeeklyStats],
+                         lambda: _load_weekly_stats(user_id, db))
+
+@hot_read(user_id=SMALLSTEP_USERS)
+def _load_weekly_stats(user_id: int, db: Session) -> List[WeeklyStats]:
     # 간단히 가장 최근 4개의 주간 계획 정보를 집계합니다.
     recent_plans = (
         db.query(SMALLSTEP_WEEKLY_PLANS)
@@ -103,7 +115,15 @@ def get_weekly_stats(user_id: int, db: Session = Depends(get_smallstep_db)):
 
 @router.get("/stats/streak", response_model=StreakInfo,
             summary="스트릭 정보 조회")
-def get_streak_info(user_id: int, db: Session = Depends(get_smallstep_db)):
+@micro_cache.cached(tags={"user_id": user_tag})
+def get_streak_info(user_id: int, db: Session = Depends(get_smallstep_read_db)):
+    # 오늘 활동 여부/30일 히스토리가 날짜에 따라 달라지므로 키에 오늘 날짜 포함
+    today = datetime.now().date().isoformat()
+    return _cached_stats(f"stats_streak:{user_id}:{today}", user_id, StreakInfo,
+                         lambda: _load_streak_info(user_id, db))
+
+@hot_read(user_id=SMALLSTEP_USERS)
+def _load_streak_info(user_id: int, db: Session) -> StreakInfo:
     user = db.query(SMALLSTEP_USERS).filter(SMALLSTEP_USERS.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
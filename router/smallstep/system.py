@@ -1,13 +1,28 @@
-from fastapi import APIRouter
-from database import get_smallstep_db, get_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from database import get_smallstep_db, get_db, smallstep_replica_router, smallstep_shards
+from models import SMALLSTEP_USERS, SMALLSTEP_GOALS, SMALLSTEP_TASKS
+from services.core.sharding import shard_id_range
 from datetime import datetime
-from sqlalchemy import text
+from sqlalchemy import func, text
+from services.core.cache import read_cache
+from services.core.microcache import micro_caches
+from services.core.query_profile import query_profiler, SORT_KEYS
+from services.core.admin import require_admin
 
 router = APIRouter(
     prefix="/api/smallstep",
     tags=["SmallStep - 시스템"]
 )
 
+# 운영용 엔드포인트 - 문서에서 숨기고 MODE=DEV 또는 ADMIN_TOKEN 필요 (services/core/admin.py)
+admin_router = APIRouter(
+    prefix="/api/smallstep/admin",
+    tags=["SmallStep - 시스템"],
+    dependencies=[Depends(require_admin)],
+    include_in_schema=False,
+)
+
 @router.get("/health",
             summary="SmallStep API 헬스체크",
             description="""
@@ -67,4 +82,78 @@ def health_check():
         else:
             health_status["error"] = f"Lotto DB: {str(e)}"
     
-    return health_status 
+    # SmallStep 읽기 복제본 (설정된 경우만, 복제본 문제는 primary로 대체되므로 unhealthy로 보지 않음)
+    if smallstep_replica_router.enabled:
+        lag = smallstep_replica_router.lag()
+        health_status["databases"]["smallstep_replica"] = "connected" if lag is not None else "unavailable"
+        health_status["replica_routing"] = smallstep_replica_router.stats()
+
+    return health_status
+
+
+# 관리 라우트지만 기존 URL 유지 - admin_router와 같은 접근 제어
+@router.get("/cache/stats",
+            dependencies=[Depends(require_admin)],
+            include_in_schema=False,
+            summary="읽기 캐시 통계",
+            description="현재 워커 프로세스의 2단 읽기 캐시 적중률, 무효화 횟수, 제공된 항목의 나이(신선도)와 "
+                        "라우터별 마이크로 캐시(요청 병합) 통계를 반환합니다.")
+def cache_stats():
+    """읽기 캐시 적중률/신선도 지표 (워커별)"""
+    return {
+        **read_cache.stats(),
+        "micro_caches": {name: cache.stats() for name, cache in micro_caches.items()},
+    }
+
+
+@admin_router.get("/query-stats",
+            summary="쿼리 fingerprint 통계",
+            description="""
+현재 워커 프로세스에서 실행된 SQL을 fingerprint(리터럴 제거)별로 집계한 결과와 느린 쿼리(EXPLAIN 포함)를 반환합니다.
+
+- **sort**: total_ms / mean_ms / p99_ms / calls / rows
+- **engine**: smallstep / lotto (생략 시 전체)
+""")
+def query_stats(sort: str = "total_ms", limit: int = Query(50, ge=1, le=500), engine: Optional[str] = None):
+    """DB 시간을 많이 쓰는 쿼리 확인용 (워커별)"""
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort는 {', '.join(SORT_KEYS)} 중 하나여야 합니다.")
+    return {
+        **query_profiler.summary(),
+        "top": query_profiler.top(sort=sort, limit=limit, engine=engine),
+        "slow_queries": query_profiler.slow_queries(),
+    }
+
+
+@admin_router.delete("/query-stats", summary="쿼리 fingerprint 통계 초기화")
+def reset_query_stats():
+    query_profiler.reset()
+    return {"status": "reset"}
+
+
+@admin_router.get("/shards",
+            summary="샤드별 현황 (scatter-gather)",
+            description="설정된 모든 SmallStep 샤드에 병렬로 조회해 사용자/목표/태스크 수와 id 범위를 반환합니다.")
+def shard_overview():
+    """샤드 간 관리자 조회 - 각 샤드 결과를 모아 합계와 함께 반환"""
+    def collect(db, shard):
+        return {
+            "users": db.query(func.count(SMALLSTEP_USERS.id)).scalar(),
+            "goals": db.query(func.count(SMALLSTEP_GOALS.id)).scalar(),
+            "tasks": db.query(func.count(SMALLSTEP_TASKS.id)).scalar(),
+        }
+
+    results = smallstep_shards.scatter_gather(collect)
+    shards = [
+        {
+            "shard": shard,
+            "open": shard in smallstep_shards.open_shards,
+            "id_range": shard_id_range(shard),
+            "database": smallstep_shards.engine(shard).url.render_as_string(hide_password=True),
+            **counts,
+        }
+        for shard, counts in sorted(results.items())
+    ]
+    totals = {key: sum(row[key] for row in shards) for key in ("users", "goals", "tasks")}
+    return {"shards": shards, "totals": totals}
+
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from database import get_smallstep_db
-from models import SMALLSTEP_TASKS, SMALLSTEP_WEEKLY_PLANS
-from schemas.smallstep.tasks import TaskResponse
-from typing import List
+from database import get_smallstep_db, get_smallstep_read_db, use_user_shard
+from models import SMALLSTEP_GOALS, SMALLSTEP_TASKS, SMALLSTEP_USERS
+from schemas.smallstep.tasks import TaskResponse, TaskBatchCompleteRequest, TaskBatchCompleteResponse
+from services.task_state_machine import TaskStateMachine, TaskNotFoundError, InvalidTaskStateError
+from services.sparse_fields import sparse_fields, with_fields, narrow, sparse_response
+from services.core.cache import goal_tag
+from services.core.microcache import MicroCache
+from services.core.query_stats import query_budget
+from services.core.warmup import hot_read
+from typing import List, Optional
 import logging
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -14,82 +19,66 @@ router = APIRouter(
     tags=["SmallStep - 태스크 관리"]
 )
 
+# 푸시 알림 직후 몰리는 동일 조회를 1초 동안 공유
+micro_cache = MicroCache("tasks", ttl=1.0)
+
 @router.get("/tasks/today", response_model=List[TaskResponse],
             summary="오늘 할 일 조회 (AVAILABLE 상태)")
-def get_today_tasks(goal_id: int, db: Session = Depends(get_smallstep_db)):
+@micro_cache.cached(List[TaskResponse], tags={"goal_id": goal_tag})
+@query_budget(1)
+@hot_read(goal_id=SMALLSTEP_GOALS, fields=None)
+def get_today_tasks(goal_id: int,
+                    fields: Optional[List[str]] = Depends(sparse_fields(TaskResponse)),
+                    db: Session = Depends(get_smallstep_read_db)):
     """현재 AVAILABLE 상태인 태스크(오늘 해야 할 일)를 반환합니다."""
     tasks = (
-        db.query(SMALLSTEP_TASKS)
+        with_fields(db.query(SMALLSTEP_TASKS), SMALLSTEP_TASKS, fields)
         .filter(SMALLSTEP_TASKS.goal_id == goal_id, SMALLSTEP_TASKS.status == 'AVAILABLE')
         .order_by(SMALLSTEP_TASKS.task_order)
         .all()
     )
+    if fields:
+        return sparse_response([narrow(t, fields) for t in tasks])
     return tasks
 
 @router.put("/tasks/{task_id}/complete", response_model=TaskResponse,
             summary="태스크 완료 처리")
 def complete_task(task_id: int, db: Session = Depends(get_smallstep_db)):
-    """태스크를 완료 처리하고 다음 태스크를 AVAILABLE로 변경합니다. (MVP 수준 상태 머신)"""
-    task = db.query(SMALLSTEP_TASKS).filter(SMALLSTEP_TASKS.id == task_id).first()
-    if not task:
+    """태스크를 완료 처리하고 다음 태스크를 AVAILABLE로 변경합니다.
+
+    XP/스트릭, 주간 보너스, Phase 완료 검사까지 TaskStateMachine이 한 트랜잭션에서 처리하며,
+    같은 태스크에 대한 중복 요청(더블 탭)은 한 번만 반영됩니다.
+    """
+    try:
+        return TaskStateMachine(db).complete_task(task_id)
+    except TaskNotFoundError:
         raise HTTPException(status_code=404, detail="태스크를 찾을 수 없습니다.")
-    
-    if task.status != 'AVAILABLE':
-        raise HTTPException(status_code=400, detail=f"현재 태스크 상태({task.status})에서는 완료 처리할 수 없습니다.")
-    
-    # 1. 완료 상태로 변경
-    task.status = 'COMPLETED'
-    task.completed_at = datetime.now()
-    
-    # 2. 다음 태스크 찾기
-    next_task = (
-        db.query(SMALLSTEP_TASKS)
-        .filter(
-            SMALLSTEP_TASKS.weekly_plan_id == task.weekly_plan_id,
-            SMALLSTEP_TASKS.task_order > task.task_order
-        )
-        .order_by(SMALLSTEP_TASKS.task_order)
-        .first()
+    except InvalidTaskStateError as e:
+        raise HTTPException(status_code=400, detail=f"현재 태스크 상태({e.status})에서는 완료 처리할 수 없습니다.")
+
+@router.post("/tasks/complete-batch", response_model=TaskBatchCompleteResponse,
+             summary="태스크 일괄 완료 처리 (오프라인 동기화)")
+def complete_tasks_batch(request: TaskBatchCompleteRequest, db: Session = Depends(get_smallstep_db)):
+    """오프라인에서 완료한 태스크들을 한 번에 반영합니다.
+
+    각 항목의 completed_at(없으면 수신 시각) 기준으로 스트릭을 계산하며, 한 트랜잭션으로 처리합니다.
+    항목별 결과(completed/already_completed/not_found/invalid_state/error)와 최종 XP/레벨을 반환합니다.
+    """
+    use_user_shard(db, request.user_id)
+    user = db.query(SMALLSTEP_USERS).filter(SMALLSTEP_USERS.id == request.user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+
+    results = TaskStateMachine(db).complete_tasks_batch(
+        request.user_id, [(item.task_id, item.completed_at) for item in request.items]
     )
-    
-    # 3. 다음 태스크 상태 변경
-    if next_task and next_task.status == 'LOCKED':
-        next_task.status = 'AVAILABLE'
-        
-    # 4. 게이미피케이션 연동 (XP 부여 및 스트릭 업데이트)
-    from models import SMALLSTEP_GOALS
-    from services.gamification import GamificationService
-    goal = db.query(SMALLSTEP_GOALS).filter(SMALLSTEP_GOALS.id == task.goal_id).first()
-    if goal:
-        gamification_service = GamificationService(db)
-        gamification_service.award_task_completion_xp(
-            user_id=goal.user_id,
-            task_id=task.id,
-            goal_id=task.goal_id
-        )
-        
-        # 5. 마지막 태스크 완료 체크 (주간 별도 XP + Phase 완료 검사)
-        remaining_tasks = (
-            db.query(SMALLSTEP_TASKS)
-            .filter(
-                SMALLSTEP_TASKS.weekly_plan_id == task.weekly_plan_id,
-                SMALLSTEP_TASKS.status.in_(['AVAILABLE', 'LOCKED'])
-            )
-            .count()
-        )
-        if remaining_tasks == 0:
-            # 주간 모든 태스크 완료 별도 XP
-            gamification_service.award_weekly_completion_bonus(
-                user_id=goal.user_id,
-                goal_id=task.goal_id
-            )
-            # Phase 완료 검사 및 자동 전환
-            from services.weekly_scheduler import WeeklySchedulerService
-            weekly_plan = db.query(SMALLSTEP_WEEKLY_PLANS).filter(SMALLSTEP_WEEKLY_PLANS.id == task.weekly_plan_id).first()
-            if weekly_plan:
-                scheduler = WeeklySchedulerService(db)
-                scheduler.check_phase_completion(weekly_plan.phase_id)
-        
-    db.commit()
-    db.refresh(task)
-    return task
+
+    db.refresh(user)
+    return {
+        "results": results,
+        "completed_count": sum(1 for r in results if r["outcome"] == "completed"),
+        "xp_earned": sum(r.get("xp_earned", 0) for r in results),
+        "experience_points": user.experience_points,
+        "level": user.level,
+        "current_streak": user.current_streak,
+    }
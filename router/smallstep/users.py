@@ -1,12 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from database import get_smallstep_db
-from models import SMALLSTEP_USERS
-from schemas.smallstep.users import User, UserCreate, UserUpdate
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from database import get_smallstep_db, get_smallstep_read_db, use_new_user_shard
+from models import SMALLSTEP_USERS, SMALLSTEP_GOALS, SMALLSTEP_TASKS, SMALLSTEP_WEEKLY_PLANS, SMALLSTEP_ACTIVITY_LOG
+from schemas.smallstep.users import User, UserCreate, UserUpdate, UserHome
+from services.core.responses import typed_response, dump_json, raw_json_response
+from services.core.query_stats import query_budget
+from services.core.warmup import hot_read
+from services.core.cache import read_cache, user_tag, invalidate_on_commit
+from services.core.etag import make_etag, is_not_modified, not_modified, set_etag
+from datetime import datetime
+from services.user_summary import UserSummaryService
+from services.analytics import UserCreated, emit_on_commit
 import logging
 
 logger = logging.getLogger(__name__)
 
+# ETag 버전 값 (updated_at은 초 단위라 자주 바뀌는 게임 수치를 함께 사용)
+_USER_VERSION_COLUMNS = (
+    SMALLSTEP_USERS.updated_at,
+    SMALLSTEP_USERS.experience_points,
+    SMALLSTEP_USERS.level,
+    SMALLSTEP_USERS.current_streak,
+    SMALLSTEP_USERS.longest_streak,
+)
+
 router = APIRouter(
     prefix="/api/smallstep",
     tags=["SmallStep - 사용자 관리"]
@@ -48,12 +66,16 @@ router = APIRouter(
 """)
 def create_user(user: UserCreate, db: Session = Depends(get_smallstep_db)):
     """새로운 사용자 생성"""
+    use_new_user_shard(db, user.email)
     try:
         db_user = SMALLSTEP_USERS(
             name=user.name,
             email=user.email
         )
         db.add(db_user)
+        db.flush()
+        UserSummaryService(db).create(db_user.id)
+        emit_on_commit(db, UserCreated(user_id=db_user.id))
         db.commit()
         db.refresh(db_user)
         
@@ -101,12 +123,115 @@ def create_user(user: UserCreate, db: Session = Depends(get_smallstep_db)):
 }
 ```
 """)
-def get_user(user_id: int, db: Session = Depends(get_smallstep_db)):
-    """사용자 정보 조회"""
+def get_user(user_id: int, request: Request, db: Session = Depends(get_smallstep_read_db)):
+    """사용자 정보 조회 (읽기 캐시 + ETag - 캐시 미스 시 If-None-Match가 있으면 버전 컬럼만 조회 후 304)"""
+    cache_key = f"user:{user_id}"
+    cached = read_cache.get(cache_key)
+    if cached is None:
+        if request.headers.get("if-none-match"):
+            version = db.query(*_USER_VERSION_COLUMNS).filter(SMALLSTEP_USERS.id == user_id).first()
+            if not version:
+                raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+            etag = make_etag("user", user_id, tuple(version))
+            if is_not_modified(request, etag):
+                return not_modified(etag)
+
+        tag_versions = read_cache.tag_versions([user_tag(user_id)])
+        user = db.query(SMALLSTEP_USERS).filter(SMALLSTEP_USERS.id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+        etag = make_etag("user", user_id, tuple(getattr(user, c.key) for c in _USER_VERSION_COLUMNS))
+        cached = (etag, dump_json(User, user))
+        read_cache.set(cache_key, cached, tag_versions)
+
+    etag, body = cached
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return set_etag(raw_json_response(body), etag)
+
+@router.get("/users/{user_id}/home", response_model=UserHome,
+            summary="홈 화면 데이터 조회")
+@query_budget(5)
+@hot_read(user_id=SMALLSTEP_USERS)
+def get_user_home(user_id: int, db: Session = Depends(get_smallstep_read_db)):
+    """홈 화면 한 장에 필요한 데이터를 한 번에 반환합니다.
+
+    활성 목표별 오늘 할 일(AVAILABLE), 현재 주간 계획 메시지, 스트릭/XP를 목표 수와 무관하게
+    고정된 쿼리 수(사용자, 목표+태스크 selectinload, 현재 주간 계획, 오늘 활동 여부)로 조회합니다.
+    """
     user = db.query(SMALLSTEP_USERS).filter(SMALLSTEP_USERS.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
-    return user
+
+    goals = (
+        db.query(SMALLSTEP_GOALS)
+        .options(selectinload(SMALLSTEP_GOALS.tasks.and_(SMALLSTEP_TASKS.status == 'AVAILABLE')))
+        .filter(SMALLSTEP_GOALS.user_id == user_id, SMALLSTEP_GOALS.status == 'active')
+        .order_by(SMALLSTEP_GOALS.id)
+        .all()
+    )
+
+    # 목표별 가장 최근 주간 계획 (/weekly-plans/current 와 동일 기준)
+    current_plans = {}
+    if goals:
+        latest = (
+            db.query(SMALLSTEP_WEEKLY_PLANS.goal_id, func.max(SMALLSTEP_WEEKLY_PLANS.week_start_date).label("week_start_date"))
+            .filter(SMALLSTEP_WEEKLY_PLANS.goal_id.in_([g.id for g in goals]))
+            .group_by(SMALLSTEP_WEEKLY_PLANS.goal_id)
+            .subquery()
+        )
+        plans = (
+            db.query(SMALLSTEP_WEEKLY_PLANS)
+            .join(latest, (SMALLSTEP_WEEKLY_PLANS.goal_id == latest.c.goal_id)
+                  & (SMALLSTEP_WEEKLY_PLANS.week_start_date == latest.c.week_start_date))
+            .all()
+        )
+        for plan in plans:
+            current_plans.setdefault(plan.goal_id, plan)
+
+    today_start = datetime.combine(datetime.now().date(), datetime.min.time())
+    is_streak_active_today = db.query(
+        db.query(SMALLSTEP_ACTIVITY_LOG.id).filter(
+            SMALLSTEP_ACTIVITY_LOG.user_id == user_id,
+            SMALLSTEP_ACTIVITY_LOG.action == 'COMPLETED',
+            SMALLSTEP_ACTIVITY_LOG.completed_at >= today_start
+        ).exists()
+    ).scalar()
+
+    current_level = user.level or 1
+    current_xp = user.experience_points or 0
+
+    home_goals = []
+    for goal in goals:
+        plan = current_plans.get(goal.id)
+        home_goals.append({
+            "id": goal.id,
+            "title": goal.title,
+            "goal_type": goal.goal_type,
+            "deadline_date": goal.deadline_date,
+            "today_tasks": sorted(goal.tasks, key=lambda t: t.task_order),
+            "current_plan": {
+                "id": plan.id,
+                "phase_id": plan.phase_id,
+                "week_start_date": plan.week_start_date,
+                "week_end_date": plan.week_end_date,
+                "ai_message": (plan.ai_response or {}).get("ai_message"),
+                "completed_count": plan.completed_count,
+                "remaining_count": plan.remaining_count,
+            } if plan else None,
+        })
+
+    return typed_response(UserHome, {
+        "user_id": user.id,
+        "name": user.name,
+        "level": current_level,
+        "experience_points": current_xp,
+        "xp_to_next_level": max((current_level ** 2) * 100 - current_xp, 0),
+        "current_streak": user.current_streak or 0,
+        "longest_streak": user.longest_streak or 0,
+        "is_streak_active_today": bool(is_streak_active_today),
+        "goals": home_goals,
+    })
 
 @router.put("/users/{user_id}", response_model=User,
             summary="사용자 정보 업데이트",
@@ -141,6 +266,7 @@ def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get
     for field, value in update_data.items():
         setattr(db_user, field, value)
     
+    invalidate_on_commit(db, user_tag(user_id))
     db.commit()
     db.refresh(db_user)
     return db_user 
\ No newline at end of file
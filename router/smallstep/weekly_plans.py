@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
-from database import get_smallstep_db
+from database import get_smallstep_db, get_smallstep_read_db
 from models import SMALLSTEP_WEEKLY_PLANS, SMALLSTEP_PHASES
 from schemas.smallstep.weekly_plans import WeeklyPlanResponse
+from schemas.smallstep.pagination import CursorPage
+from services.pagination import keyset_paginate, InvalidCursorError, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from services.sparse_fields import sparse_fields, with_fields, narrow, sparse_response
+from services.core.etag import make_etag, is_not_modified, not_modified, set_etag
+from services.core.responses import dump_json, raw_json_response
+from services.core.cache import read_cache, goal_tag
 from services.ai.weekly_planner import generate_weekly_plan
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 import logging
 
@@ -49,23 +55,85 @@ def create_weekly_plan(goal_id: int, phase_id: int, db: Session = Depends(get_sm
 
 @router.get("/weekly-plans/current", response_model=WeeklyPlanResponse,
             summary="현재 주간 계획 조회")
-def get_current_weekly_plan(goal_id: int, db: Session = Depends(get_smallstep_db)):
-    """특정 목표의 현재(가장 최근) 주간 계획을 조회합니다."""
+def get_current_weekly_plan(goal_id: int, request: Request,
+                            fields: Optional[List[str]] = Depends(sparse_fields(WeeklyPlanResponse)),
+                            db: Session = Depends(get_smallstep_read_db)):
+    """특정 목표의 현재(가장 최근) 주간 계획을 조회합니다.
+
+    주간 계획 응답 필드는 생성 후 바뀌지 않으므로 현재 계획 id가 곧 버전(ETag)입니다.
+    If-None-Match가 일치하면 인덱스만으로 id를 확인하고 304를 반환합니다.
+    전체 필드 응답은 목표 태그로 읽기 캐시에 저장됩니다 (새 계획 생성 시 무효화).
+    """
+    cache_key = f"weekly_plan_current:{goal_id}"
+    cached = None if fields else read_cache.get(cache_key)
+    if cached is not None:
+        etag, body = cached
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        return set_etag(raw_json_response(body), etag)
+
+    if request.headers.get("if-none-match"):
+        plan_id = (
+            db.query(SMALLSTEP_WEEKLY_PLANS.id)
+            .filter(SMALLSTEP_WEEKLY_PLANS.goal_id == goal_id)
+            .order_by(SMALLSTEP_WEEKLY_PLANS.week_start_date.desc())
+            .limit(1)
+            .scalar()
+        )
+        if not plan_id:
+            raise HTTPException(status_code=404, detail="현재 주간 계획이 없습니다.")
+        etag = make_etag("weekly_plan_current", goal_id, (plan_id,), fields)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+    tag_versions = read_cache.tag_versions([goal_tag(goal_id)])
     plan = (
-        db.query(SMALLSTEP_WEEKLY_PLANS)
+        with_fields(db.query(SMALLSTEP_WEEKLY_PLANS), SMALLSTEP_WEEKLY_PLANS, fields)
         .filter(SMALLSTEP_WEEKLY_PLANS.goal_id == goal_id)
         .order_by(SMALLSTEP_WEEKLY_PLANS.week_start_date.desc())
         .first()
     )
     if not plan:
         raise HTTPException(status_code=404, detail="현재 주간 계획이 없습니다.")
-    return plan
+    etag = make_etag("weekly_plan_current", goal_id, (plan.id,), fields)
+    if fields:
+        return set_etag(sparse_response(narrow(plan, fields)), etag)
+    body = dump_json(WeeklyPlanResponse, plan)
+    read_cache.set(cache_key, (etag, body), tag_versions)
+    return set_etag(raw_json_response(body), etag)
+
+@router.get("/weekly-plans", response_model=CursorPage[WeeklyPlanResponse],
+            summary="목표의 주간 계획 목록 조회")
+def get_weekly_plans(goal_id: int,
+                     phase_id: Optional[int] = None,
+                     cursor: Optional[str] = None,
+                     limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                     fields: Optional[List[str]] = Depends(sparse_fields(WeeklyPlanResponse)),
+                     db: Session = Depends(get_smallstep_read_db)):
+    """목표(선택적으로 Phase)의 주간 계획을 최신 주차부터 (week_start_date, id) 키셋 페이지네이션으로 조회합니다."""
+    query = with_fields(db.query(SMALLSTEP_WEEKLY_PLANS), SMALLSTEP_WEEKLY_PLANS, fields, always=('week_start_date',))
+    query = query.filter(SMALLSTEP_WEEKLY_PLANS.goal_id == goal_id)
+    if phase_id is not None:
+        query = query.filter(SMALLSTEP_WEEKLY_PLANS.phase_id == phase_id)
+    try:
+        plans, next_cursor = keyset_paginate(
+            query, [SMALLSTEP_WEEKLY_PLANS.week_start_date, SMALLSTEP_WEEKLY_PLANS.id], cursor, limit
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fields:
+        return sparse_response({"items": [narrow(p, fields) for p in plans], "next_cursor": next_cursor})
+    return {"items": plans, "next_cursor": next_cursor}
 
 @router.get("/weekly-plans/{plan_id}", response_model=WeeklyPlanResponse,
             summary="특정 주간 계획 상세 조회")
-def get_weekly_plan(plan_id: int, db: Session = Depends(get_smallstep_db)):
-    """특정 주간 계획을 조회합니다."""
-    plan = db.query(SMALLSTEP_WEEKLY_PLANS).filter(SMALLSTEP_WEEKLY_PLANS.id == plan_id).first()
+def get_weekly_plan(plan_id: int,
+                    fields: Optional[List[str]] = Depends(sparse_fields(WeeklyPlanResponse)),
+                    db: Session = Depends(get_smallstep_read_db)):
+    """특정 주간 계획을 조회합니다. (?fields=id,week_start_date 처럼 ai_context/ai_response 제외 가능)"""
+    plan = with_fields(db.query(SMALLSTEP_WEEKLY_PLANS), SMALLSTEP_WEEKLY_PLANS, fields).filter(SMALLSTEP_WEEKLY_PLANS.id == plan_id).first()
     if not plan:
         raise HTTPException(status_code=404, detail="주간 계획을 찾을 수 없습니다.")
+    if fields:
+        return sparse_response(narrow(plan, fields))
     return plan
@@ -1,7 +1,9 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from enum import Enum
+from schemas.smallstep.phases import PhaseStatus
+from schemas.smallstep.tasks import TaskResponse
 
 class GoalType(str, Enum):
     DEADLINE = 'DEADLINE'
@@ -33,7 +35,39 @@ class GoalUpdate(BaseModel):
 class Goal(GoalBase):
     id: int
     user_id: int
+    title: Optional[str] = None
     status: GoalStatus = GoalStatus.ACTIVE
     current_level: int = 1
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+
+# 로드맵 화면용 트리 (goal → phases → weekly_plans → tasks)
+# depth로 잘린 하위 단계는 None으로 반환됩니다.
+class WeeklyPlanTreeNode(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    week_start_date: datetime
+    week_end_date: datetime
+    completed_count: int = 0
+    skipped_count: int = 0
+    remaining_count: int = 0
+    created_at: datetime
+    tasks: Optional[List[TaskResponse]] = None
+
+class PhaseTreeNode(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    phase_order: int
+    phase_title: str
+    phase_description: Optional[str] = None
+    estimated_weeks: Optional[int] = None
+    status: PhaseStatus = PhaseStatus.PENDING
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    completed_task_count: int = 0
+    skipped_task_count: int = 0
+    remaining_task_count: int = 0
+    weekly_plans: Optional[List[WeeklyPlanTreeNode]] = None
+
+class GoalTree(Goal):
+    phases: Optional[List[PhaseTreeNode]] = None
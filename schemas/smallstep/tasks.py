@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -31,3 +31,26 @@ class TaskResponse(TaskBase):
     status: TaskStatus = TaskStatus.LOCKED
     completed_at: Optional[datetime] = None
     created_at: datetime
+
+class TaskCompletionItem(BaseModel):
+    task_id: int
+    completed_at: Optional[datetime] = None  # 오프라인 완료 시각 (없으면 서버 수신 시각)
+
+class TaskBatchCompleteRequest(BaseModel):
+    user_id: int
+    items: List[TaskCompletionItem] = Field(..., min_length=1, max_length=200)
+
+class TaskBatchItemResult(BaseModel):
+    task_id: int
+    outcome: Literal['completed', 'already_completed', 'not_found', 'invalid_state', 'error']
+    status: Optional[TaskStatus] = None
+    xp_earned: int = 0
+    detail: Optional[str] = None
+
+class TaskBatchCompleteResponse(BaseModel):
+    results: List[TaskBatchItemResult]
+    completed_count: int
+    xp_earned: int
+    experience_points: int
+    level: int
+    current_streak: int
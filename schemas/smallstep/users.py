@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
+from schemas.smallstep.tasks import TaskResponse
 
 class UserBase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -29,4 +30,35 @@ class User(UserBase):
     current_streak: int = 0
     longest_streak: int = 0
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+
+class HomeWeeklyPlan(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    phase_id: int
+    week_start_date: datetime
+    week_end_date: datetime
+    ai_message: Optional[str] = None
+    completed_count: int = 0
+    remaining_count: int = 0
+
+class HomeGoal(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    title: str
+    goal_type: Optional[str] = None
+    deadline_date: Optional[datetime] = None
+    today_tasks: List[TaskResponse] = []
+    current_plan: Optional[HomeWeeklyPlan] = None
+
+class UserHome(BaseModel):
+    """홈 화면 집계 응답 (오늘 할 일 + 현재 주간 계획 + 스트릭/XP)"""
+    user_id: int
+    name: str
+    level: int = 1
+    experience_points: int = 0
+    xp_to_next_level: int = 0
+    current_streak: int = 0
+    longest_streak: int = 0
+    is_streak_active_today: bool = False
+    goals: List[HomeGoal] = []
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+분석 이벤트 일일 집계 (services/analytics.py 이벤트)
+
+하루치 이벤트 파일을 읽어 이벤트 종류별 건수, DAU, 태스크 완료, XP, 레벨업, 스트릭 끊김,
+AI 호출/계획 생성 지연(p50/p95/max) 등을 집계합니다.
+입력은 ANALYTICS_SINK=file의 events-YYYY-MM-DD.ndjson과 기본 logger 모드의 smallstep_analytics.log(회전 파일 포함)
+둘 다 지원하며, 각 줄에서 첫 '{'부터를 JSON으로 읽고 이벤트 시각(ts)이 해당 날짜인 것만 셉니다.
+
+사용 예:
+    python scripts/analytics_rollup.py                         # 어제
+    python scripts/analytics_rollup.py --date 2026-10-18
+    python scripts/analytics_rollup.py --date 2026-10-18 --json --out rollup-2026-10-18.json
+    python scripts/analytics_rollup.py --input /tmp/events-2026-10-18.ndjson
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+from collections import Counter
+from datetime import date, timedelta
+
+LOG_DIR = "/app/log"
+
+
+def default_inputs(day: str) -> list[str]:
+    analytics_dir = os.getenv("ANALYTICS_DIR", os.path.join(LOG_DIR, "analytics"))
+    log_file = os.path.join(LOG_DIR, "smallstep_analytics.log")
+    candidates = [os.path.join(analytics_dir, f"events-{day}.ndjson"), log_file] + sorted(glob.glob(log_file + ".*"))
+    return [path for path in candidates if os.path.isfile(path) and not path.endswith(".lock")]
+
+
+def read_events(paths: list[str], day: str):
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                start = line.find("{")
+                if start < 0:
+                    continue
+                try:
+                    event = json.loads(line[start:])
+                except ValueError:
+                    continue
+                if isinstance(event, dict) and "event" in event and str(event.get("ts", "")).startswith(day):
+                    yield event
+
+
+def percentile(values: list[float], q: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def latency_summary(values: list[float]) -> dict:
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 0.5),
+        "p95_ms": percentile(values, 0.95),
+        "max_ms": max(values) if values else None,
+    }
+
+
+def rollup(events, day: str) -> dict:
+    counts = Counter()
+    users = set()
+    xp_by_reason = Counter()
+    goals_by_type = Counter()
+    llm_by_model = Counter()
+    llm_latency, llm_failures = [], 0
+    plan_latency, phase_latency = [], []
+    level_ups = streak_breaks = tasks_completed = tasks_skipped = 0
+
+    for event in events:
+        name = event["event"]
+        counts[name] += 1
+        if event.get("user_id") is not None:
+            users.add(event["user_id"])
+        if name == "task_completed":
+            tasks_completed += 1
+        elif name == "tasks_skipped":
+            tasks_skipped += event.get("count", 0)
+        elif name == "xp_awarded":
+            xp_by_reason[event.get("reason")] += event.get("amount", 0)
+            level_ups += bool(event.get("level_up"))
+        elif name == "streak_broken":
+            streak_breaks += 1
+        elif name == "goal_created":
+            goals_by_type[event.get("goal_type") or "UNKNOWN"] += 1
+        elif name == "llm_call":
+            llm_latency.append(event["latency_ms"])
+            llm_by_model[event.get("response_model")] += 1
+            llm_failures += not event.get("success", True)
+        elif name == "plan_generated":
+            plan_latency.append(event["llm_latency_ms"])
+        elif name == "phases_generated":
+            phase_latency.append(event["llm_latency_ms"])
+
+    return {
+        "date": day,
+        "events": sum(counts.values()),
+        "active_users": len(users),
+        "event_counts": dict(counts.most_common()),
+        "tasks_completed": tasks_completed,
+        "tasks_skipped": tasks_skipped,
+        "xp_awarded": {"total": sum(xp_by_reason.values()), **xp_by_reason},
+        "level_ups": level_ups,
+        "streak_breaks": streak_breaks,
+        "goals_created": dict(goals_by_type),
+        "llm_calls": {**latency_summary(llm_latency), "failures": llm_failures, "by_response_model": dict(llm_by_model)},
+        "plan_generation": latency_summary(plan_latency),
+        "phase_generation": latency_summary(phase_latency),
+    }
+
+
+def format_table(result: dict) -> str:
+    def ms(value):
+        return "-" if value is None else f"{value:.0f}"
+
+    lines = [
+        f"SmallStep analytics {result['date']}",
+        f"  events            {result['events']}",
+        f"  active users      {result['active_users']}",
+        f"  tasks completed   {result['tasks_completed']}",
+        f"  tasks skipped     {result['tasks_skipped']}",
+        f"  xp awarded        " + ", ".join(f"{k}={v}" for k, v in result["xp_awarded"].items()),
+        f"  level ups         {result['level_ups']}",
+        f"  streak breaks     {result['streak_breaks']}",
+        f"  goals created     " + (", ".join(f"{k}={v}" for k, v in result["goals_created"].items()) or "0"),
+        "",
+        f"  {'latency':<18} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}",
+    ]
+    for label, key in (("llm calls", "llm_calls"), ("plan generation", "plan_generation"),
+                       ("phase generation", "phase_generation")):
+        row = result[key]
+        lines.append(f"  {label:<18} {row['count']:>6} {ms(row['p50_ms']):>8} {ms(row['p95_ms']):>8} {ms(row['max_ms']):>8}")
+    lines.append(f"  llm failures      {result['llm_calls']['failures']}")
+    lines += ["", "  event counts"] + [f"    {name:<22} {count}" for name, count in result["event_counts"].items()]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SmallStep 분석 이벤트 일일 집계")
+    parser.add_argument("--date", default=(date.today() - timedelta(days=1)).isoformat(), help="YYYY-MM-DD (기본 어제)")
+    parser.add_argument("--input", action="append", help="이벤트 파일 (여러 번 지정 가능, 기본 ANALYTICS_DIR/로그 디렉터리)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    parser.add_argument("--out", help="결과 파일 경로 (기본 표준 출력)")
+    args = parser.parse_args()
+
+    day = date.fromisoformat(args.date).isoformat()
+    paths = args.input or default_inputs(day)
+    if not paths:
+        sys.exit(f"no event files found for {day}")
+
+    result = rollup(read_events(paths, day), day)
+    text = json.dumps(result, ensure_ascii=False, indent=2) if args.json else format_table(result)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+응답 인코딩 벤치마크 (바이트 / CPU)
+
+SmallStep 응답 본문에 대해 인코딩별 전송 크기와 압축 CPU 시간을 비교합니다.
+CompressionMiddleware / MessagePackMiddleware와 같은 함수(compress, json_to_msgpack)를 사용합니다.
+
+페이로드:
+  - 기본: bench_serialization의 로드맵 트리 / Phase 목록 (메모리상 ORM 객체)
+  - --url: 실행 중인 서버의 실제 응답 (예: http://localhost:8000/api/smallstep/goals/1/phases)
+
+사용 예:
+    python scripts/bench_compression.py
+    python scripts/bench_compression.py --url http://localhost:8000/api/smallstep/goals/1/tree \\
+                                        --url "http://localhost:8000/api/smallstep/stats/weekly?user_id=1"
+"""
+import argparse
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.core.compression import available_encodings, compress, json_to_msgpack, msgpack
+
+
+def fetch(url: str) -> bytes:
+    request = urllib.request.Request(url, headers={"Accept": "application/json", "Accept-Encoding": "identity"})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def synthetic_payloads() -> dict[str, bytes]:
+    from bench_serialization import build_goal, tree_payload
+    from router.smallstep.phases import _phase_to_dict
+    from schemas.smallstep.goals import GoalTree
+    from schemas.smallstep.phases import PhaseResponse
+    from services.core.responses import dump_json
+
+    goal = build_goal(phase_count=5, week_count=8, task_count=7)
+    return {
+        "tree(280 tasks)": dump_json(GoalTree, tree_payload(goal)),
+        "phases": dump_json(List[PhaseResponse], [_phase_to_dict(p, p.weekly_plans) for p in goal.phases]),
+    }
+
+
+def cpu_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 인코딩 바이트/CPU 벤치마크")
+    parser.add_argument("--url", action="append", help="실제 응답을 가져올 URL (여러 번 지정 가능)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {url: fetch(url) for url in args.url} if args.url else synthetic_payloads()
+
+    variants = [("identity", lambda body: body)]
+    for encoding in available_encodings():
+        variants.append((encoding, lambda body, e=encoding: compress(body, e)))
+    variants.append(("gzip-9", lambda body: compress(body, "gzip", gzip_level=9)))
+    if "br" in available_encodings():
+        variants.append(("br-11", lambda body: compress(body, "br", brotli_quality=11)))
+    if msgpack is not None:
+        variants.append(("msgpack", json_to_msgpack))
+        for encoding in available_encodings():
+            variants.append((f"msgpack+{encoding}", lambda body, e=encoding: compress(json_to_msgpack(body), e)))
+
+    for name, body in payloads.items():
+        print(f"\n{name}: {len(body) / 1024:.1f} KiB JSON")
+        print(f"  {'encoding':<16} {'bytes':>10} {'ratio':>7} {'cpu ms':>8}")
+        for label, fn in variants:
+            size = len(fn(body))
+            print(f"  {label:<16} {size:>10} {size / len(body):>7.1%} {cpu_ms(lambda: fn(body), args.repeat):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+워커 부팅 후 첫 요청 지연 벤치마크 (services/core/warmup.py)
+
+uvicorn 프로세스를 WARMUP=0(끔) / WARMUP=1(켬)으로 번갈아 새로 띄우고,
+부팅 시간(/api/ready가 200이 될 때까지)과 각 URL의 첫 번째/두 번째 요청 지연을 비교합니다.
+DB 접속 정보는 평소처럼 .env(mysql, smallstep_mysql)에서 읽습니다.
+
+사용 예:
+    python scripts/bench_first_request.py
+    python scripts/bench_first_request.py --rounds 5 --path "/api/smallstep/goals/1/tree" \\
+                                          --path "/api/smallstep/users/1/home"
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+DEFAULT_PATHS = [
+    "/api/openapi.json",
+    "/api/smallstep/goals/1/tree",
+    "/api/smallstep/goals/1/phases",
+    "/api/smallstep/tasks/today?goal_id=1",
+    "/api/smallstep/users/1/home",
+]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def timed_get(url: str) -> float:
+    """응답 본문까지 받는 데 걸린 시간(ms) - 4xx/5xx도 측정에 포함"""
+    request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        e.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def wait_ready(base: str, process: subprocess.Popen, timeout: float = 60) -> float:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise SystemExit(f"uvicorn exited with {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"{base}/api/ready", timeout=1) as response:
+                if response.status == 200:
+                    return (time.perf_counter() - start) * 1000
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    raise SystemExit("server did not become ready")
+
+
+def run_once(warmup: bool, paths: list[str]) -> dict:
+    port = free_port()
+    env = {**os.environ, "WARMUP": "1" if warmup else "0", "WARMUP_BACKGROUND": "0"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        result = {"boot": wait_ready(base, process)}
+        for path in paths:
+            first = timed_get(base + path)
+            second = timed_get(base + path)
+            result[path] = (first, second)
+        return result
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 부팅 후 첫 요청 지연 (warm-up 끔/켬)")
+    parser.add_argument("--rounds", type=int, default=3, help="모드별 프로세스 기동 횟수")
+    parser.add_argument("--path", action="append", help="측정할 경로 (여러 번 지정 가능)")
+    args = parser.parse_args()
+    paths = args.path or DEFAULT_PATHS
+
+    for warmup in (False, True):
+        runs = [run_once(warmup, paths) for _ in range(args.rounds)]
+        print(f"\nWARMUP={'1' if warmup else '0'}  ({args.rounds} rounds, median ms)")
+        print(f"  {'boot (until ready)':<45} {statistics.median(r['boot'] for r in runs):>9.1f}")
+        print(f"  {'path':<45} {'1st':>9} {'2nd':>9}")
+        for path in paths:
+            first = statistics.median(r[path][0] for r in runs)
+            second = statistics.median(r[path][1] for r in runs)
+            print(f"  {path:<45} {first:>9.1f} {second:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+부팅(import) 시간 벤치마크 - python -X importtime 결과 요약
+
+새 인터프리터에서 모듈(기본 main)을 import하며 -X importtime 출력을 모아
+전체 시간, 누적 시간 상위 모듈, 최상위 패키지별 자기(self) 시간 합계를 보여줍니다.
+AI 스택(litellm/instructor)이 부팅 중에 로드되는지도 함께 확인합니다. (services/ai/client.py는 지연 로드)
+
+사용 예:
+    python scripts/bench_import_time.py
+    python scripts/bench_import_time.py --module router.lotto.lotto --top 30
+    python scripts/bench_import_time.py --rounds 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = ("litellm", "instructor")
+
+
+def import_once(module: str) -> tuple[list[tuple[str, int, int]], list[str]]:
+    """[(모듈, self us, cumulative us)], 로드된 무거운 모듈 목록"""
+    probe = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr[-2000:])
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        rows.append((name, int(self_us), int(cumulative_us)))
+    loaded = [m for m in completed.stdout.strip().split(",") if m]
+    return rows, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모듈 import 시간 (-X importtime 요약)")
+    parser.add_argument("--module", default="main", help="import할 모듈 (기본 main)")
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 항목 수")
+    parser.add_argument("--rounds", type=int, default=3, help="반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    runs = [import_once(args.module) for _ in range(args.rounds)]
+    totals = [sum(self_us for _, self_us, _ in rows) for rows, _ in runs]
+    rows, loaded = runs[len(runs) // 2]
+
+    print(f"import {args.module}: {statistics.median(totals) / 1000:.0f} ms (median of {args.rounds}, "
+          f"min {min(totals) / 1000:.0f} / max {max(totals) / 1000:.0f})")
+    print(f"heavy AI modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    print(f"\ntop {args.top} modules by cumulative time (ms)")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:>9.1f} {self_us / 1000:>9.1f}  {name}")
+
+    packages = defaultdict(int)
+    for name, self_us, _ in rows:
+        packages[name.lstrip().split(".")[0]] += self_us
+    print(f"\ntop {args.top} top-level packages by self time (ms)")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:>9.1f}  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+응답 직렬화 벤치마크
+
+DB 없이 메모리상의 ORM 객체로 큰 로드맵 트리(/goals/{id}/tree)와 Phase 목록(/goals/{id}/phases)을 만들고
+직렬화 경로별 비용을 비교합니다.
+
+  fastapi-0.115   : TypeAdapter 검증 → to_python(mode=json) → json.dumps  (고정 버전 FastAPI 기본 경로)
+  orjson-render   : TypeAdapter 검증 → to_python(mode=json) → orjson     (FastJSONResponse 기본 클래스)
+  typed_response  : 캐시된 TypeAdapter 검증 → dump_json                  (services.core.responses.typed_response)
+  prebuilt-model  : 이미 만든 모델을 dump_json만                           (재검증 생략)
+
+사용 예:
+    python scripts/bench_serialization.py
+    python scripts/bench_serialization.py --phases 10 --weeks 12 --tasks 7 --repeat 50
+"""
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pydantic import TypeAdapter
+
+from models import SMALLSTEP_GOALS, SMALLSTEP_PHASES, SMALLSTEP_WEEKLY_PLANS, SMALLSTEP_TASKS
+from router.smallstep.goals import _TREE_GOAL_FIELDS, _TREE_PHASE_FIELDS, _TREE_PLAN_FIELDS
+from router.smallstep.phases import _phase_to_dict
+from schemas.smallstep.goals import GoalTree
+from schemas.smallstep.phases import PhaseResponse
+from services.core.responses import FastJSONResponse, dump_json, orjson
+
+
+def build_goal(phase_count: int, week_count: int, task_count: int) -> SMALLSTEP_GOALS:
+    """DB에 저장하지 않는 transient ORM 객체 트리 생성"""
+    now = datetime.now()
+    goal = SMALLSTEP_GOALS(id=1, user_id=1, title="영어 회화 마스터", goal_text="매일 30분 영어 회화 연습" * 5,
+                           goal_type="ONGOING", status="active", current_level=1, created_at=now, updated_at=now)
+    next_plan_id = next_task_id = 1
+    for p in range(phase_count):
+        phase = SMALLSTEP_PHASES(id=p + 1, goal_id=1, phase_order=p + 1, phase_title=f"Phase {p + 1}",
+                                 phase_description="단계 설명 " * 10, estimated_weeks=week_count, status="ACTIVE",
+                                 completed_task_count=0, skipped_task_count=0, remaining_task_count=0, created_at=now)
+        goal.phases.append(phase)
+        for w in range(week_count):
+            start = now + timedelta(weeks=p * week_count + w)
+            plan = SMALLSTEP_WEEKLY_PLANS(id=next_plan_id, goal_id=1, phase_id=phase.id, week_start_date=start,
+                                          week_end_date=start + timedelta(days=6), completed_count=0, skipped_count=0,
+                                          remaining_count=task_count, created_at=now,
+                                          ai_response={"ai_message": "이번 주도 화이팅!", "tasks_count": task_count})
+            next_plan_id += 1
+            phase.weekly_plans.append(plan)
+            for t in range(task_count):
+                plan.tasks.append(SMALLSTEP_TASKS(id=next_task_id, weekly_plan_id=plan.id, goal_id=1, task_order=t + 1,
+                                                  task_title=f"태스크 {t + 1}", task_description="설명 " * 8,
+                                                  estimated_minutes=30, status="LOCKED", created_at=now))
+                next_task_id += 1
+    return goal
+
+
+def tree_payload(goal: SMALLSTEP_GOALS) -> dict:
+    """get_goal_tree(depth=3)와 동일한 dict 구성"""
+    tree = {f: getattr(goal, f) for f in _TREE_GOAL_FIELDS}
+    tree["phases"] = []
+    for phase in goal.phases:
+        node = {f: getattr(phase, f) for f in _TREE_PHASE_FIELDS}
+        node["weekly_plans"] = []
+        for plan in phase.weekly_plans:
+            plan_node = {f: getattr(plan, f) for f in _TREE_PLAN_FIELDS}
+            plan_node["tasks"] = list(plan.tasks)
+            node["weekly_plans"].append(plan_node)
+        tree["phases"].append(node)
+    return tree
+
+
+def bench(name: str, tp, payload, repeat: int):
+    # 매번 새 TypeAdapter를 만들지 않도록 FastAPI와 마찬가지로 미리 생성
+    adapter = TypeAdapter(tp)
+    prebuilt = adapter.validate_python(payload, from_attributes=True)
+
+    def fastapi_default():
+        data = adapter.dump_python(adapter.validate_python(payload, from_attributes=True), mode="json")
+        return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+    def orjson_render():
+        data = adapter.dump_python(adapter.validate_python(payload, from_attributes=True), mode="json")
+        return FastJSONResponse(data).body
+
+    cases = [
+        ("fastapi-0.115", fastapi_default),
+        ("orjson-render" if orjson else "orjson-render (orjson 미설치)", orjson_render),
+        ("typed_response", lambda: dump_json(tp, payload)),
+        ("prebuilt-model", lambda: dump_json(tp, prebuilt, validated=True)),
+    ]
+    print(f"\n{name}")
+    baseline = None
+    for label, fn in cases:
+        size = len(fn())
+        seconds = min(timeit.repeat(fn, number=1, repeat=repeat))
+        baseline = baseline or seconds
+        print(f"  {label:<32} {seconds * 1000:8.2f} ms  {size / 1024:8.1f} KiB  x{baseline / seconds:4.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 직렬화 벤치마크")
+    parser.add_argument("--phases", type=int, default=5)
+    parser.add_argument("--weeks", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=20, help="반복 횟수 (최소값 사용)")
+    args = parser.parse_args()
+
+    goal = build_goal(args.phases, args.weeks, args.tasks)
+    task_total = args.phases * args.weeks * args.tasks
+    print(f"phases={args.phases} weeks/phase={args.weeks} tasks/week={args.tasks} (tasks={task_total})")
+
+    bench("GET /goals/{id}/tree", GoalTree, tree_payload(goal), args.repeat)
+    phases = [_phase_to_dict(phase, phase.weekly_plans) for phase in goal.phases]
+    bench("GET /goals/{id}/phases", List[PhaseResponse], phases, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+gunicorn 워커 메모리 벤치마크 (RSS / PSS / USS) - preload(prefork) 효과 확인용
+
+/proc/<pid>/smaps_rollup에서 마스터와 워커별 메모리를 읽습니다. (Linux 전용)
+  RSS: 프로세스가 올려 둔 전체 페이지 (공유 페이지를 워커마다 중복 계산)
+  PSS: 공유 페이지를 공유하는 프로세스 수로 나눈 값 - 합계가 실제 사용량에 가까움
+  USS: 그 프로세스만 쓰는 페이지 (워커를 하나 늘릴 때 추가로 드는 메모리)
+
+기본은 GUNICORN_PRELOAD=0 / 1로 gunicorn을 각각 띄워 비교하고, --pid로 실행 중인 마스터를 측정할 수도 있습니다.
+DB 접속 정보는 평소처럼 .env에서 읽습니다.
+
+사용 예:
+    python scripts/bench_worker_memory.py --workers 4
+    python scripts/bench_worker_memory.py --workers 4 --path /api/smallstep/goals/1/tree --requests 200
+    python scripts/bench_worker_memory.py --pid $(pgrep -o gunicorn)
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty", "Shared_Clean", "Shared_Dirty")
+
+
+def memory(pid: int) -> dict[str, int]:
+    """KiB 단위 {rss, pss, uss, shared}"""
+    values = dict.fromkeys(FIELDS, 0)
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in values:
+                values[key] = int(rest.split()[0])
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "uss": values["Private_Clean"] + values["Private_Dirty"],
+        "shared": values["Shared_Clean"] + values["Shared_Dirty"],
+    }
+
+
+def children(pid: int) -> list[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def report(master: int, label: str) -> dict[str, int]:
+    workers = children(master)
+    print(f"\n{label}  (master {master}, {len(workers)} workers, MiB)")
+    print(f"  {'process':<16} {'RSS':>9} {'PSS':>9} {'USS':>9} {'shared':>9}")
+    totals = dict.fromkeys(("rss", "pss", "uss", "shared"), 0)
+    for name, pid in [("master", master)] + [(f"worker {pid}", pid) for pid in workers]:
+        mem = memory(pid)
+        for key in totals:
+            totals[key] += mem[key]
+        print(f"  {name:<16} " + " ".join(f"{mem[key] / 1024:>9.1f}" for key in ("rss", "pss", "uss", "shared")))
+    print(f"  {'total':<16} " + " ".join(f"{totals[key] / 1024:>9.1f}" for key in ("rss", "pss", "uss", "shared")))
+    if workers:
+        worker_uss = sum(memory(pid)["uss"] for pid in workers) / len(workers)
+        print(f"  per extra worker (mean USS): {worker_uss / 1024:.1f} MiB")
+    return totals
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def get(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return None
+
+
+def launch(preload: bool, args) -> dict[str, int]:
+    port = free_port()
+    env = {**os.environ, "GUNICORN_PRELOAD": "1" if preload else "0"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "main:app", "-c", args.config,
+         "--bind", f"127.0.0.1:{port}", "--workers", str(args.workers)],
+        cwd=ROOT, env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + 120
+        while len(children(process.pid)) < args.workers or get(base + "/api/ready") != 200:
+            if process.poll() is not None:
+                raise SystemExit(f"gunicorn exited with {process.returncode}")
+            if time.time() > deadline:
+                raise SystemExit("gunicorn did not become ready")
+            time.sleep(0.2)
+        # 모든 워커가 lifespan warm-up을 마치고 요청을 몇 번씩 처리하도록
+        for _ in range(args.requests):
+            for path in args.path or ["/api/ready"]:
+                get(base + path)
+        time.sleep(args.settle)
+        return report(process.pid, f"GUNICORN_PRELOAD={'1' if preload else '0'}")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gunicorn 워커 메모리 (RSS/PSS/USS) 비교")
+    parser.add_argument("--pid", type=int, help="실행 중인 gunicorn 마스터 pid (지정하면 측정만)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--config", default="gunicorn.conf.py")
+    parser.add_argument("--path", action="append", help="측정 전에 호출할 경로 (여러 번 지정 가능)")
+    parser.add_argument("--requests", type=int, default=50, help="경로별 호출 횟수")
+    parser.add_argument("--settle", type=float, default=2.0, help="측정 전 대기(초)")
+    args = parser.parse_args()
+
+    if args.pid:
+        report(args.pid, "running server")
+        return
+
+    without = launch(False, args)
+    with_preload = launch(True, args)
+    saved = without["pss"] - with_preload["pss"]
+    print(f"\npreload saves {saved / 1024:.1f} MiB PSS in total "
+          f"({saved / 1024 / args.workers:.1f} MiB per worker)")
+
+
+if __name__ == "__main__":
+    main()
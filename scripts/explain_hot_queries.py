@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+SmallStep 핫 쿼리 인덱스 점검 스크립트 (index advisor)
+
+라우터/서비스에서 실제로 실행되는 쿼리 형태를 그대로 구성해 EXPLAIN을 실행하고,
+풀 스캔(type=ALL / 인덱스 풀 스캔)과 filesort/임시 테이블 사용을 보고합니다.
+샘플 파라미터는 활동 로그가 가장 많은 사용자 기준으로 DB에서 자동 선택합니다.
+
+사용 예:
+    python scripts/explain_hot_queries.py            # 요약 보고
+    python scripts/explain_hot_queries.py --verbose  # EXPLAIN 행 전체 출력
+    python scripts/explain_hot_queries.py --strict   # 문제 발견 시 종료 코드 1 (CI용)
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import func, distinct, cast, Date
+
+from database import smallstep_SessionLocal
+from models import (
+    SMALLSTEP_GOALS,
+    SMALLSTEP_PHASES,
+    SMALLSTEP_WEEKLY_PLANS,
+    SMALLSTEP_TASKS,
+    SMALLSTEP_ACTIVITY_LOG,
+)
+
+
+def pick_samples(db) -> dict:
+    """EXPLAIN에 사용할 대표 파라미터 선택 (데이터가 가장 많은 사용자/목표/계획)"""
+    user_id = (
+        db.query(SMALLSTEP_ACTIVITY_LOG.user_id)
+        .group_by(SMALLSTEP_ACTIVITY_LOG.user_id)
+        .order_by(func.count().desc())
+        .limit(1)
+        .scalar()
+    ) or 1
+    goal_id = (
+        db.query(SMALLSTEP_GOALS.id).filter(SMALLSTEP_GOALS.user_id == user_id).order_by(SMALLSTEP_GOALS.id.desc()).limit(1).scalar()
+    ) or 1
+    plan = (
+        db.query(SMALLSTEP_WEEKLY_PLANS.id, SMALLSTEP_WEEKLY_PLANS.phase_id, SMALLSTEP_WEEKLY_PLANS.week_start_date, SMALLSTEP_WEEKLY_PLANS.week_end_date)
+        .filter(SMALLSTEP_WEEKLY_PLANS.goal_id == goal_id)
+        .order_by(SMALLSTEP_WEEKLY_PLANS.week_start_date.desc())
+        .first()
+    )
+    today_start = datetime.combine(datetime.now().date(), datetime.min.time())
+    return {
+        'user_id': user_id,
+        'goal_id': goal_id,
+        'plan_id': plan.id if plan else 1,
+        'phase_id': plan.phase_id if plan else 1,
+        'week_start': plan.week_start_date if plan else today_start - timedelta(days=7),
+        'week_end': plan.week_end_date if plan else today_start,
+        'today_start': today_start,
+        'yesterday_start': today_start - timedelta(days=1),
+    }
+
+
+def hot_queries(db, s: dict) -> list:
+    """(이름, 호출 위치, Query) 목록 - 애플리케이션 코드와 동일한 형태로 유지할 것"""
+    log = SMALLSTEP_ACTIVITY_LOG
+    return [
+        ("tasks_today", "router/smallstep/tasks.py:get_today_tasks",
+         db.query(SMALLSTEP_TASKS)
+         .filter(SMALLSTEP_TASKS.goal_id == s['goal_id'], SMALLSTEP_TASKS.status == 'AVAILABLE')
+         .order_by(SMALLSTEP_TASKS.task_order)),
+        ("activate_next_task", "services/task_state_machine.py:_activate_next_task",
+         db.query(SMALLSTEP_TASKS)
+         .filter(SMALLSTEP_TASKS.weekly_plan_id == s['plan_id'], SMALLSTEP_TASKS.task_order > 1)
+         .order_by(SMALLSTEP_TASKS.task_order)
+         .limit(1)),
+        ("streak_today_count", "services/gamification.py:_update_streak_and_get_bonus",
+         db.query(func.count(log.id))
+         .filter(log.user_id == s['user_id'], log.action == 'COMPLETED', log.completed_at >= s['today_start'])),
+        ("streak_yesterday_count", "services/gamification.py:_update_streak_and_get_bonus",
+         db.query(func.count(log.id))
+         .filter(log.user_id == s['user_id'], log.action == 'COMPLETED',
+                 log.completed_at >= s['yesterday_start'], log.completed_at < s['today_start'])),
+        ("streak_last_activity", "router/smallstep/stats.py:get_streak_info",
+         db.query(log)
+         .filter(log.user_id == s['user_id'], log.action == 'COMPLETED')
+         .order_by(log.completed_at.desc())
+         .limit(1)),
+        ("streak_activity_dates", "router/smallstep/stats.py:get_streak_info",
+         db.query(distinct(cast(log.completed_at, Date)))
+         .filter(log.user_id == s['user_id'], log.action == 'COMPLETED')
+         .order_by(cast(log.completed_at, Date).desc())
+         .limit(35)),
+        ("weekly_stats_xp", "router/smallstep/stats.py:get_weekly_stats",
+         db.query(func.sum(log.xp_earned))
+         .filter(log.user_id == s['user_id'], log.completed_at >= s['week_start'], log.completed_at <= s['week_end'])),
+        ("weekly_stats_plans", "router/smallstep/stats.py:get_weekly_stats",
+         db.query(SMALLSTEP_WEEKLY_PLANS)
+         .join(SMALLSTEP_GOALS)
+         .filter(SMALLSTEP_GOALS.user_id == s['user_id'])
+         .order_by(SMALLSTEP_WEEKLY_PLANS.week_start_date.desc())
+         .limit(4)),
+        ("current_weekly_plan", "router/smallstep/weekly_plans.py:get_current_weekly_plan",
+         db.query(SMALLSTEP_WEEKLY_PLANS)
+         .filter(SMALLSTEP_WEEKLY_PLANS.goal_id == s['goal_id'])
+         .order_by(SMALLSTEP_WEEKLY_PLANS.week_start_date.desc())
+         .limit(1)),
+        ("phase_weekly_plans", "router/smallstep/phases.py:get_phase",
+         db.query(SMALLSTEP_WEEKLY_PLANS)
+         .filter(SMALLSTEP_WEEKLY_PLANS.phase_id == s['phase_id'])
+         .order_by(SMALLSTEP_WEEKLY_PLANS.week_start_date)),
+        ("goal_phases", "router/smallstep/phases.py:get_goal_phases",
+         db.query(SMALLSTEP_PHASES)
+         .filter(SMALLSTEP_PHASES.goal_id == s['goal_id'])
+         .order_by(SMALLSTEP_PHASES.phase_order)),
+        ("user_goals", "router/smallstep/goals.py:get_user_goals",
+         db.query(SMALLSTEP_GOALS).filter(SMALLSTEP_GOALS.user_id == s['user_id'])
+         .order_by(SMALLSTEP_GOALS.id)
+         .limit(21)),
+        ("goal_activity_logs", "router/smallstep/goals.py:get_goal_activity_logs",
+         db.query(log.id, log.user_id, log.task_id, log.action, log.xp_earned, log.completed_at, SMALLSTEP_TASKS.task_title)
+         .join(SMALLSTEP_TASKS, log.task_id == SMALLSTEP_TASKS.id)
+         .filter(SMALLSTEP_TASKS.goal_id == s['goal_id'])
+         .order_by(log.completed_at.desc(), log.id.desc())
+         .limit(21)),
+        ("goal_weekly_plans", "router/smallstep/weekly_plans.py:get_weekly_plans",
+         db.query(SMALLSTEP_WEEKLY_PLANS)
+         .filter(SMALLSTEP_WEEKLY_PLANS.goal_id == s['goal_id'])
+         .order_by(SMALLSTEP_WEEKLY_PLANS.week_start_date.desc(), SMALLSTEP_WEEKLY_PLANS.id.desc())
+         .limit(21)),
+    ]
+
+
+def explain(db, query) -> list[dict]:
+    """Query를 엔진 방언으로 컴파일하여 EXPLAIN 실행 (바인드 파라미터 유지)"""
+    conn = db.connection()
+    dialect = conn.dialect
+    compiled = query.statement.compile(dialect=dialect)
+    if dialect.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+    prefix = "EXPLAIN QUERY PLAN " if dialect.name == "sqlite" else "EXPLAIN "
+    result = conn.exec_driver_sql(prefix + compiled.string, params)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result.fetchall()]
+
+
+def find_problems(rows: list[dict], dialect_name: str) -> list[str]:
+    """EXPLAIN 결과에서 풀 스캔/filesort/임시 테이블 사용 검출"""
+    problems = []
+    for row in rows:
+        if dialect_name == "sqlite":
+            detail = str(row.get("detail", ""))
+            if detail.startswith("SCAN") and "USING" not in detail:
+                problems.append(f"full scan: {detail}")
+            if "TEMP B-TREE" in detail:
+                problems.append(f"filesort: {detail}")
+            continue
+
+        table = row.get("table")
+        access_type = row.get("type")
+        extra = str(row.get("Extra") or "")
+        if access_type == "ALL":
+            problems.append(f"full table scan on {table} (rows={row.get('rows')})")
+        elif access_type == "index" and "Using index" not in extra:
+            problems.append(f"full index scan on {table} via {row.get('key')}")
+        if "Using filesort" in extra:
+            problems.append(f"filesort on {table}")
+        if "Using temporary" in extra:
+            problems.append(f"temporary table on {table}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SmallStep 핫 쿼리 EXPLAIN 점검")
+    parser.add_argument("--verbose", action="store_true", help="EXPLAIN 결과 전체 출력")
+    parser.add_argument("--strict", action="store_true", help="문제가 있으면 종료 코드 1")
+    parser.add_argument("--only", action="append", help="특정 쿼리 이름만 점검")
+    args = parser.parse_args()
+
+    db = smallstep_SessionLocal()
+    try:
+        samples = pick_samples(db)
+        dialect_name = db.connection().dialect.name
+        print(f"samples: {samples}\n")
+
+        total_problems = 0
+        for name, origin, query in hot_queries(db, samples):
+            if args.only and name not in args.only:
+                continue
+            rows = explain(db, query)
+            problems = find_problems(rows, dialect_name)
+            total_problems += len(problems)
+            status = "OK " if not problems else "WARN"
+            print(f"[{status}] {name:<24} {origin}")
+            for problem in problems:
+                print(f"         - {problem}")
+            if args.verbose:
+                for row in rows:
+                    print(f"           {row}")
+        db.rollback()
+    finally:
+        db.close()
+
+    print(f"\n{total_problems} problem(s) found")
+    if args.strict and total_problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+로컬 검증용 DB 헬퍼
+스트레스 테스트/벤치마크 스크립트가 SQLite 파일이나 로컬 MySQL에 models 스키마를 만들 때 사용합니다.
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from models import Base
+
+
+@contextmanager
+def _portable_server_defaults(engine: Engine):
+    """SQLite는 current_timestamp() / ON UPDATE 구문을 지원하지 않으므로 생성 시에만 치환"""
+    if engine.dialect.name != "sqlite":
+        yield
+        return
+
+    replaced = []
+    for table in Base.metadata.tables.values():
+        for column in table.columns:
+            default = column.server_default
+            if default is not None and "current_timestamp" in str(getattr(default, "arg", "")).lower():
+                replaced.append((default, default.arg))
+                default.arg = text("CURRENT_TIMESTAMP")
+    try:
+        yield
+    finally:
+        for default, original in replaced:
+            default.arg = original
+
+
+def create_local_schema(engine: Engine):
+    """models 기준 전체 스키마 생성 (이미 있는 테이블은 건너뜀)"""
+    with _portable_server_defaults(engine):
+        Base.metadata.create_all(engine)
+
+
+def create_local_engine(url: str, **kwargs) -> Engine:
+    """로컬 검증용 엔진 생성 (SQLite는 스레드 공유 및 잠금 대기 허용)"""
+    if url.startswith("sqlite"):
+        connect_args = kwargs.pop("connect_args", {})
+        connect_args.setdefault("check_same_thread", False)
+        connect_args.setdefault("timeout", 30)
+        return create_engine(url, connect_args=connect_args, **kwargs)
+    return create_engine(url, pool_pre_ping=True, **kwargs)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+SMALLSTEP_USER_SUMMARY 재계산/정합성 점검 스크립트
+
+사용 예:
+    python scripts/rebuild_user_summary.py              # 전체 사용자 점검 + 교정
+    python scripts/rebuild_user_summary.py --dry-run    # 차이만 보고
+    python scripts/rebuild_user_summary.py --user-id 3  # 특정 사용자만
+
+샤드가 여러 개면(SMALLSTEP_SHARD_MAP) 샤드마다 순서대로 점검합니다.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database import smallstep_shards
+from models import SMALLSTEP_USERS
+from services.user_summary import UserSummaryService
+from services.core.sharding import shard_for_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SmallStep 사용자 요약 테이블 재계산")
+    parser.add_argument("--user-id", type=int, action="append", help="대상 사용자 ID (여러 번 지정 가능)")
+    parser.add_argument("--dry-run", action="store_true", help="교정하지 않고 차이만 출력")
+    parser.add_argument("--batch-size", type=int, default=500, help="커밋 단위 사용자 수")
+    args = parser.parse_args()
+
+    checked = drifted = 0
+    for shard in smallstep_shards.shards:
+        if args.user_id and not any(shard_for_id(user_id) == shard for user_id in args.user_id):
+            continue
+        c, d = reconcile_shard(shard, args)
+        checked += c
+        drifted += d
+    print(f"checked {checked} users, drift in {drifted}" + (" (dry run)" if args.dry_run else " (fixed)"))
+
+
+def reconcile_shard(shard: int, args) -> tuple[int, int]:
+    db = smallstep_shards.session(shard)
+    try:
+        if args.user_id:
+            user_ids = [user_id for user_id in args.user_id if shard_for_id(user_id) == shard]
+        else:
+            user_ids = [row[0] for row in db.query(SMALLSTEP_USERS.id).order_by(SMALLSTEP_USERS.id).all()]
+
+        service = UserSummaryService(db)
+        drifted = 0
+        for i, user_id in enumerate(user_ids, start=1):
+            drift = service.reconcile(user_id, fix=not args.dry_run)
+            if drift:
+                drifted += 1
+                print(f"user {user_id}: " + ", ".join(f"{k} {v[0]} -> {v[1]}" for k, v in drift.items()))
+            if i % args.batch_size == 0 and not args.dry_run:
+                db.commit()
+
+        if args.dry_run:
+            db.rollback()
+        else:
+            db.commit()
+        return len(user_ids), drifted
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
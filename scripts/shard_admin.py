@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+SmallStep 샤드 관리 도구 (services/core/sharding.py)
+
+명령:
+  status                      샤드별 행 수/최대 id 집계 (scatter-gather) 및 id 범위 위반 검사
+  init  --shard N             샤드 N 스키마에 SmallStep 테이블 생성 + AUTO_INCREMENT를 N * SHARD_ID_SPAN으로 설정
+                              (이후 alembic stamp head 로 마이그레이션 버전을 맞춥니다)
+  copy  --shard N --to URL    논리 샤드 N의 전체 행을 새 DB로 복사하고 행 수/최대 id를 검증 (리샤딩)
+                              --write-map 을 주면 검증 후 샤드 맵 JSON의 N 항목을 URL로 교체
+
+리샤딩 절차:
+  1. python scripts/shard_admin.py init --shard N --url <새 DB URL>
+  2. 샤드 N을 신규 사용자 배치 대상(open)에서 빼고, 쓰기를 멈춘 뒤(점검 모드)
+  3. python scripts/shard_admin.py copy --shard N --to <새 DB URL> --write-map
+  4. 워커 재시작(샤드 맵 재로드) 후 이전 DB의 샤드 N 스키마 정리
+
+사용 예:
+    SMALLSTEP_SHARD_MAP=shards.json python scripts/shard_admin.py status
+    python scripts/shard_admin.py init --shard 1 --url sqlite:///shard1.db
+    python scripts/shard_admin.py copy --shard 1 --to mysql+pymysql://.../smallstep_s1 --write-map
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from database import smallstep_shards
+from models import Base
+from services.core.sharding import SHARD_ID_SPAN, shard_id_range
+
+# FK 순서(부모 → 자식)로 정렬된 SmallStep 테이블
+SMALLSTEP_TABLES = [table for table in Base.metadata.sorted_tables if table.name.startswith("SMALLSTEP_")]
+
+
+def _id_column(table):
+    """단일 정수 AUTO_INCREMENT PK (요약 테이블처럼 user_id가 PK인 경우는 None)"""
+    pk = list(table.primary_key.columns)
+    if len(pk) == 1 and pk[0].name == "id":
+        return pk[0]
+    return None
+
+
+def _shard_key_column(table):
+    """id 범위 검사에 사용할 컬럼 (id 또는 user_id)"""
+    return _id_column(table) if _id_column(table) is not None else table.c.get("user_id")
+
+
+def status(args):
+    def collect(db, shard):
+        start, end = shard_id_range(shard)
+        rows = {}
+        for table in SMALLSTEP_TABLES:
+            key = _shard_key_column(table)
+            count, max_id = db.execute(select(func.count(), func.max(key)).select_from(table)).one()
+            outside = db.execute(
+                select(func.count()).select_from(table).where((key < start) | (key >= end))
+            ).scalar()
+            rows[table.name] = (count, max_id, outside)
+        return rows
+
+    results = smallstep_shards.scatter_gather(collect)
+    problems = 0
+    for shard, rows in sorted(results.items()):
+        url = smallstep_shards.engine(shard).url.render_as_string(hide_password=True)
+        open_mark = " (open)" if shard in smallstep_shards.open_shards else ""
+        print(f"\nshard {shard}{open_mark}: {url}  ids [{shard_id_range(shard)[0]}, {shard_id_range(shard)[1]})")
+        for name, (count, max_id, outside) in rows.items():
+            flag = f"  !! {outside} rows outside shard id range" if outside else ""
+            problems += outside
+            print(f"  {name:<28} {count:>10} rows  max id {max_id}{flag}")
+    return 1 if problems else 0
+
+
+def _set_id_start(connection, table, start: int):
+    dialect = connection.dialect.name
+    if dialect == "mysql":
+        connection.execute(text(f"ALTER TABLE `{table.name}` AUTO_INCREMENT = {start}"))
+    elif dialect == "sqlite":
+        connection.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table.name})
+        connection.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"),
+                           {"name": table.name, "seq": start - 1})
+    else:
+        raise SystemExit(f"Unsupported dialect for id range setup: {dialect}")
+
+
+def init(args):
+    if args.shard == 0:
+        raise SystemExit("shard 0 is the existing smallstep_mysql database")
+    engine = create_engine(args.url)
+    start = args.shard * SHARD_ID_SPAN
+    sqlite = engine.dialect.name == "sqlite"
+    id_tables = [table for table in SMALLSTEP_TABLES if _id_column(table) is not None]
+    # SQLite는 AUTOINCREMENT 테이블에서만 sqlite_sequence로 시작 id를 지정할 수 있음
+    if sqlite:
+        for table in id_tables:
+            table.dialect_options["sqlite"]["autoincrement"] = True
+    try:
+        Base.metadata.create_all(engine, tables=SMALLSTEP_TABLES)
+    finally:
+        if sqlite:
+            for table in id_tables:
+                table.dialect_options["sqlite"]["autoincrement"] = False
+    with engine.begin() as connection:
+        for table in id_tables:
+            _set_id_start(connection, table, start)
+    print(f"shard {args.shard} initialized at {engine.url.render_as_string(hide_password=True)} (ids from {start})")
+    return 0
+
+
+def copy(args):
+    source = smallstep_shards.engine(args.shard)
+    target = create_engine(args.to)
+    start, end = shard_id_range(args.shard)
+    failed = False
+    with source.connect() as src, target.begin() as dst:
+        for table in SMALLSTEP_TABLES:
+            key = _shard_key_column(table)
+            last = start - 1
+            copied = 0
+            while True:
+                rows = src.execute(
+                    select(table).where(key > last, key < end).order_by(key).limit(args.batch_size)
+                ).mappings().all()
+                if not rows:
+                    break
+                dst.execute(insert(table), [dict(row) for row in rows])
+                copied += len(rows)
+                last = rows[-1][key.name]
+            source_count = src.execute(select(func.count()).select_from(table).where(key >= start, key < end)).scalar()
+            target_count = dst.execute(select(func.count()).select_from(table)).scalar()
+            ok = source_count == target_count
+            failed |= not ok
+            print(f"  {table.name:<28} copied {copied:>10}  source {source_count}  target {target_count}  {'ok' if ok else 'MISMATCH'}")
+
+    if failed:
+        print("verification failed - shard map unchanged")
+        return 1
+    if args.write_map:
+        path = os.getenv("SMALLSTEP_SHARD_MAP")
+        if not path:
+            raise SystemExit("SMALLSTEP_SHARD_MAP is not set")
+        with open(path, encoding="utf-8") as f:
+            shard_map = json.load(f)
+        shard_map["shards"][str(args.shard)] = args.to
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(shard_map, f, indent=2)
+        print(f"shard map updated: shard {args.shard} -> {target.url.render_as_string(hide_password=True)} (restart workers)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SmallStep 샤드 관리 (상태/초기화/리샤딩)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="샤드별 행 수와 id 범위 검사")
+    p_init = sub.add_parser("init", help="새 샤드 스키마 생성")
+    p_init.add_argument("--shard", type=int, required=True)
+    p_init.add_argument("--url", required=True)
+    p_copy = sub.add_parser("copy", help="논리 샤드를 다른 DB로 복사 (리샤딩)")
+    p_copy.add_argument("--shard", type=int, required=True)
+    p_copy.add_argument("--to", required=True)
+    p_copy.add_argument("--batch-size", type=int, default=1000)
+    p_copy.add_argument("--write-map", action="store_true", help="검증 성공 시 샤드 맵 갱신")
+    args = parser.parse_args()
+
+    command = {"status": status, "init": init, "copy": copy}[args.command]
+    sys.exit(command(args))
+
+
+if __name__ == "__main__":
+    main()
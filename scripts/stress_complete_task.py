@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+태스크 완료 동시성 스트레스 테스트
+
+같은 태스크에 대해 N개의 스레드가 동시에 TaskStateMachine.complete_task를 호출해도
+완료 전환·XP 부여·다음 태스크 활성화가 정확히 한 번만 일어나는지 검증합니다.
+검증용 사용자/목표/계획을 새로 만들어 사용하므로 운영 DB에는 실행하지 마세요.
+
+사용 예:
+    python scripts/stress_complete_task.py                               # 임시 SQLite 파일
+    python scripts/stress_complete_task.py --url mysql+pymysql://.../smallstep_test --concurrency 64
+"""
+import argparse
+import sys
+import tempfile
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from local_db import create_local_engine, create_local_schema
+from models import (
+    SMALLSTEP_USERS,
+    SMALLSTEP_GOALS,
+    SMALLSTEP_PHASES,
+    SMALLSTEP_WEEKLY_PLANS,
+    SMALLSTEP_TASKS,
+    SMALLSTEP_ACTIVITY_LOG,
+    SMALLSTEP_USER_SUMMARY,
+)
+from services.task_state_machine import TaskStateMachine, InvalidTaskStateError
+from services.user_summary import UserSummaryService
+
+
+def seed(Session, task_count: int) -> dict:
+    """검증용 사용자 → 목표 → Phase → 주간 계획 → 태스크 생성"""
+    db = Session()
+    try:
+        user = SMALLSTEP_USERS(name="stress-test", email=None)
+        db.add(user)
+        db.flush()
+        UserSummaryService(db).create(user.id)
+        goal = SMALLSTEP_GOALS(user_id=user.id, title="stress", goal_text="stress", status="active")
+        db.add(goal)
+        db.flush()
+        phase = SMALLSTEP_PHASES(goal_id=goal.id, phase_order=1, phase_title="stress", status="ACTIVE")
+        db.add(phase)
+        db.flush()
+        now = datetime.now()
+        plan = SMALLSTEP_WEEKLY_PLANS(goal_id=goal.id, phase_id=phase.id,
+                                      week_start_date=now - timedelta(days=1), week_end_date=now + timedelta(days=6))
+        db.add(plan)
+        db.flush()
+        tasks = [
+            SMALLSTEP_TASKS(weekly_plan_id=plan.id, goal_id=goal.id, task_order=i + 1,
+                            task_title=f"stress {i + 1}", status="AVAILABLE" if i == 0 else "LOCKED")
+            for i in range(task_count)
+        ]
+        db.add_all(tasks)
+        db.flush()
+        TaskStateMachine(db).register_plan_tasks(plan, task_count)
+        db.commit()
+        return {"user_id": user.id, "goal_id": goal.id, "phase_id": phase.id,
+                "plan_id": plan.id, "task_ids": [t.id for t in tasks]}
+    finally:
+        db.close()
+
+
+def hammer(Session, task_id: int, concurrency: int) -> Counter:
+    """같은 태스크에 동시 완료 요청 발사"""
+    outcomes = Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency)
+
+    def worker():
+        db = Session()
+        try:
+            barrier.wait()
+            TaskStateMachine(db).complete_task(task_id)
+            result = "completed"
+        except InvalidTaskStateError:
+            db.rollback()
+            result = "rejected"
+        except Exception as e:
+            db.rollback()
+            result = f"error: {type(e).__name__}"
+        finally:
+            db.close()
+        with lock:
+            outcomes[result] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return outcomes
+
+
+def verify(Session, ids: dict) -> list[str]:
+    """태스크당 완료 로그 1건, XP 합계 일치, 카운터 일치 여부 확인"""
+    failures = []
+    db = Session()
+    try:
+        task_count = len(ids["task_ids"])
+        per_task = dict(
+            db.query(SMALLSTEP_ACTIVITY_LOG.task_id, func.count(SMALLSTEP_ACTIVITY_LOG.id))
+            .filter(SMALLSTEP_ACTIVITY_LOG.user_id == ids["user_id"], SMALLSTEP_ACTIVITY_LOG.action == 'COMPLETED')
+            .group_by(SMALLSTEP_ACTIVITY_LOG.task_id)
+            .all()
+        )
+        for task_id in ids["task_ids"]:
+            if per_task.get(task_id, 0) != 1:
+                failures.append(f"task {task_id}: {per_task.get(task_id, 0)} completion XP awards (expected 1)")
+
+        logged_xp = (
+            db.query(func.coalesce(func.sum(SMALLSTEP_ACTIVITY_LOG.xp_earned), 0))
+            .filter(SMALLSTEP_ACTIVITY_LOG.user_id == ids["user_id"])
+            .scalar()
+        )
+        user = db.get(SMALLSTEP_USERS, ids["user_id"])
+        if user.experience_points != logged_xp:
+            failures.append(f"user XP {user.experience_points} != activity log XP {logged_xp}")
+
+        plan = db.get(SMALLSTEP_WEEKLY_PLANS, ids["plan_id"])
+        if (plan.completed_count, plan.remaining_count) != (task_count, 0):
+            failures.append(f"plan counters completed={plan.completed_count} remaining={plan.remaining_count}")
+
+        summary = db.get(SMALLSTEP_USER_SUMMARY, ids["user_id"])
+        if summary.completed_tasks != task_count:
+            failures.append(f"summary completed_tasks={summary.completed_tasks} (expected {task_count})")
+
+        statuses = Counter(
+            status for (status,) in db.query(SMALLSTEP_TASKS.status).filter(SMALLSTEP_TASKS.weekly_plan_id == ids["plan_id"])
+        )
+        if statuses != Counter({"COMPLETED": task_count}):
+            failures.append(f"task statuses {dict(statuses)}")
+    finally:
+        db.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="태스크 완료 동시성 스트레스 테스트")
+    parser.add_argument("--url", help="대상 DB URL (기본: 임시 SQLite 파일)")
+    parser.add_argument("--tasks", type=int, default=5, help="주간 계획의 태스크 수")
+    parser.add_argument("--concurrency", type=int, default=32, help="태스크당 동시 완료 요청 수")
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp()}/stress_complete_task.db"
+    engine = create_local_engine(url, pool_size=args.concurrency, max_overflow=0) if not url.startswith("sqlite") \
+        else create_local_engine(url)
+    create_local_schema(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    ids = seed(Session, args.tasks)
+    print(f"url={url} tasks={args.tasks} concurrency={args.concurrency}")
+
+    for task_id in ids["task_ids"]:
+        outcomes = hammer(Session, task_id, args.concurrency)
+        print(f"task {task_id}: {dict(outcomes)}")
+
+    failures = verify(Session, ids)
+    if failures:
+        print("FAIL")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("OK: exactly one completion and XP award per task")
+
+
+if __name__ == "__main__":
+    main()
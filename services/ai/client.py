@@ -1,14 +1,19 @@
 """
 AI 클라이언트 모듈 (v2)
 LiteLLM + Instructor 기반 타입 안전한 AI 클라이언트
+
+litellm/instructor는 import에만 수 초가 걸리므로 모듈 로드 시점이 아니라 첫 AI 호출 시
+(또는 start_background_warmup()의 백그라운드 스레드에서) 불러옵니다.
+이 모듈을 import해도 AI 스택은 로드되지 않으므로 워커 부팅/리로드와 Lotto 라우트에는 비용이 없습니다.
 """
 import os
 import logging
-from typing import Type, TypeVar
+import threading
+import time
+from typing import Optional, Type, TypeVar
 from pydantic import BaseModel
 
-import instructor
-from litellm import completion
+from services.analytics import LlmCall, emit
 
 logger = logging.getLogger(__name__)
 
@@ -16,19 +21,56 @@ T = TypeVar("T", bound=BaseModel)
 
 LITELLM_MODEL = os.getenv("LITELLM_MODEL", "gemini/gemini-2.0-flash")
 
-# Instructor 클라이언트 초기화 (LiteLLM 래핑)
-# JSON 모드로 설정 - tool calls 없이 순수 JSON 응답
-_client = instructor.from_litellm(
-    completion,
-    mode=instructor.Mode.JSON
-)
+_client = None
+_client_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
 
 
 def get_ai_client():
-    """Instructor 클라이언트 반환"""
+    """Instructor 클라이언트 반환 (처음 호출 시 litellm/instructor import 후 생성)"""
+    global _client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is None:
+            start = time.perf_counter()
+            import instructor
+            from litellm import completion
+
+            # Instructor 클라이언트 초기화 (LiteLLM 래핑)
+            # JSON 모드로 설정 - tool calls 없이 순수 JSON 응답
+            _client = instructor.from_litellm(
+                completion,
+                mode=instructor.Mode.JSON
+            )
+            logger.info(f"AI 클라이언트 초기화 완료 ({(time.perf_counter() - start) * 1000:.0f}ms)")
     return _client
 
 
+def reset_ai_client():
+    """fork 후 워커에서 호출 - 부모에서 만든 클라이언트(HTTP 커넥션 풀 등)를 버리고 다음 사용 시 새로 생성"""
+    global _client, _client_lock, _warmup_thread
+    _client = None
+    _client_lock = threading.Lock()
+    _warmup_thread = None
+
+
+def start_background_warmup():
+    """백그라운드 스레드에서 AI 클라이언트를 미리 생성 (첫 AI 요청이 import 비용을 내지 않도록)"""
+    global _warmup_thread
+    if _client is not None or (_warmup_thread is not None and _warmup_thread.is_alive()):
+        return
+
+    def warm():
+        try:
+            get_ai_client()
+        except Exception as e:
+            logger.warning(f"AI 클라이언트 사전 초기화 실패 (첫 호출 시 재시도): {e}")
+
+    _warmup_thread = threading.Thread(target=warm, name="ai-client-warmup", daemon=True)
+    _warmup_thread.start()
+
+
 def call_ai(
     messages: list[dict],
     response_model: Type[T],
@@ -45,10 +87,11 @@ def call_ai(
     Returns:
         response_model 인스턴스
     """
+    started = time.perf_counter()
     try:
         logger.info(f"AI 호출 시작 - 모델: {LITELLM_MODEL}, 응답 타입: {response_model.__name__}")
 
-        response = _client.chat.completions.create(
+        response = get_ai_client().chat.completions.create(
             model=LITELLM_MODEL,
             messages=messages,
             response_model=response_model,
@@ -56,8 +99,19 @@ def call_ai(
         )
 
         logger.info(f"AI 호출 성공 - 응답 타입: {response_model.__name__}")
+        _emit_llm_call(response_model, started, success=True)
         return response
 
     except Exception as e:
         logger.error(f"AI 호출 실패: {e}")
+        _emit_llm_call(response_model, started, success=False)
         raise
+
+
+def _emit_llm_call(response_model: Type[BaseModel], started: float, success: bool):
+    emit(LlmCall(
+        model=LITELLM_MODEL,
+        response_model=response_model.__name__,
+        latency_ms=round((time.perf_counter() - started) * 1000, 1),
+        success=success,
+    ))
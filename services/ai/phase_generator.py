@@ -3,10 +3,12 @@ Phase 생성 파이프라인 (v2)
 목표 → 2~5개 Phase 자동 생성 및 DB 저장
 """
 import logging
+import time
 from sqlalchemy.orm import Session
 
 from models import SMALLSTEP_GOALS, SMALLSTEP_PHASES
 from services.ai.client import call_ai
+from services.analytics import PhasesGenerated, emit_on_commit
 from services.ai.schemas import PhaseGenerationResponse
 from services.ai.prompts import build_phase_generation_messages
 
@@ -44,7 +46,7 @@ def generate_phases(
     deadline_str = goal.deadline_date.isoformat() if goal.deadline_date else None
     
     logger.info(f"Phase 생성 시작 - goal_id={goal_id}, 목표: {goal.goal_text[:30]}...")
-    logger.info(f"AI 호출 시작 - 모델 및 프롬프트 준비 완료")
+    logger.debug(f"AI 호출 시작 - 모델 및 프롬프트 준비 완료")
     
     # 프롬프트 조립
     messages = build_phase_generation_messages(
@@ -56,12 +58,14 @@ def generate_phases(
     )
     
     # AI 호출
-    logger.info(f"AI 호출 중... messages 길이: {len(messages)}")
+    logger.debug(f"AI 호출 중... messages 길이: {len(messages)}")
+    started = time.perf_counter()
     ai_response: PhaseGenerationResponse = call_ai(
         messages=messages,
         response_model=PhaseGenerationResponse,
     )
-    logger.info(f"AI 호출 완료")
+    llm_latency_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.debug(f"AI 호출 완료")
     
     logger.info(f"Phase 생성 완료 - {len(ai_response.phases)}개 Phase 생성됨")
     
@@ -83,6 +87,10 @@ def generate_phases(
     if created_phases:
         created_phases[0].status = 'ACTIVE'
     
+    emit_on_commit(db, PhasesGenerated(
+        user_id=user.id if user else None, goal_id=goal_id,
+        phase_count=len(created_phases), llm_latency_ms=llm_latency_ms,
+    ))
     db.commit()
     
     # refresh하여 ID 등 반영
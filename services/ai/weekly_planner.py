@@ -3,6 +3,7 @@
 Phase + 컨텍스트 기반 적응형 주간 계획 생성 및 DB 저장
 """
 import logging
+import time
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
@@ -14,8 +15,11 @@ from models import (
     SMALLSTEP_ACTIVITY_LOG,
 )
 from services.ai.client import call_ai
+from services.analytics import PlanGenerated, emit_on_commit
 from services.ai.schemas import WeeklyPlanGenerationResponse
 from services.ai.prompts import build_weekly_plan_messages
+from services.task_state_machine import TaskStateMachine
+from services.core.cache import invalidate_on_commit, goal_tag, user_tag
 
 logger = logging.getLogger(__name__)
 
@@ -79,15 +83,11 @@ def generate_weekly_plan(
     skipped_count = 0
     
     if existing_plans:
+        # 지난 주 태스크를 모두 읽는 대신 진행 카운터 컬럼을 사용
         last_plan = existing_plans[-1]
-        last_tasks = (
-            db.query(SMALLSTEP_TASKS)
-            .filter(SMALLSTEP_TASKS.weekly_plan_id == last_plan.id)
-            .all()
-        )
-        completed_count = sum(1 for t in last_tasks if t.status == 'COMPLETED')
-        skipped_count = sum(1 for t in last_tasks if t.status == 'SKIPPED')
-        total = len(last_tasks)
+        completed_count = last_plan.completed_count or 0
+        skipped_count = last_plan.skipped_count or 0
+        total = completed_count + skipped_count + (last_plan.remaining_count or 0)
         
         if total > 0:
             completion_rate = int((completed_count / total) * 100)
@@ -118,10 +118,12 @@ def generate_weekly_plan(
     )
     
     # AI 호출
+    started = time.perf_counter()
     ai_response: WeeklyPlanGenerationResponse = call_ai(
         messages=messages,
         response_model=WeeklyPlanGenerationResponse,
     )
+    llm_latency_ms = round((time.perf_counter() - started) * 1000, 1)
     
     logger.info(f"주간 계획 AI 응답 완료 - {len(ai_response.tasks)}개 태스크 생성됨")
     
@@ -163,6 +165,9 @@ def generate_weekly_plan(
         db.add(db_task)
     
     db.flush()
+
+    # 진행 카운터 초기화 (주간 계획 remaining_count, Phase remaining_task_count)
+    TaskStateMachine(db).register_plan_tasks(db_weekly_plan, len(ai_response.tasks))
     
     # 첫 번째 태스크를 AVAILABLE로 설정
     first_task = (
@@ -174,6 +179,11 @@ def generate_weekly_plan(
     if first_task:
         first_task.status = 'AVAILABLE'
     
+    invalidate_on_commit(db, goal_tag(goal_id), user_tag(user_id) if user_id else None)
+    emit_on_commit(db, PlanGenerated(
+        user_id=user_id, goal_id=goal_id, phase_id=phase_id, weekly_plan_id=db_weekly_plan.id,
+        week_number=week_number, task_count=len(ai_response.tasks), llm_latency_ms=llm_latency_ms,
+    ))
     db.commit()
     db.refresh(db_weekly_plan)
     
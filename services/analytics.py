@@ -0,0 +1,149 @@
+"""
+SmallStep 분석 이벤트 (v2)
+서비스 레이어에서 발생하는 도메인 이벤트를 타입이 있는 모델로 정의하고 services/core/analytics_sink.py로 보냅니다.
+
+- emit(event): 바로 버퍼에 추가 (DB 트랜잭션과 무관한 이벤트 - AI 호출 지연 등)
+- emit_on_commit(db, event): 현재 트랜잭션이 커밋될 때 추가, 롤백되면 버림
+  (SAVEPOINT 안에서 등록한 이벤트는 그 SAVEPOINT가 롤백되면 버림 - 일괄 완료의 실패 항목)
+
+기록 형식은 이벤트 필드 그대로의 JSON 한 줄이며 scripts/analytics_rollup.py가 하루치를 집계합니다.
+"""
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from services.core.analytics_sink import event_sink
+
+_SESSION_EVENTS_KEY = "analytics_pending_events"
+
+
+class AnalyticsEvent(BaseModel):
+    event: str
+    ts: datetime = Field(default_factory=datetime.now)
+    user_id: Optional[int] = None
+
+
+class UserCreated(AnalyticsEvent):
+    event: Literal["user_created"] = "user_created"
+
+
+class GoalCreated(AnalyticsEvent):
+    event: Literal["goal_created"] = "goal_created"
+    goal_id: int
+    goal_type: Optional[str] = None
+    has_deadline: bool = False
+
+
+class GoalStatusChanged(AnalyticsEvent):
+    event: Literal["goal_status_changed"] = "goal_status_changed"
+    goal_id: int
+    old_status: Optional[str] = None
+    new_status: Optional[str] = None
+
+
+class GoalCompleted(AnalyticsEvent):
+    event: Literal["goal_completed"] = "goal_completed"
+    goal_id: int
+
+
+class PhasesGenerated(AnalyticsEvent):
+    event: Literal["phases_generated"] = "phases_generated"
+    goal_id: int
+    phase_count: int
+    llm_latency_ms: float
+
+
+class PhaseCompleted(AnalyticsEvent):
+    event: Literal["phase_completed"] = "phase_completed"
+    goal_id: int
+    phase_id: int
+
+
+class PlanGenerated(AnalyticsEvent):
+    event: Literal["plan_generated"] = "plan_generated"
+    goal_id: int
+    phase_id: int
+    weekly_plan_id: int
+    week_number: int
+    task_count: int
+    llm_latency_ms: float
+
+
+class TaskCompleted(AnalyticsEvent):
+    event: Literal["task_completed"] = "task_completed"
+    goal_id: int
+    task_id: int
+    weekly_plan_id: Optional[int] = None
+    completed_at: datetime
+    xp_earned: int = 0
+
+
+class TasksSkipped(AnalyticsEvent):
+    event: Literal["tasks_skipped"] = "tasks_skipped"
+    goal_id: int
+    weekly_plan_id: int
+    count: int
+
+
+class XpAwarded(AnalyticsEvent):
+    event: Literal["xp_awarded"] = "xp_awarded"
+    goal_id: Optional[int] = None
+    reason: Literal["task", "weekly_bonus", "phase_bonus"]
+    amount: int
+    streak_bonus: int = 0
+    total_xp: int
+    level: int
+    level_up: bool = False
+
+
+class StreakBroken(AnalyticsEvent):
+    event: Literal["streak_broken"] = "streak_broken"
+    previous_streak: int
+    longest_streak: int
+
+
+class LlmCall(AnalyticsEvent):
+    event: Literal["llm_call"] = "llm_call"
+    model: str
+    response_model: str
+    latency_ms: float
+    success: bool
+
+
+def emit(analytics_event: AnalyticsEvent):
+    event_sink.emit(analytics_event)
+
+
+def emit_on_commit(db: Session, analytics_event: AnalyticsEvent):
+    """현재 트랜잭션(또는 SAVEPOINT)이 최종 커밋되면 기록"""
+    if not db.in_transaction():
+        db.begin()  # 아직 시작 전이면 지금 시작해 이후의 rollback()과 묶음
+    transaction = db.get_nested_transaction() or db.get_transaction()
+    chain = []
+    while transaction is not None:
+        chain.append(transaction)
+        transaction = transaction.parent
+    db.info.setdefault(_SESSION_EVENTS_KEY, []).append((tuple(chain), analytics_event))
+
+
+@event.listens_for(Session, "after_commit")
+def _emit_after_commit(session: Session):
+    if session.in_nested_transaction():
+        return  # SAVEPOINT 커밋 - 바깥 트랜잭션 커밋 때 기록
+    pending = session.info.pop(_SESSION_EVENTS_KEY, None)
+    for _, analytics_event in pending or ():
+        event_sink.emit(analytics_event)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction):
+    pending = session.info.get(_SESSION_EVENTS_KEY)
+    if not pending:
+        return
+    if previous_transaction.parent is None:
+        session.info.pop(_SESSION_EVENTS_KEY, None)
+        return
+    session.info[_SESSION_EVENTS_KEY] = [item for item in pending if previous_transaction not in item[0]]
@@ -0,0 +1,29 @@
+"""
+운영/관리 엔드포인트 접근 제어 (/api/smallstep/admin/*, /api/smallstep/cache/stats, /metrics)
+
+- MODE=DEV: 토큰 없이 허용
+- 그 외: ADMIN_TOKEN 환경 변수와 같은 값을 X-Admin-Token 헤더 또는 Authorization: Bearer 로 보내야 함
+  (Prometheus는 scrape 설정의 authorization.credentials로 Bearer 토큰 전송)
+- ADMIN_TOKEN이 없으면(DEV 제외) 관리 엔드포인트는 404 - 존재 자체를 노출하지 않음
+
+SQL fingerprint / EXPLAIN 결과, 샤드 DB 주소, 풀 지표 등 내부 정보가 담기므로 공개 라우트로 두지 않습니다.
+"""
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None), authorization: Optional[str] = Header(None)):
+    """관리 엔드포인트 의존성 (라우터/라우트의 dependencies=[Depends(require_admin)])"""
+    if os.getenv("MODE") == "DEV":
+        return
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = x_admin_token
+    if token is None and authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:].strip()
+    if token is None or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다.")
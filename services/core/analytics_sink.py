@@ -0,0 +1,142 @@
+"""
+분석 이벤트 버퍼/배치 싱크 (services/analytics.py의 이벤트를 기록)
+
+emit()은 메모리 버퍼에 이벤트 객체를 붙이기만 하고 반환합니다. (요청 경로에서 직렬화/파일 I/O 없음)
+백그라운드 스레드가 ANALYTICS_BATCH_SIZE개가 쌓이거나 ANALYTICS_FLUSH_INTERVAL초가 지나면
+버퍼를 통째로 가져가 JSON 한 줄(NDJSON)씩 직렬화해 기록합니다.
+
+ANALYTICS_SINK:
+- logger (기본): smallstep.analytics 로거에 한 줄씩 (gunicorn.conf.py의 smallstep_analytics.log, 큐 기반 핸들러)
+- file: ANALYTICS_DIR/events-YYYY-MM-DD.ndjson 에 배치마다 한 번의 append 쓰기 (이벤트 시각의 날짜별 파일)
+        O_APPEND라 여러 워커가 같은 파일에 써도 줄이 섞이지 않습니다.
+- off: 기록하지 않음
+
+버퍼가 ANALYTICS_MAX_BUFFER를 넘으면 새 이벤트를 버리고 dropped로 셉니다.
+스레드는 첫 emit 때 프로세스별로 시작되므로 gunicorn fork 이후에도 워커마다 동작합니다.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+analytics_logger = logging.getLogger("smallstep.analytics")
+
+SINK_MODES = ("logger", "file", "off")
+
+
+class EventSink:
+    def __init__(self, mode: str = "logger", directory: Optional[str] = None, batch_size: int = 200,
+                 flush_interval: float = 2.0, max_buffer: int = 10000):
+        if mode not in SINK_MODES:
+            raise ValueError(f"ANALYTICS_SINK must be one of {SINK_MODES}")
+        self.mode = mode
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: list[Any] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._started_pid: Optional[int] = None
+        self.counters = {"emitted": 0, "written": 0, "dropped": 0, "flushes": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def emit(self, event: Any):
+        """이벤트 객체(model_dump_json()을 가진 pydantic 모델)를 버퍼에 추가"""
+        if not self.enabled:
+            return
+        self._ensure_started()
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self.counters["dropped"] += 1
+                return
+            self._buffer.append(event)
+            self.counters["emitted"] += 1
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    # ---- 백그라운드 flush ----
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._started_pid == pid:
+            return
+        with self._lock:
+            if self._started_pid == pid:
+                return
+            if self._started_pid is not None:
+                # fork로 복사된 부모의 미기록 이벤트는 부모가 기록하므로 버림
+                self._buffer = []
+            self._started_pid = pid
+        threading.Thread(target=self._run, name="analytics-sink", daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                self.counters["errors"] += 1
+                logger.exception("analytics flush failed")
+
+    def flush(self) -> int:
+        """버퍼의 이벤트를 모두 기록 (종료 시에도 호출)"""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        with self._write_lock:
+            if self.mode == "file":
+                self._write_files(batch)
+            else:
+                for event in batch:
+                    analytics_logger.info(event.model_dump_json())
+        self.counters["written"] += len(batch)
+        self.counters["flushes"] += 1
+        return len(batch)
+
+    def _write_files(self, batch: list):
+        by_day: dict[str, list[str]] = defaultdict(list)
+        for event in batch:
+            by_day[event.ts.date().isoformat()].append(event.model_dump_json())
+        os.makedirs(self.directory, exist_ok=True)
+        for day, lines in by_day.items():
+            path = os.path.join(self.directory, f"events-{day}.ndjson")
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, ("\n".join(lines) + "\n").encode("utf-8"))
+            finally:
+                os.close(fd)
+
+    def stats(self) -> dict:
+        with self._lock:
+            buffered = len(self._buffer)
+        return {**self.counters, "mode": self.mode, "buffered": buffered, "pid": os.getpid()}
+
+    def render_metrics(self) -> str:
+        """Prometheus 텍스트 형식"""
+        lines = []
+        for key, help_text in (("emitted", "Analytics events accepted"), ("written", "Analytics events written"),
+                               ("dropped", "Analytics events dropped because the buffer was full")):
+            lines += [f"# HELP analytics_events_{key}_total {help_text}", f"# TYPE analytics_events_{key}_total counter",
+                      f"analytics_events_{key}_total {self.counters[key]}"]
+        return "\n".join(lines) + "\n"
+
+
+event_sink = EventSink(
+    mode=os.getenv("ANALYTICS_SINK", "logger"),
+    directory=os.getenv("ANALYTICS_DIR", "/app/log/analytics"),
+    batch_size=int(os.getenv("ANALYTICS_BATCH_SIZE", "200")),
+    flush_interval=float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "2")),
+    max_buffer=int(os.getenv("ANALYTICS_MAX_BUFFER", "10000")),
+)
+atexit.register(event_sink.flush)
@@ -0,0 +1,291 @@
+"""
+2단 읽기 캐시 (프로세스 내 LRU+TTL → 워커 공유 diskcache)
+
+- 1단(local): 워커 프로세스 메모리의 LRU. TTL이 짧아(기본 2초) 다른 워커의 무효화를 놓쳐도 그 시간 안에 만료됩니다.
+- 2단(shared): 같은 호스트의 gunicorn 워커들이 공유하는 diskcache(SQLite 파일). 기본 TTL 60초.
+
+무효화는 태그 버전으로 처리합니다. 태그(예: "user:1", "goal:3")마다 공유 저장소에 버전 번호를 두고,
+항목은 저장 시점의 태그 버전을 함께 기록합니다. 쓰기 경로가 태그를 무효화하면 버전이 올라가
+이전 버전으로 저장된 항목은 모두 stale로 취급됩니다.
+로드 전에 태그 버전을 먼저 읽어 두므로, 로드 도중 커밋된 쓰기가 있으면 그 결과는 곧바로 stale이 됩니다.
+
+쓰기 경로는 invalidate_on_commit(db, *tags)로 태그를 등록하고, 세션 커밋 후에 실제 무효화가 일어납니다.
+(롤백되면 무효화하지 않음)
+
+diskcache는 선택 의존성이며 없으면 프로세스 내 캐시만 사용합니다.
+SMALLSTEP_CACHE=0 으로 캐시 전체를 끌 수 있습니다.
+캐시를 꺼도 태그별 쓰기 커밋 시각은 계속 기록합니다. (읽기 복제본 라우팅의 read-your-writes가 사용)
+"""
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+try:
+    import diskcache
+except ImportError:  # pragma: no cover - 선택 의존성
+    diskcache = None
+
+logger = logging.getLogger(__name__)
+
+_TAG_PREFIX = "tag:"
+_TAG_TIME_PREFIX = "tagtime:"
+_SESSION_TAGS_KEY = "cache_invalidate_tags"
+
+
+class TwoTierCache:
+    def __init__(self, directory: Optional[str] = None, local_maxsize: int = 2048, local_ttl: float = 2.0,
+                 shared_ttl: float = 60.0, verify_sample_rate: float = 0.05, enabled: bool = True):
+        self.enabled = enabled
+        self.local_maxsize = local_maxsize
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+        self.verify_sample_rate = verify_sample_rate
+        self._local: OrderedDict[str, tuple] = OrderedDict()  # key -> (expires_at, stored_at, tag_versions, value)
+        self._local_tags: dict[str, int] = {}  # 로컬 태그 버전 (diskcache가 없을 때 사용)
+        self._local_tag_times: dict[str, float] = {}  # 태그별 마지막 무효화(쓰기 커밋) 시각
+        self._lock = threading.Lock()
+        self._shared = None
+        if diskcache is not None and directory:  # 캐시를 꺼도 태그 쓰기 시각 공유에 사용
+            try:
+                self._shared = diskcache.Cache(directory, timeout=1)
+            except Exception as e:
+                logger.warning(f"Shared cache disabled ({directory}): {e}")
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.stats_counters = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "stale_rejected": 0,   # 태그 버전이 달라 버린 공유 항목
+            "stale_served": 0,     # 샘플 검증에서 로컬 항목이 이미 무효화된 것으로 확인된 횟수
+            "verified": 0,         # 샘플 검증 횟수
+            "sets": 0,
+            "invalidations": 0,
+            "errors": 0,
+        }
+        self._served_age_total = 0.0
+        self._served_age_max = 0.0
+        self._served_count = 0
+
+    # ---- 태그 버전 ----
+
+    def tag_versions(self, tags: Iterable[str]) -> tuple:
+        """현재 태그 버전 - 원본을 읽기 전에 호출해 set()에 넘겨야 로드 중 무효화를 감지할 수 있음"""
+        tags = sorted(set(tags))
+        if self._shared is not None:
+            try:
+                return tuple((tag, self._shared.get(_TAG_PREFIX + tag, 0)) for tag in tags)
+            except Exception:
+                self.stats_counters["errors"] += 1
+        return tuple((tag, self._local_tags.get(tag, 0)) for tag in tags)
+
+    def last_invalidated(self, tags: Iterable[str]) -> float:
+        """태그들의 마지막 무효화 시각(epoch, 없으면 0) - 읽기 복제본 라우팅의 read-your-writes 판단에 사용"""
+        latest = 0.0
+        for tag in tags:
+            value = self._local_tag_times.get(tag, 0.0)
+            if self._shared is not None:
+                try:
+                    value = max(value, self._shared.get(_TAG_TIME_PREFIX + tag, 0.0))
+                except Exception:
+                    self.stats_counters["errors"] += 1
+            latest = max(latest, value)
+        return latest
+
+    def _is_current(self, tag_versions: tuple) -> bool:
+        return tag_versions == self.tag_versions(tag for tag, _ in tag_versions)
+
+    # ---- 조회 / 저장 ----
+
+    def _record_served(self, stored_at: float):
+        age = time.time() - stored_at
+        self._served_age_total += age
+        self._served_age_max = max(self._served_age_max, age)
+        self._served_count += 1
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """캐시 조회 (없거나 stale이면 default)"""
+        if not self.enabled:
+            return default
+        now = time.time()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._local.move_to_end(key)
+                else:
+                    del self._local[key]
+                    entry = None
+
+        if entry is not None:
+            _, stored_at, tag_versions, value = entry
+            if self.verify_sample_rate and random.random() < self.verify_sample_rate:
+                self.stats_counters["verified"] += 1
+                if not self._is_current(tag_versions):
+                    self.stats_counters["stale_served"] += 1
+                    with self._lock:
+                        self._local.pop(key, None)
+                    entry = None
+            if entry is not None:
+                self.stats_counters["local_hits"] += 1
+                self._record_served(stored_at)
+                return value
+
+        if self._shared is not None:
+            try:
+                shared_entry = self._shared.get(key, default=None)
+            except Exception:
+                self.stats_counters["errors"] += 1
+                shared_entry = None
+            if shared_entry is not None:
+                stored_at, tag_versions, value = shared_entry
+                if self._is_current(tag_versions):
+                    self.stats_counters["shared_hits"] += 1
+                    self._record_served(stored_at)
+                    self._set_local(key, stored_at, tag_versions, value)
+                    return value
+                self.stats_counters["stale_rejected"] += 1
+
+        self.stats_counters["misses"] += 1
+        return default
+
+    def _set_local(self, key: str, stored_at: float, tag_versions: tuple, value: Any):
+        with self._lock:
+            self._local[key] = (time.time() + self.local_ttl, stored_at, tag_versions, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_maxsize:
+                self._local.popitem(last=False)
+
+    def set(self, key: str, value: Any, tag_versions: tuple):
+        """tag_versions는 로드 직전에 tag_versions()로 읽어 둔 값"""
+        if not self.enabled:
+            return
+        stored_at = time.time()
+        self._set_local(key, stored_at, tag_versions, value)
+        if self._shared is not None:
+            try:
+                self._shared.set(key, (stored_at, tag_versions, value), expire=self.shared_ttl)
+            except Exception:
+                self.stats_counters["errors"] += 1
+        self.stats_counters["sets"] += 1
+
+    def get_or_load(self, key: str, tags: Iterable[str], loader: Callable[[], Any]) -> Any:
+        """캐시에 있으면 반환, 없으면 loader() 결과를 태그와 함께 저장 후 반환 (None은 캐시하지 않음)"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        tag_versions = self.tag_versions(tags) if self.enabled else ()
+        value = loader()
+        if value is not None:
+            self.set(key, value, tag_versions)
+        return value
+
+    # ---- 무효화 ----
+
+    def invalidate(self, *tags: str):
+        """태그 버전을 올려 해당 태그의 모든 항목을 stale 처리 (로컬 항목은 즉시 제거)
+        쓰기 시각(last_invalidated)은 캐시가 꺼져 있어도 기록"""
+        if not tags:
+            return
+        tags = set(tags)
+        now = time.time()
+        for tag in tags:
+            self._local_tag_times[tag] = now
+            if self._shared is not None:
+                try:
+                    self._shared.set(_TAG_TIME_PREFIX + tag, now, expire=self.shared_ttl)
+                except Exception:
+                    self.stats_counters["errors"] += 1
+        if not self.enabled:
+            return
+        for tag in tags:
+            self._local_tags[tag] = self._local_tags.get(tag, 0) + 1
+            if self._shared is not None:
+                try:
+                    self._shared.incr(_TAG_PREFIX + tag, default=0)
+                except Exception:
+                    self.stats_counters["errors"] += 1
+        with self._lock:
+            stale_keys = [k for k, entry in self._local.items() if any(tag in tags for tag, _ in entry[2])]
+            for k in stale_keys:
+                del self._local[k]
+        self.stats_counters["invalidations"] += len(tags)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        if self._shared is not None:
+            self._shared.clear()
+
+    def close(self):
+        """공유 캐시 SQLite 연결 닫기 (다음 사용 시 다시 열림) - fork 전 마스터에서 호출"""
+        if self._shared is not None:
+            self._shared.close()
+
+    def stats(self) -> dict:
+        """적중률/신선도 지표 (워커별 누적값)"""
+        counters = dict(self.stats_counters)
+        lookups = counters["local_hits"] + counters["shared_hits"] + counters["misses"]
+        hits = counters["local_hits"] + counters["shared_hits"]
+        return {
+            **counters,
+            "enabled": self.enabled,
+            "shared_enabled": self.enabled and self._shared is not None,
+            "pid": os.getpid(),
+            "local_size": len(self._local),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "local_hit_rate": round(counters["local_hits"] / lookups, 4) if lookups else 0.0,
+            "stale_served_rate": round(counters["stale_served"] / counters["verified"], 4) if counters["verified"] else 0.0,
+            "served_age_avg_ms": round(self._served_age_total / self._served_count * 1000, 2) if self._served_count else 0.0,
+            "served_age_max_ms": round(self._served_age_max * 1000, 2),
+            "local_ttl_s": self.local_ttl,
+            "shared_ttl_s": self.shared_ttl,
+        }
+
+
+def _default_cache() -> TwoTierCache:
+    directory = os.getenv("SMALLSTEP_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "smallstep_cache")
+    return TwoTierCache(
+        directory=directory,
+        local_ttl=float(os.getenv("SMALLSTEP_CACHE_LOCAL_TTL", "2")),
+        shared_ttl=float(os.getenv("SMALLSTEP_CACHE_TTL", "60")),
+        enabled=os.getenv("SMALLSTEP_CACHE", "1") != "0",
+    )
+
+
+read_cache = _default_cache()
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def goal_tag(goal_id: int) -> str:
+    return f"goal:{goal_id}"
+
+
+def invalidate_on_commit(db: Session, *tags: str):
+    """현재 트랜잭션이 커밋되면 tags를 무효화하도록 등록 (롤백 시 취소)"""
+    db.info.setdefault(_SESSION_TAGS_KEY, set()).update(tag for tag in tags if tag)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session):
+    tags = session.info.pop(_SESSION_TAGS_KEY, None)
+    if tags:
+        read_cache.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(_SESSION_TAGS_KEY, None)
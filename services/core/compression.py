@@ -0,0 +1,196 @@
+"""
+응답 압축 / MessagePack 미들웨어 (ASGI)
+- CompressionMiddleware: Accept-Encoding에 따라 zstd > br > gzip 순으로 선택, minimum_size 미만은 그대로 전송
+- MessagePackMiddleware: Accept: application/msgpack 요청이면 JSON 응답 본문을 MessagePack으로 변환
+
+brotli / zstandard / msgpack은 requirements.txt / pyproject.toml에 포함되어 기본 설치됩니다.
+설치되지 않은 환경에서는 해당 인코딩이 협상 대상에서 빠집니다. (gzip / JSON만 사용)
+스트리밍 응답(more_body)은 변환하지 않고 그대로 통과시킵니다.
+"""
+import gzip
+import json
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 선택 의존성
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 선택 의존성
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 선택 의존성
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+COMPRESSIBLE_TYPES = ("application/json", "application/msgpack", "text/", "application/javascript", "image/svg+xml")
+
+
+def available_encodings() -> list[str]:
+    """서버가 지원하는 Content-Encoding (선호 순)"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def _parse_qualities(header: str) -> dict[str, float]:
+    """'gzip;q=0.8, br' → {'gzip': 0.8, 'br': 1.0}"""
+    qualities = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[token] = q
+    return qualities
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Optional[list[str]] = None) -> Optional[str]:
+    """q값이 가장 높은 인코딩 선택 (동률이면 서버 선호 순), 받을 수 있는 것이 없으면 None"""
+    qualities = _parse_qualities(accept_encoding or "")
+    wildcard = qualities.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in encodings or available_encodings():
+        q = qualities.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4, zstd_level: int = 3) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=zstd_level).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def json_to_msgpack(body: bytes) -> bytes:
+    data = orjson.loads(body) if orjson is not None else json.loads(body)
+    return msgpack.packb(data, use_bin_type=True)
+
+
+class _BufferedResponse(ABC):
+    """단일 body 응답을 모아 transform(start, body) 후 전송하는 공통 ASGI 래퍼"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @abstractmethod
+    def should_handle(self, headers: Headers) -> bool:
+        """요청 헤더를 보고 이 미들웨어가 응답을 변환할지 결정"""
+
+    @abstractmethod
+    def transform(self, request_headers: Headers, headers: MutableHeaders, body: bytes) -> bytes:
+        """응답 본문 변환 (headers는 응답 헤더, 필요하면 여기서 수정)"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        if not self.should_handle(request_headers):
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def wrapped_send(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            if message.get("more_body", False):
+                # 스트리밍 응답은 변환하지 않음
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = self.transform(request_headers, headers, message.get("body", b""))
+            if "content-length" in headers:
+                headers["content-length"] = str(len(body))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, wrapped_send)
+
+
+class MessagePackMiddleware(_BufferedResponse):
+    """Accept 헤더가 MessagePack을 요청하면 application/json 응답을 application/msgpack으로 변환"""
+
+    def should_handle(self, headers: Headers) -> bool:
+        if msgpack is None:
+            return False
+        accept = _parse_qualities(headers.get("accept", ""))
+        return any(accept.get(media_type, 0) > 0 for media_type in MSGPACK_MEDIA_TYPES)
+
+    def transform(self, request_headers: Headers, headers: MutableHeaders, body: bytes) -> bytes:
+        headers.add_vary_header("Accept")
+        if not headers.get("content-type", "").startswith("application/json") or not body:
+            return body
+        try:
+            packed = json_to_msgpack(body)
+        except ValueError:
+            return body
+        headers["content-type"] = "application/msgpack"
+        return packed
+
+
+class CompressionMiddleware(_BufferedResponse):
+    """zstd / br / gzip 응답 압축 (minimum_size 바이트 미만이거나 이미 인코딩된 응답은 제외)"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 4, zstd_level: int = 3):
+        super().__init__(app)
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+
+    def should_handle(self, headers: Headers) -> bool:
+        return negotiate_encoding(headers.get("accept-encoding", "")) is not None
+
+    def transform(self, request_headers: Headers, headers: MutableHeaders, body: bytes) -> bytes:
+        content_type = headers.get("content-type", "")
+        if not any(content_type.startswith(t) for t in COMPRESSIBLE_TYPES):
+            return body
+        headers.add_vary_header("Accept-Encoding")
+        if len(body) < self.minimum_size or "content-encoding" in headers:
+            return body
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        compressed = compress(body, encoding, self.gzip_level, self.brotli_quality, self.zstd_level)
+        headers["content-encoding"] = encoding
+        return compressed
@@ -0,0 +1,213 @@
+"""
+DB 커넥션 풀 설정 / 예열 / 백그라운드 ping / 풀 지표
+
+엔진마다 환경 변수로 풀 크기를 정합니다. ({PREFIX}_ 값이 없으면 DB_POOL_* 공통 값, 그것도 없으면 기본값)
+
+    {PREFIX}_DB_POOL_SIZE       상시 유지 커넥션 수 (기본 5)
+    {PREFIX}_DB_MAX_OVERFLOW    순간적으로 더 열 수 있는 커넥션 수 (기본 10)
+    {PREFIX}_DB_POOL_RECYCLE    커넥션 최대 수명(초) - MySQL wait_timeout보다 짧게 (기본 1800)
+    {PREFIX}_DB_POOL_TIMEOUT    풀이 가득 찼을 때 대기 한도(초) (기본 10)
+    {PREFIX}_DB_POOL_WARM       lifespan 시작 시 미리 열어 둘 커넥션 수 (기본 2, pool_size 이하)
+
+PREFIX는 LOTTO, SMALLSTEP, SMALLSTEP_REPLICA, SMALLSTEP_SHARD 입니다.
+
+pool_pre_ping은 체크아웃마다 SELECT 1 왕복을 더하므로 기본으로 끄고(DB_POOL_PRE_PING=1로 켤 수 있음),
+대신 DB_POOL_PING_INTERVAL초마다 백그라운드 스레드가 유휴 커넥션을 하나씩 꺼내 ping 합니다.
+끊긴 커넥션이 발견되면 SQLAlchemy가 해당 풀의 오래된 커넥션을 모두 무효화하므로
+요청은 새 커넥션을 받습니다. 그래도 ping 사이에 끊긴 커넥션은 첫 쿼리에서 오류가 날 수 있으니
+DB_POOL_RECYCLE을 서버/프록시 유휴 타임아웃보다 짧게 유지하세요.
+
+풀 지표(체크아웃/오버플로/대기 시간)는 main.py의 /metrics(Prometheus 텍스트 형식)로 노출됩니다.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "POOL_SIZE": 5,
+    "MAX_OVERFLOW": 10,
+    "POOL_RECYCLE": 1800,
+    "POOL_TIMEOUT": 10,
+    "POOL_WARM": 2,
+}
+
+
+def _setting(prefix: str, name: str) -> int:
+    value = os.getenv(f"{prefix}_DB_{name}") or os.getenv(f"DB_{name}")
+    return int(value) if value else DEFAULTS[name]
+
+
+class TimedQueuePool(QueuePool):
+    """체크아웃 대기 시간과 타임아웃 횟수를 기록하는 QueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = {"checkouts": 0, "wait_total": 0.0, "wait_max": 0.0, "timeouts": 0}
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats["timeouts"] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            stats = self.wait_stats
+            stats["checkouts"] += 1
+            stats["wait_total"] += waited
+            if waited > stats["wait_max"]:
+                stats["wait_max"] = waited
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+def pool_options(url: str, prefix: str) -> dict:
+    """create_engine에 넘길 풀 옵션 (메모리 SQLite처럼 QueuePool을 쓰지 않는 URL은 빈 dict)"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": _setting(prefix, "POOL_SIZE"),
+        "max_overflow": _setting(prefix, "MAX_OVERFLOW"),
+        "pool_recycle": _setting(prefix, "POOL_RECYCLE"),
+        "pool_timeout": _setting(prefix, "POOL_TIMEOUT"),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING") == "1",
+    }
+
+
+class PoolMonitor:
+    """등록된 엔진의 예열 / 백그라운드 ping / 지표"""
+
+    def __init__(self, ping_interval: float = 30.0):
+        self.ping_interval = ping_interval
+        self._engines: dict[str, tuple[Engine, int]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.ping_failures = 0
+
+    def register(self, name: str, engine: Engine, prefix: str) -> Engine:
+        self._engines[name] = (engine, _setting(prefix, "POOL_WARM"))
+        return engine
+
+    def engines(self) -> dict[str, Engine]:
+        return {name: engine for name, (engine, _) in self._engines.items()}
+
+    def dispose_all(self, close: bool = True):
+        """모든 엔진의 풀을 새로 만듦 - fork 직후 자식에서는 close=False (부모의 커넥션 소켓을 건드리지 않음)"""
+        for engine in self.engines().values():
+            engine.dispose(close=close)
+
+    # ---- 예열 ----
+
+    def warm(self, name: str) -> int:
+        """커넥션 N개를 동시에 열었다가 반납 → 첫 요청들이 TCP/TLS 연결 비용을 내지 않음"""
+        engine, count = self._engines[name]
+        if not isinstance(engine.pool, QueuePool):
+            count = min(count, 1)
+        else:
+            count = min(count, engine.pool.size())
+        connections = []
+        try:
+            for _ in range(count):
+                connections.append(engine.connect())
+        except Exception as e:
+            logger.warning(f"Pool warm-up for {name} stopped after {len(connections)} connections: {e}")
+        finally:
+            for connection in connections:
+                connection.close()
+        return len(connections)
+
+    def warm_all(self) -> dict[str, int]:
+        return {name: self.warm(name) for name in list(self._engines)}
+
+    # ---- 백그라운드 ping ----
+
+    def _ping(self, name: str, engine: Engine):
+        """유휴 커넥션을 하나씩 꺼내 ping (QueuePool은 FIFO라 checkedin 수만큼 돌면 유휴 커넥션 전체를 거침)"""
+        idle = engine.pool.checkedin() if isinstance(engine.pool, QueuePool) else 1
+        for _ in range(idle):
+            try:
+                with engine.connect() as connection:
+                    connection.exec_driver_sql("SELECT 1")
+            except Exception as e:
+                # 끊김 오류면 SQLAlchemy가 이미 풀의 오래된 커넥션을 무효화함
+                self.ping_failures += 1
+                logger.warning(f"DB pool ping failed for {name}: {e}")
+                return
+
+    def _run(self):
+        while not self._stop.wait(self.ping_interval):
+            for name, engine in self.engines().items():
+                self._ping(name, engine)
+
+    def start(self):
+        if self.ping_interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-pool-ping", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    # ---- 지표 ----
+
+    def stats(self) -> dict[str, dict]:
+        result = {}
+        for name, engine in self.engines().items():
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            wait = getattr(pool, "wait_stats", None) or {"checkouts": 0, "wait_total": 0.0, "wait_max": 0.0, "timeouts": 0}
+            result[name] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                **wait,
+            }
+        return result
+
+    def render_metrics(self) -> str:
+        """Prometheus 텍스트 형식"""
+        metrics = [
+            ("db_pool_size", "gauge", "Configured pool size", "size"),
+            ("db_pool_checked_out", "gauge", "Connections currently checked out", "checked_out"),
+            ("db_pool_checked_in", "gauge", "Idle connections in the pool", "checked_in"),
+            ("db_pool_overflow", "gauge", "Overflow connections currently open", "overflow"),
+            ("db_pool_checkouts_total", "counter", "Connection checkouts", "checkouts"),
+            ("db_pool_wait_seconds_total", "counter", "Total time spent waiting for a connection", "wait_total"),
+            ("db_pool_wait_seconds_max", "gauge", "Longest wait for a connection", "wait_max"),
+            ("db_pool_timeouts_total", "counter", "Checkouts that hit the pool timeout", "timeouts"),
+        ]
+        stats = self.stats()
+        lines = []
+        for metric, kind, help_text, key in metrics:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, values in stats.items():
+                lines.append(f'{metric}{{engine="{name}"}} {values[key]}')
+        lines.append("# HELP db_pool_ping_failures_total Background ping failures")
+        lines.append("# TYPE db_pool_ping_failures_total counter")
+        lines.append(f"db_pool_ping_failures_total {self.ping_failures}")
+        return "\n".join(lines) + "\n"
+
+
+pool_monitor = PoolMonitor(ping_interval=float(os.getenv("DB_POOL_PING_INTERVAL", "30")))
@@ -0,0 +1,164 @@
+"""
+읽기 복제본(replica) 라우팅
+
+database.get_smallstep_read_db가 요청마다 ReplicaRouter.choose()로 복제본/primary 세션을 고릅니다.
+
+복제본을 쓰는 조건 (하나라도 어긋나면 primary):
+1. 복제본 URL(smallstep_mysql_replica)이 설정되어 있음
+2. GET/HEAD 요청이거나 핸들러에 @read_replica가 붙어 있음 (@read_primary면 항상 primary)
+3. read-your-writes: 최근 STICKY_SECONDS 안에 쓰기를 한 클라이언트/사용자가 아님
+   - 클라이언트: 쓰기 요청 응답에 ReadYourWritesMiddleware가 설정한 쿠키(또는 X-Read-Primary 헤더)
+   - 사용자/목표: 경로·쿼리의 user_id/goal_id 태그가 최근에 무효화(쓰기 커밋)되었는지 (services/core/cache.py)
+4. 복제 지연이 MAX_LAG 이하 (LAG_CHECK_INTERVAL초마다 측정, 측정 실패 시 primary)
+
+STICKY_SECONDS는 MAX_LAG보다 커야 복제본에서 읽은 이전 데이터가 새 태그 버전으로 읽기 캐시에 들어가지 않습니다.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.core.cache import read_cache, user_tag, goal_tag
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_COOKIE = "smallstep_primary_until"
+STICKY_HEADER = "x-read-primary"
+
+_ROUTE_ATTR = "_db_route"
+
+
+def read_replica(func: Callable) -> Callable:
+    """GET이 아니어도 읽기만 하는 핸들러를 복제본으로 라우팅 (예: 조회용 POST 검색)"""
+    setattr(func, _ROUTE_ATTR, "replica")
+    return func
+
+
+def read_primary(func: Callable) -> Callable:
+    """GET이어도 항상 primary에서 읽어야 하는 핸들러 (조회 중 쓰기가 일어나는 경우 등)"""
+    setattr(func, _ROUTE_ATTR, "primary")
+    return func
+
+
+def mysql_replica_lag(engine: Engine) -> Optional[float]:
+    """복제 지연(초) - MySQL은 SHOW REPLICA STATUS, 그 외 DB는 연결만 확인하고 0. 복제 중단/실패 시 None"""
+    with engine.connect() as connection:
+        if engine.dialect.name != "mysql":
+            connection.execute(text("SELECT 1"))
+            return 0.0
+        try:
+            row = connection.execute(text("SHOW REPLICA STATUS")).mappings().first()
+        except Exception:
+            row = connection.execute(text("SHOW SLAVE STATUS")).mappings().first()
+        if row is None:
+            return 0.0  # 복제 설정이 없는 인스턴스 (로컬 테스트용 두 번째 DB 등)
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        return float(lag) if lag is not None else None
+
+
+class ReplicaRouter:
+    def __init__(self, replica_engine: Optional[Engine], max_lag: float = 2.0, sticky_seconds: float = 5.0,
+                 lag_check_interval: float = 5.0, lag_probe: Optional[Callable[[Engine], Optional[float]]] = None):
+        self.replica_engine = replica_engine
+        self.max_lag = max_lag
+        self.sticky_seconds = sticky_seconds
+        self.lag_check_interval = lag_check_interval
+        self.lag_probe = lag_probe or mysql_replica_lag
+        self._lag: Optional[float] = None
+        self._lag_checked_at = 0.0
+        self._lock = threading.Lock()
+        self.counters = {"replica": 0, "primary_method": 0, "primary_sticky": 0, "primary_lag": 0, "primary_no_replica": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.replica_engine is not None
+
+    def lag(self) -> Optional[float]:
+        """캐시된 복제 지연 (LAG_CHECK_INTERVAL마다 한 요청만 측정)"""
+        now = time.monotonic()
+        if now - self._lag_checked_at < self.lag_check_interval:
+            return self._lag
+        if not self._lock.acquire(blocking=False):
+            return self._lag
+        try:
+            try:
+                self._lag = self.lag_probe(self.replica_engine)
+            except Exception as e:
+                logger.warning(f"Replica lag check failed: {e}")
+                self._lag = None
+            self._lag_checked_at = time.monotonic()
+            return self._lag
+        finally:
+            self._lock.release()
+
+    def _is_sticky(self, request: Request) -> bool:
+        if request.headers.get(STICKY_HEADER):
+            return True
+        try:
+            if float(request.cookies.get(STICKY_COOKIE, 0)) > time.time():
+                return True
+        except ValueError:
+            pass
+        tags = []
+        for name, make_tag in (("user_id", user_tag), ("goal_id", goal_tag)):
+            value = request.path_params.get(name) or request.query_params.get(name)
+            if value:
+                tags.append(make_tag(value))
+        return bool(tags) and read_cache.last_invalidated(tags) > time.time() - self.sticky_seconds
+
+    def choose(self, request: Request) -> str:
+        """'replica' 또는 'primary'"""
+        if not self.enabled:
+            reason = "primary_no_replica"
+        else:
+            mark = getattr(request.scope.get("endpoint"), _ROUTE_ATTR, None)
+            if mark == "primary" or (mark != "replica" and request.method not in SAFE_METHODS):
+                reason = "primary_method"
+            elif self._is_sticky(request):
+                reason = "primary_sticky"
+            else:
+                lag = self.lag()
+                reason = "replica" if lag is not None and lag <= self.max_lag else "primary_lag"
+        self.counters[reason] += 1
+        return "replica" if reason == "replica" else "primary"
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "enabled": self.enabled,
+            "lag_s": self._lag,
+            "max_lag_s": self.max_lag,
+            "sticky_s": self.sticky_seconds,
+        }
+
+
+class ReadYourWritesMiddleware:
+    """쓰기 요청(성공 응답) 후 STICKY_SECONDS 동안 같은 클라이언트의 읽기를 primary로 보내도록 쿠키 설정"""
+
+    def __init__(self, app: ASGIApp, sticky_seconds: float = 5.0):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def wrapped_send(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.sticky_seconds
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{STICKY_COOKIE}={until:.3f}; Max-Age={int(self.sticky_seconds) + 1}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, wrapped_send)
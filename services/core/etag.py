@@ -0,0 +1,50 @@
+"""
+ETag / 조건부 GET 헬퍼
+버전 컬럼(updated_at 등) 값으로 약한 ETag를 만들고, If-None-Match가 일치하면
+전체 행을 읽거나 직렬화하지 않고 304로 응답할 수 있게 합니다.
+
+updated_at은 초 단위라 같은 초 안의 두 번의 변경을 구분하지 못하므로,
+자주 바뀌는 카운터(XP 등)를 버전 값에 함께 넣어 사용합니다.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(kind: str, ident: Any, values: tuple, variant: Any = None) -> str:
+    """(리소스 종류, id, 버전 값, 표현 변형) → W/"..." (variant: ?fields= 처럼 같은 리소스의 다른 표현)"""
+    raw = repr((kind, ident, tuple(values), variant)).encode()
+    return f'W/"{hashlib.blake2b(raw, digest_size=8).hexdigest()}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 약한 비교 (RFC 9110 13.1.2) - '*' 또는 목록 중 하나라도 일치하면 True"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = _opaque(etag)
+    return any(_opaque(candidate) == target for candidate in if_none_match.split(","))
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    return etag_matches(request.headers.get("if-none-match"), etag)
+
+
+def set_etag(response: Response, etag: str) -> Response:
+    """응답에 ETag와 재검증 강제 Cache-Control 설정"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def not_modified(etag: str) -> Response:
+    return set_etag(Response(status_code=304), etag)
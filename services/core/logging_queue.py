@@ -0,0 +1,218 @@
+"""
+큐 기반 비동기 로깅 (gunicorn.conf.py에서 사용)
+
+요청 스레드는 레코드를 bounded 큐에 넣기만 하고(QueueHandler), 파일 쓰기/회전은 로그별 QueueListener 스레드가 합니다.
+디스크가 잠깐 멈춰도 요청 지연으로 번지지 않습니다.
+
+- 큐가 가득 차면 기다리지 않고 버리며 로그별로 개수를 셉니다. (/metrics의 log_records_dropped_total)
+  버린 개수는 리스너가 다음 레코드를 쓸 때 경고 한 줄로 파일에도 남깁니다.
+- SharedTimedRotatingFileHandler: 여러 워커가 같은 파일에 쓰더라도 자정 회전을 파일 잠금(fcntl)으로
+  한 프로세스만 수행하고, 나머지 프로세스는 회전된 것을 보고 새 파일을 다시 엽니다.
+  (기본 TimedRotatingFileHandler는 워커마다 회전해 방금 회전한 파일을 지우거나 덮어쓸 수 있음)
+- LOG_JSON=1이면 JSON 한 줄 형식. 메시지가 JSON 객체(분석 이벤트 등)면 필드를 그대로 펼칩니다.
+
+리스너 스레드는 fork를 넘어가지 않으므로 gunicorn post_fork 훅에서 restart_after_fork()로 워커마다 새로 시작합니다.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# 종료 시 큐가 가득 차 있으면 리스너가 자리를 비울 때까지 종료 신호를 넣으며 기다리는 시간(초)
+STOP_TIMEOUT = float(os.getenv("LOG_QUEUE_STOP_TIMEOUT", "10"))
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON lines 포맷 - 메시지가 JSON 객체 문자열이면 펼쳐서 병합"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "pid": record.process,
+        }
+        message = record.getMessage()
+        payload = None
+        if message.startswith("{"):
+            try:
+                payload = json.loads(message)
+            except ValueError:
+                payload = None
+        if isinstance(payload, dict):
+            data.update(payload)
+        else:
+            data["message"] = message
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SharedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """여러 프로세스가 함께 쓰는 파일용 TimedRotatingFileHandler (회전은 잠금을 잡은 한 프로세스만)"""
+
+    def __init__(self, filename: str, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.lock_path = self.baseFilename + ".lock"
+
+    def _rotated_elsewhere(self) -> bool:
+        """다른 프로세스가 이미 회전해 경로가 새 파일을 가리키는지 (또는 아직 새 파일이 없는지)"""
+        if self.stream is None:
+            return False
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            return True
+        opened = os.fstat(self.stream.fileno())
+        return (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino)
+
+    def _reopen(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        self.stream = self._open()
+
+    def doRollover(self):
+        if fcntl is None:
+            return super().doRollover()
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if self._rotated_elsewhere():
+                    self._reopen()
+                    self.rolloverAt = self.computeRollover(int(time.time()))
+                else:
+                    super().doRollover()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 블로킹하지 않고 버리고 개수를 셈"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(logging.handlers.QueueListener):
+    def __init__(self, log_queue: queue.Queue, handler: logging.Handler, queue_handler: DroppingQueueHandler):
+        super().__init__(log_queue, handler, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.reported = 0
+
+    def enqueue_sentinel(self, timeout: float = STOP_TIMEOUT):
+        # 기본 구현은 put_nowait이라 큐가 가득 찬 상태(디스크 지연)에서 종료하면 queue.Full로 실패함
+        self.queue.put(self._sentinel, timeout=timeout)
+
+    def stop(self):
+        """남은 레코드를 쓰고 종료 - 종료 신호 대기와 join을 합쳐 STOP_TIMEOUT까지만 기다림
+        (자리가 나지 않으면 queue.Full, 기한 안에 다 쓰지 못하면 TimeoutError)"""
+        deadline = time.monotonic() + STOP_TIMEOUT
+        self.enqueue_sentinel(timeout=STOP_TIMEOUT)
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+        if self._thread.is_alive():
+            raise TimeoutError("log listener did not finish writing before the stop timeout")
+        self._thread = None
+
+    def handle(self, record: logging.LogRecord):
+        dropped = self.queue_handler.dropped
+        if dropped > self.reported:
+            warning = logging.LogRecord(record.name, logging.WARNING, __file__, 0,
+                                        f"log queue full - dropped {dropped - self.reported} records", None, None)
+            self.reported = dropped
+            super().handle(warning)
+        super().handle(record)
+
+
+class QueuedLog:
+    """파일 핸들러 하나를 bounded 큐 + 리스너 스레드 뒤에 두고, 로거에는 QueueHandler만 붙임"""
+
+    def __init__(self, name: str, handler: logging.Handler, maxsize: int = 10000):
+        self.name = name
+        self.handler = handler
+        self.maxsize = maxsize
+        self.queue_handler = DroppingQueueHandler(queue.Queue(maxsize))
+        self.queue_handler.setLevel(handler.level)
+        self.listener: Optional[_Listener] = None
+
+    def start(self):
+        self.listener = _Listener(self.queue_handler.queue, self.handler, self.queue_handler)
+        self.listener.start()
+
+    def stop(self):
+        """남은 레코드를 모두 쓰고 리스너 종료 (STOP_TIMEOUT 안에 끝나지 않으면 queue.Full / TimeoutError)"""
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+        self.listener = None
+
+    def restart_after_fork(self):
+        # 부모의 큐 잠금이 잡힌 상태로 복사됐을 수 있으므로 큐와 리스너를 새로 만듦
+        self.queue_handler.queue = queue.Queue(self.maxsize)
+        self.queue_handler.dropped = 0
+        self.queue_handler.createLock()
+        self.handler.createLock()
+        self.listener = None
+        self.start()
+
+
+queued_logs: dict[str, QueuedLog] = {}
+
+
+def queued_file_log(name: str, path: str, level: int = logging.NOTSET, backup_count: int = 30) -> logging.Handler:
+    """회전 파일 로그를 큐 뒤에 만들고 로거에 붙일 QueueHandler 반환"""
+    handler = SharedTimedRotatingFileHandler(path, when="midnight", interval=1, backupCount=backup_count)
+    handler.setLevel(level)
+    handler.setFormatter(JsonFormatter() if os.getenv("LOG_JSON") == "1" else logging.Formatter(LOG_FORMAT))
+    log = QueuedLog(name, handler, maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    log.start()
+    queued_logs[name] = log
+    return log.queue_handler
+
+
+def restart_after_fork():
+    for log in queued_logs.values():
+        log.restart_after_fork()
+
+
+def stop_all():
+    for name, log in queued_logs.items():
+        try:
+            log.stop()
+        except (queue.Full, TimeoutError):
+            # 로그 파일 쓰기가 멈춘 상태 - 같은 큐로 로깅할 수 없으므로 stderr에 남기고 다음 로그 종료
+            sys.stderr.write(f"log queue '{name}' not drained within {STOP_TIMEOUT:.0f}s at shutdown - "
+                             f"{log.queue_handler.queue.qsize()} records not written\n")
+
+
+def render_metrics() -> str:
+    """Prometheus 텍스트 형식 - 로그별 버린 레코드 수 / 큐 길이"""
+    lines = [
+        "# HELP log_records_dropped_total Log records dropped because the log queue was full",
+        "# TYPE log_records_dropped_total counter",
+    ]
+    lines += [f'log_records_dropped_total{{log="{name}"}} {log.queue_handler.dropped}' for name, log in queued_logs.items()]
+    lines += ["# HELP log_queue_size Log records waiting to be written", "# TYPE log_queue_size gauge"]
+    lines += [f'log_queue_size{{log="{name}"}} {log.queue_handler.queue.qsize()}' for name, log in queued_logs.items()]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,204 @@
+"""
+마이크로 캐시 + 동시 요청 병합 (thundering herd 방지)
+
+푸시 알림 직후처럼 같은 GET이 짧은 시간에 몰리는 엔드포인트용입니다.
+- 라우트 + 파라미터를 키로 직렬화된 응답 본문을 아주 짧게(기본 1초) 보관합니다.
+- 같은 키의 요청이 계산 중이면 새로 DB를 조회하지 않고 그 결과를 기다려 함께 사용합니다.
+
+캐시 값은 ORM 객체가 아니라 JSON bytes이므로 세션/스레드와 무관하게 공유됩니다.
+
+tags로 파라미터 → 읽기 캐시 태그(services/core/cache.py)를 지정하면, 그 태그의 쓰기가 커밋된 뒤에는
+이전에 계산된 항목을 쓰지 않습니다. (invalidate_on_commit → after_commit에서 기록되는 태그별 쓰기 시각과 비교,
+다른 워커의 쓰기도 공유 저장소로 반영) 태스크 완료 직후 같은 사용자의 조회가 이전 응답을 받지 않도록 합니다.
+
+라우터 모듈마다 MicroCache를 하나 만들고 핸들러에 데코레이터로 붙입니다:
+
+    micro_cache = MicroCache("tasks", ttl=1.0)
+
+    @router.get("/tasks/today", response_model=List[TaskResponse])
+    @micro_cache.cached(List[TaskResponse], tags={"goal_id": goal_tag})
+    def get_today_tasks(goal_id: int, db: Session = Depends(get_smallstep_db)): ...
+
+SMALLSTEP_MICROCACHE=0 으로 끌 수 있고, SMALLSTEP_MICROCACHE_TTL 로 기본 TTL을 바꿀 수 있습니다.
+"""
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+from fastapi import BackgroundTasks, Request, Response
+from sqlalchemy.orm import Session
+
+from services.core.cache import read_cache
+from services.core.responses import dump_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_HEADER = "X-Micro-Cache"
+
+# 이름 → MicroCache (통계 엔드포인트에서 사용)
+micro_caches: dict[str, "MicroCache"] = {}
+
+_UNKEYED_TYPES = (Session, Request, Response, BackgroundTasks)
+
+
+class _Flight:
+    """진행 중인 계산 하나 - 리더가 결과를 채우면 대기자들이 깨어남"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[tuple] = None
+        self.error: Optional[BaseException] = None
+
+
+class MicroCache:
+    def __init__(self, name: str, ttl: Optional[float] = None, maxsize: int = 1024,
+                 wait_timeout: float = 10.0, enabled: Optional[bool] = None):
+        self.name = name
+        self.ttl = ttl if ttl is not None else float(os.getenv("SMALLSTEP_MICROCACHE_TTL", "1"))
+        self.maxsize = maxsize
+        self.wait_timeout = wait_timeout
+        self.enabled = enabled if enabled is not None else os.getenv("SMALLSTEP_MICROCACHE", "1") != "0"
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()  # key -> (expires_at, started_at, tags, (status, media_type, body))
+        self._flights: dict[tuple, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats_counters = {"hits": 0, "misses": 0, "collapsed": 0, "wait_timeouts": 0, "errors": 0, "invalidated": 0}
+        micro_caches[name] = self
+
+    # ---- 키 / 응답 변환 ----
+
+    @staticmethod
+    def _key(func: Callable, kwargs: dict) -> tuple:
+        """함수 + (세션/요청 객체를 제외한) 파라미터 값으로 키 생성"""
+        parts = []
+        for name in sorted(kwargs):
+            value = kwargs[name]
+            if isinstance(value, _UNKEYED_TYPES):
+                continue
+            if isinstance(value, list):
+                value = tuple(value)
+            parts.append((name, value))
+        return (func.__module__, func.__qualname__, tuple(parts))
+
+    @staticmethod
+    def _to_entry(tp: Any, result: Any) -> tuple:
+        """핸들러 반환값 → (status, media_type, body) - Response면 본문 그대로, 아니면 tp로 직렬화"""
+        if isinstance(result, Response):
+            return result.status_code, result.media_type, bytes(result.body)
+        return 200, "application/json", dump_json(tp, result)
+
+    @staticmethod
+    def _to_response(entry: tuple, state: str) -> Response:
+        status_code, media_type, body = entry
+        response = Response(content=body, status_code=status_code, media_type=media_type)
+        response.headers[CACHE_HEADER] = state
+        return response
+
+    # ---- 조회 / 계산 ----
+
+    def _lookup(self, key: tuple) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, started_at, tags, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        if tags and read_cache.last_invalidated(tags) >= started_at:
+            # 계산 시작 이후 태그에 쓰기가 커밋됨
+            del self._entries[key]
+            self.stats_counters["invalidated"] += 1
+            return None
+        return value
+
+    def _store(self, key: tuple, value: tuple, started_at: float, tags: tuple):
+        self._entries[key] = (time.monotonic() + self.ttl, started_at, tags, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def fetch(self, key: tuple, compute: Callable[[], tuple], tags: Iterable[str] = ()) -> tuple[tuple, str]:
+        """(entry, "HIT" | "COLLAPSED" | "MISS") - 같은 key의 동시 계산은 하나로 합침"""
+        tags = tuple(tags)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self.stats_counters["hits"] += 1
+                return cached, "HIT"
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.stats_counters["misses"] += 1
+            else:
+                self.stats_counters["collapsed"] += 1
+
+        if not leader:
+            if flight.done.wait(self.wait_timeout):
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result, "COLLAPSED"
+            # 리더가 너무 오래 걸리면 직접 계산
+            self.stats_counters["wait_timeouts"] += 1
+            return compute(), "MISS"
+
+        started_at = time.time()
+        try:
+            flight.result = compute()
+        except BaseException as e:
+            # 예외(404 등)는 대기 중인 요청에 그대로 전달하고 캐시하지 않음
+            flight.error = e
+            self.stats_counters["errors"] += 1
+            raise
+        else:
+            with self._lock:
+                self._store(key, flight.result, started_at, tags)
+            return flight.result, "MISS"
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def cached(self, response_type: Any = None, tags: Optional[dict[str, Callable[[Any], str]]] = None) -> Callable:
+        """
+        동기 핸들러용 데코레이터 - response_type은 라우트의 response_model과 같은 타입
+        (핸들러가 Response를 직접 반환하면 생략 가능)
+        tags: 파라미터 이름 → 태그 함수 (예: {"goal_id": goal_tag}) - 해당 태그 쓰기 커밋 후 항목을 버림
+        """
+        def decorator(func: Callable) -> Callable:
+            if inspect.iscoroutinefunction(func):
+                raise TypeError("MicroCache.cached는 동기(def) 핸들러에만 사용할 수 있습니다.")
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                key = self._key(func, kwargs)
+                entry_tags = [make_tag(kwargs[name]) for name, make_tag in (tags or {}).items()
+                              if kwargs.get(name) is not None]
+                entry, state = self.fetch(key, lambda: self._to_entry(response_type, func(*args, **kwargs)), entry_tags)
+                return self._to_response(entry, state)
+
+            return wrapper
+
+        return decorator
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        counters = dict(self.stats_counters)
+        lookups = counters["hits"] + counters["misses"] + counters["collapsed"]
+        return {
+            **counters,
+            "enabled": self.enabled,
+            "ttl_s": self.ttl,
+            "size": len(self._entries),
+            "in_flight": len(self._flights),
+            "db_saved_rate": round((counters["hits"] + counters["collapsed"]) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,55 @@
+"""
+gunicorn preload_app(prefork) 지원 - gunicorn.conf.py의 when_ready / post_fork 훅에서 호출
+
+GUNICORN_PRELOAD=1이면 마스터가 앱(main.py, models.py, 라우터 전체)을 한 번만 import하고
+아래 prepare_master()로 무거운 1회성 준비까지 끝낸 뒤 fork합니다.
+워커는 이 메모리 페이지를 copy-on-write로 공유하므로 워커 수를 늘려도 코드/스키마 메모리가 늘지 않습니다.
+
+마스터에서 미리 하는 것 (DB 연결이 필요 없는 것만):
+- litellm/instructor import (워커당 수십 MB, services/ai/client.py)
+- SQLAlchemy mapper 구성, openapi.json 렌더링/압축 (services/core/warmup.py)
+- gc.freeze() - 지금까지 만든 객체를 GC 추적 대상에서 빼서, 워커의 GC가 공유 페이지를 건드려 복사되지 않도록 함
+
+fork 직후 워커에서 (after_fork):
+- 모든 DB 엔진 풀을 dispose(close=False)로 새로 만듦 (부모 소켓은 닫지 않고 버림)
+- AI 클라이언트 초기화 - 다음 사용 시(또는 lifespan의 백그라운드 warm-up에서) 워커 전용으로 다시 생성
+DB 커넥션 예열, 핫 쿼리 컴파일, 백그라운드 ping은 워커별 lifespan에서 그대로 실행됩니다.
+"""
+import gc
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_master():
+    start = time.perf_counter()
+    from sqlalchemy.orm import configure_mappers
+
+    import main
+    from services.ai.client import get_ai_client
+    from services.core.cache import read_cache
+    from services.core.db_pool import pool_monitor
+
+    try:
+        get_ai_client()
+    except Exception as e:
+        logger.warning(f"AI client preload failed (workers will load it lazily): {e}")
+    configure_mappers()
+    main.openapi_cache.ensure_rendered()
+
+    # 마스터는 요청을 처리하지 않으므로 연결을 들고 있지 않게 정리 (워커에 상속되지 않도록)
+    pool_monitor.dispose_all()
+    read_cache.close()
+
+    gc.collect()
+    gc.freeze()
+    logger.info(f"preload done in {(time.perf_counter() - start) * 1000:.0f}ms, {gc.get_freeze_count()} objects frozen")
+
+
+def after_fork():
+    from services.ai.client import reset_ai_client
+    from services.core.db_pool import pool_monitor
+
+    pool_monitor.dispose_all(close=False)
+    reset_ai_client()
@@ -0,0 +1,220 @@
+"""
+쿼리 fingerprint 통계 / 느린 쿼리 수집
+
+query_stats.add_query_listener로 두 엔진의 모든 쿼리를 받아 fingerprint(리터럴 제거 SQL)별로
+호출 수, 총/평균/p99 시간, 반환 행 수를 집계합니다. (sqlalchemy.engine 로그 레벨과 무관)
+행 수는 DBAPI cursor.rowcount 기준입니다. (pymysql은 SELECT 결과 행 수, SQLite는 SELECT에서 -1 → 0)
+
+- 표는 최대 QUERY_PROFILE_MAX개 fingerprint만 유지하고, 넘치면 총 시간이 가장 작은 항목을 버립니다.
+- p99는 fingerprint별 최근 샘플(기본 256개) 기준입니다.
+- QUERY_SLOW_MS 이상 걸린 SELECT는 원래 SQL/파라미터와 요청 경로를 기록하고,
+  백그라운드 스레드가 별도 커넥션으로 EXPLAIN을 실행해 붙입니다. (요청 경로에서는 EXPLAIN 하지 않음)
+- QUERY_PROFILE_DUMP_INTERVAL초마다 상위 항목을 smallstep.analytics 로거에 JSON 한 줄로 남깁니다.
+
+백그라운드 스레드는 첫 쿼리 기록 시 프로세스별로 시작되므로 gunicorn fork 이후에도 워커마다 동작합니다.
+QUERY_PROFILE=0 으로 끌 수 있습니다.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from services.core.query_stats import add_query_listener, current_stats, fingerprint
+
+logger = logging.getLogger(__name__)
+analytics_logger = logging.getLogger("smallstep.analytics")
+
+SORT_KEYS = ("total_ms", "mean_ms", "p99_ms", "calls", "rows")
+
+
+class _FingerprintStats:
+    __slots__ = ("engine", "fingerprint", "calls", "total", "max", "rows", "samples", "last_route")
+
+    def __init__(self, engine: str, fp: str, sample_size: int):
+        self.engine = engine
+        self.fingerprint = fp
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples: deque[float] = deque(maxlen=sample_size)
+        self.last_route: Optional[str] = None
+
+    def p99(self) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def to_dict(self) -> dict:
+        return {
+            "engine": self.engine,
+            "fingerprint": self.fingerprint,
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 2),
+            "mean_ms": round(self.total / self.calls * 1000, 3) if self.calls else 0.0,
+            "p99_ms": round(self.p99() * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "rows": self.rows,
+            "rows_per_call": round(self.rows / self.calls, 2) if self.calls else 0.0,
+            "last_route": self.last_route,
+        }
+
+
+class QueryProfiler:
+    def __init__(self, max_fingerprints: int = 500, sample_size: int = 256, slow_ms: float = 200.0,
+                 max_slow: int = 50, dump_interval: float = 300.0, dump_top: int = 20, enabled: bool = True):
+        self.max_fingerprints = max_fingerprints
+        self.sample_size = sample_size
+        self.slow_seconds = slow_ms / 1000
+        self.dump_interval = dump_interval
+        self.dump_top = dump_top
+        self.enabled = enabled
+        self._table: dict[tuple[str, str], _FingerprintStats] = {}
+        self._slow: deque[dict] = deque(maxlen=max_slow)
+        self._explain_queue: queue.Queue = queue.Queue(maxsize=100)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_pid: Optional[int] = None
+        self.since = datetime.now()
+
+    # ---- 수집 ----
+
+    def record(self, engine_name: str, statement: str, parameters, elapsed: float, rowcount: int, conn):
+        """query_stats 리스너 - 모든 계측 엔진의 쿼리 실행 후 호출"""
+        if not self.enabled or getattr(self._local, "explaining", False):
+            return
+        self._ensure_started()
+        fp = fingerprint(statement)
+        stats = current_stats()
+        route = stats.route if stats is not None else None
+        with self._lock:
+            entry = self._table.get((engine_name, fp))
+            if entry is None:
+                if len(self._table) >= self.max_fingerprints:
+                    coldest = min(self._table, key=lambda k: self._table[k].total)
+                    del self._table[coldest]
+                entry = self._table[(engine_name, fp)] = _FingerprintStats(engine_name, fp, self.sample_size)
+            entry.calls += 1
+            entry.total += elapsed
+            entry.max = max(entry.max, elapsed)
+            entry.rows += max(rowcount or 0, 0)
+            entry.samples.append(elapsed)
+            if route:
+                entry.last_route = route
+
+        if elapsed >= self.slow_seconds and statement.lstrip()[:6].upper() == "SELECT":
+            slow = {
+                "at": datetime.now().isoformat(timespec="seconds"),
+                "engine": engine_name,
+                "route": route,
+                "elapsed_ms": round(elapsed * 1000, 2),
+                "fingerprint": fp,
+                "statement": statement,
+                "explain": None,
+            }
+            with self._lock:
+                self._slow.append(slow)
+            try:
+                self._explain_queue.put_nowait((conn.engine, statement, parameters, slow))
+            except queue.Full:
+                pass
+
+    # ---- 백그라운드 (EXPLAIN / 주기적 덤프) ----
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._started_pid == pid:
+            return
+        with self._lock:
+            if self._started_pid == pid:
+                return
+            self._started_pid = pid
+        threading.Thread(target=self._explain_worker, name="query-profile-explain", daemon=True).start()
+        if self.dump_interval > 0:
+            threading.Thread(target=self._dump_worker, name="query-profile-dump", daemon=True).start()
+
+    def _explain(self, engine, statement: str, parameters) -> list:
+        prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+        self._local.explaining = True
+        try:
+            with engine.connect() as connection:
+                result = connection.exec_driver_sql(prefix + statement, parameters or ())
+                return [dict(row._mapping) for row in result]
+        finally:
+            self._local.explaining = False
+
+    def _explain_worker(self):
+        while True:
+            engine, statement, parameters, slow = self._explain_queue.get()
+            try:
+                slow["explain"] = self._explain(engine, statement, parameters)
+            except Exception as e:
+                slow["explain"] = f"EXPLAIN failed: {e}"
+            analytics_logger.info(json.dumps({"event": "slow_query", **slow}, ensure_ascii=False, default=str))
+
+    def _dump_worker(self):
+        while True:
+            time.sleep(self.dump_interval)
+            try:
+                self.dump()
+            except Exception:
+                logger.exception("query profile dump failed")
+
+    def dump(self):
+        """상위 fingerprint를 분석 로그에 한 줄(JSON)로 기록"""
+        top = self.top(limit=self.dump_top)
+        if top:
+            analytics_logger.info(json.dumps(
+                {"event": "query_stats", "pid": os.getpid(), "since": self.since.isoformat(timespec="seconds"), "top": top},
+                ensure_ascii=False,
+            ))
+
+    # ---- 조회 ----
+
+    def top(self, sort: str = "total_ms", limit: int = 50, engine: Optional[str] = None) -> list[dict]:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {SORT_KEYS}")
+        with self._lock:
+            rows = [entry.to_dict() for entry in self._table.values() if engine is None or entry.engine == engine]
+        rows.sort(key=lambda row: row[sort], reverse=True)
+        return rows[:limit]
+
+    def slow_queries(self) -> list[dict]:
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._table.clear()
+            self._slow.clear()
+            self.since = datetime.now()
+
+    def summary(self) -> dict:
+        with self._lock:
+            calls = sum(entry.calls for entry in self._table.values())
+            total = sum(entry.total for entry in self._table.values())
+            size = len(self._table)
+        return {
+            "pid": os.getpid(),
+            "since": self.since.isoformat(timespec="seconds"),
+            "fingerprints": size,
+            "max_fingerprints": self.max_fingerprints,
+            "calls": calls,
+            "total_ms": round(total * 1000, 2),
+            "slow_threshold_ms": self.slow_seconds * 1000,
+        }
+
+
+query_profiler = QueryProfiler(
+    max_fingerprints=int(os.getenv("QUERY_PROFILE_MAX", "500")),
+    slow_ms=float(os.getenv("QUERY_SLOW_MS", "200")),
+    dump_interval=float(os.getenv("QUERY_PROFILE_DUMP_INTERVAL", "300")),
+    enabled=os.getenv("QUERY_PROFILE", "1") != "0",
+)
+add_query_listener(query_profiler.record)
@@ -0,0 +1,245 @@
+"""
+요청 단위 쿼리 계측 (쿼리 수 / DB 시간 / N+1 탐지)
+
+database.py의 두 엔진에 instrument_engine()으로 before/after_cursor_execute 리스너를 붙이고,
+(실패한 쿼리 - IntegrityError, 데드락, 락 대기 타임아웃 등 - 는 handle_error에서 같은 방식으로 기록)
+QueryStatsMiddleware가 요청마다 RequestQueryStats를 ContextVar에 넣어 둡니다.
+동기 핸들러는 스레드풀에서 실행되지만 컨텍스트가 복사되어 같은 RequestQueryStats 객체에 기록됩니다.
+
+- 같은 fingerprint(리터럴/바인드 파라미터를 ?로 바꾼 SQL)의 SELECT가 한 요청에서
+  N_PLUS_ONE_THRESHOLD회 이상 실행되면 N+1 의심으로 경고 로그를 남깁니다.
+- DEV 모드(또는 QUERY_STATS_HEADERS=1)에서는 응답에 X-DB-Queries / X-DB-Time(ms) / X-DB-Repeated 헤더를 붙입니다.
+- 핸들러에 @query_budget(n)을 붙이면 쿼리 수 상한을 선언합니다. 초과 시 경고 로그를 남기고,
+  QUERY_BUDGET_STRICT=1(테스트용 엄격 모드)이면 응답을 500으로 바꿉니다.
+- 요청 밖(스크립트/테스트)에서는 count_queries(budget=...) 컨텍스트 매니저로 같은 집계를 사용할 수 있습니다.
+"""
+import functools
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+_START_TIMES_KEY = "query_stats_start"
+
+# 쿼리 실행 후 추가로 호출할 콜백 (engine_name, statement, parameters, elapsed, rowcount, conn)
+_listeners: list[Callable] = []
+
+_current: ContextVar[Optional["RequestQueryStats"]] = ContextVar("smallstep_query_stats", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, route: str, budget: int, count: int):
+        self.route = route
+        self.budget = budget
+        self.count = count
+        super().__init__(f"Query budget exceeded on {route}: {count} queries (budget {budget})")
+
+
+# ---- fingerprint ----
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_PARAM_RE = re.compile(r"%\([^)]+\)s|%s|\?|:\w+")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_RE = re.compile(r"\bVALUES\s*\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*", re.I)
+_SPACE_RE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """SQL에서 리터럴/파라미터를 ?로 바꾸고 IN 목록·다중 VALUES를 접어 같은 형태의 쿼리를 하나로 묶음"""
+    sql = _COMMENT_RE.sub(" ", statement)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _SPACE_RE.sub(" ", sql).strip()
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _VALUES_RE.sub("VALUES (...)", sql)
+    return sql
+
+
+# ---- 집계 ----
+
+class RequestQueryStats:
+    def __init__(self, route: str = "", scope: Optional[Scope] = None):
+        self._route = route
+        self._scope = scope
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints: Counter[str] = Counter()
+        self.budget: Optional[int] = None
+
+    @property
+    def route(self) -> str:
+        """매칭된 라우트 경로 템플릿 (예: GET /api/smallstep/goals/{goal_id}), 라우팅 전이면 실제 경로"""
+        if self._scope is not None:
+            route = self._scope.get("route")
+            if route is not None and getattr(route, "path", None):
+                return f"{self._scope['method']} {route.path}"
+        return self._route
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list[tuple[str, int]]:
+        """threshold회 이상 반복된 SELECT fingerprint (N+1 의심)"""
+        return [
+            (fp, n) for fp, n in self.fingerprints.most_common()
+            if n >= threshold and fp.upper().startswith("SELECT")
+        ]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def report(self):
+        """N+1 의심/예산 초과 로그"""
+        for fp, n in self.repeated():
+            logger.warning(f"N+1 의심 {self.route}: 동일 쿼리 {n}회 - {fp[:300]}")
+        if self.over_budget:
+            logger.warning(f"쿼리 예산 초과 {self.route}: {self.count}회 (예산 {self.budget})")
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+# ---- 엔진 계측 ----
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def instrument_engine(engine: Engine, name: str):
+    """엔진에 쿼리 계측 리스너 등록 (요청 컨텍스트가 없으면 등록된 콜백만 호출)"""
+
+    def _record(conn, statement, parameters, rowcount):
+        starts = conn.info.get(_START_TIMES_KEY)
+        elapsed = time.perf_counter() - starts.pop() if starts else 0.0
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        for listener in _listeners:
+            try:
+                listener(name, statement, parameters, elapsed, rowcount, conn)
+            except Exception:
+                logger.exception("query listener failed")
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _record(conn, statement, parameters, cursor.rowcount)
+
+    def _handle_error(exception_context):
+        # 실행 중 실패하면 after_cursor_execute가 호출되지 않으므로 여기서 시작 시각을 꺼내 기록
+        # (연결 단계 오류처럼 실행 전이면 statement/connection이 없음)
+        conn = exception_context.connection
+        if conn is None or exception_context.statement is None:
+            return
+        _record(conn, exception_context.statement, exception_context.parameters, -1)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def add_query_listener(listener: Callable):
+    """모든 계측 엔진의 쿼리 실행 후 호출될 콜백 등록"""
+    _listeners.append(listener)
+
+
+@contextmanager
+def count_queries(route: str = "<block>", budget: Optional[int] = None) -> Iterator[RequestQueryStats]:
+    """요청 밖에서 블록 안의 쿼리를 집계 - budget을 넘으면 QueryBudgetExceeded"""
+    stats = RequestQueryStats(route)
+    stats.budget = budget
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+    stats.report()
+    if stats.over_budget:
+        raise QueryBudgetExceeded(route, budget, stats.count)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """핸들러의 요청당 쿼리 수 상한 선언 (응답 직렬화 중 lazy load까지 미들웨어에서 함께 검사)"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stats = _current.get()
+            if stats is not None:
+                stats.budget = max_queries
+            return func(*args, **kwargs)
+
+        wrapper.query_budget = max_queries
+        return wrapper
+
+    return decorator
+
+
+# ---- 미들웨어 ----
+
+class QueryStatsMiddleware:
+    """요청마다 쿼리 수/DB 시간 집계, N+1 경고, (옵션) 헤더 추가 및 엄격한 예산 검사"""
+
+    def __init__(self, app: ASGIApp, headers: bool = False, strict: bool = False):
+        self.app = app
+        self.headers = headers
+        self.strict = strict
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(f"{scope['method']} {scope['path']}", scope)
+        token = _current.set(stats)
+        suppress_body = False
+
+        async def wrapped_send(message: Message) -> None:
+            nonlocal suppress_body
+            if message["type"] == "http.response.start":
+                stats.report()
+                if self.strict and stats.over_budget:
+                    suppress_body = True
+                    error = QueryBudgetExceeded(stats.route, stats.budget, stats.count)
+                    body = json.dumps({"detail": str(error)}).encode()
+                    await send({
+                        "type": "http.response.start",
+                        "status": 500,
+                        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+                    })
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                if self.headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.count)
+                    headers["X-DB-Time"] = f"{stats.total_time * 1000:.2f}"
+                    repeated = stats.repeated()
+                    if repeated:
+                        headers["X-DB-Repeated"] = str(max(n for _, n in repeated))
+            elif suppress_body:
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, wrapped_send)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,71 @@
+"""
+고속 JSON 응답 레이어
+- FastJSONResponse: orjson으로 렌더링하는 앱 기본 응답 클래스 (orjson 미설치 시 표준 json)
+- typed_response: 미리 컴파일한 TypeAdapter로 검증 1회 + Rust 직렬화(dump_json)하여 바로 bytes 응답
+  (Response를 반환하므로 FastAPI의 response_model 재검증/재직렬화를 건너뜀)
+
+DEFAULT_RESPONSE_CLASS는 FastAPI 버전과 관계없이 항상 FastJSONResponse입니다.
+(자체 TypeAdapter.dump_json 경로가 있는 FastAPI 0.130+도 기본 응답 클래스를 바꾸면 그 경로 대신
+response_model 검증 결과를 이 클래스로 렌더링하므로 모든 환경에서 orjson 인코딩이 적용됨)
+orjson은 requirements.txt / pyproject.toml / uv.lock에 포함되어 있고, 없는 환경에서만 표준 json으로 대체됩니다.
+"""
+import json
+from functools import lru_cache
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson은 선택 의존성
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 기반 JSONResponse (datetime/dict 키 등은 orjson이 직접 처리, 그 외는 jsonable_encoder로 대체)"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            try:
+                return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                content = jsonable_encoder(content)
+                return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+
+
+# main.py의 FastAPI(default_response_class=...)에 사용
+DEFAULT_RESPONSE_CLASS = FastJSONResponse
+
+
+@lru_cache(maxsize=None)
+def adapter_for(tp: Any) -> TypeAdapter:
+    """타입별 TypeAdapter를 한 번만 생성해 재사용 (검증기/직렬화기 컴파일 비용 제거)"""
+    return TypeAdapter(tp)
+
+
+def dump_json(tp: Any, content: Any, validated: bool = False) -> bytes:
+    """
+    content를 tp 스키마 JSON bytes로 변환
+    validated=True이거나 content가 이미 tp 모델 인스턴스면 검증 없이 바로 직렬화합니다.
+    """
+    adapter = adapter_for(tp)
+    if not validated and not (isinstance(tp, type) and issubclass(tp, BaseModel) and isinstance(content, tp)):
+        content = adapter.validate_python(content, from_attributes=True)
+    return adapter.dump_json(content)
+
+
+def raw_json_response(body: bytes, status_code: int = 200) -> Response:
+    """이미 직렬화된 JSON bytes(예: 캐시된 응답 본문)를 그대로 반환"""
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def typed_response(tp: Any, content: Any, validated: bool = False, status_code: int = 200) -> Response:
+    """tp(response_model과 동일 타입)로 한 번만 검증·직렬화한 응답 - 라우터의 response_model은 문서용으로 유지"""
+    return raw_json_response(dump_json(tp, content, validated), status_code)
@@ -0,0 +1,168 @@
+"""
+SmallStep user_id 샤딩 레이어
+
+논리 샤드(LOGICAL_SHARDS개, 고정)마다 독립된 스키마(DB)를 두고, 샤드 맵이 논리 샤드 → DB URL을 정합니다.
+한 물리 MySQL에 여러 논리 샤드 스키마를 올려 두었다가, 쓰기 한계에 가까워지면 논리 샤드 단위로
+다른 서버로 옮깁니다(scripts/shard_admin.py copy). 샤드 맵만 바꾸면 되므로 id는 그대로 유지됩니다.
+
+id가 샤드를 인코딩합니다:
+    논리 샤드 = id // SHARD_ID_SPAN     (INT(11) 범위를 LOGICAL_SHARDS개로 나눔)
+각 샤드 스키마의 AUTO_INCREMENT가 shard * SHARD_ID_SPAN부터 시작하므로(shard_admin.py init)
+사용자/목표/Phase/주간 계획/태스크 id 어느 것이든 그 자체로 샤드를 알 수 있습니다.
+사용자의 모든 데이터는 사용자와 같은 샤드에 생성되고, 기존 데이터(id < SHARD_ID_SPAN)는 샤드 0입니다.
+
+샤드 맵(SMALLSTEP_SHARD_MAP=JSON 파일 경로)이 없으면 샤드 0 = smallstep_mysql 하나만 사용하며 동작은 기존과 같습니다.
+
+    {
+      "shards": {"0": "env:smallstep_mysql", "1": "mysql+pymysql://.../smallstep_s1"},
+      "open": [1]        # 신규 사용자를 배치할 샤드 (생략 시 전체)
+    }
+"""
+import json
+import logging
+import os
+import random
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+LOGICAL_SHARDS = 16
+SHARD_ID_SPAN = 2 ** 31 // LOGICAL_SHARDS  # 134,217,728 ids / 샤드 / 테이블
+
+# 요청 경로/쿼리에서 샤드를 알 수 있는 id 파라미터 (앞에서부터 우선)
+SHARD_KEY_PARAMS = ("user_id", "goal_id", "task_id", "phase_id", "plan_id", "weekly_plan_id")
+
+
+class ShardNotFoundError(ValueError):
+    pass
+
+
+def shard_for_id(entity_id: int) -> int:
+    """id → 논리 샤드"""
+    shard = int(entity_id) // SHARD_ID_SPAN
+    if not 0 <= shard < LOGICAL_SHARDS:
+        raise ShardNotFoundError(f"id {entity_id} is outside the shard id space")
+    return shard
+
+
+def shard_id_range(shard: int) -> tuple[int, int]:
+    """논리 샤드의 id 범위 [start, end) - 샤드 0은 기존 데이터 호환을 위해 1부터"""
+    return max(shard * SHARD_ID_SPAN, 1), (shard + 1) * SHARD_ID_SPAN
+
+
+def _resolve_url(value: str) -> Optional[str]:
+    return os.getenv(value[4:]) if value.startswith("env:") else value
+
+
+def load_shard_map(default_url: str, path: Optional[str] = None) -> dict:
+    """샤드 맵 로드 - {"shards": {shard: url}, "open": [shard, ...]}"""
+    path = path or os.getenv("SMALLSTEP_SHARD_MAP")
+    if not path:
+        return {"shards": {0: default_url}, "open": [0]}
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    shards = {int(shard): _resolve_url(url) for shard, url in raw["shards"].items()}
+    shards.setdefault(0, default_url)
+    urls = [url for url in shards.values()]
+    if len(set(urls)) != len(urls):
+        raise ValueError("Each logical shard needs its own database (duplicate URL in shard map)")
+    if any(not 0 <= shard < LOGICAL_SHARDS for shard in shards):
+        raise ValueError(f"Shard numbers must be in [0, {LOGICAL_SHARDS})")
+    open_shards = [int(shard) for shard in raw.get("open", shards)]
+    return {"shards": shards, "open": sorted(open_shards)}
+
+
+class ShardRouter:
+    def __init__(self, shard_map: dict, engine_factory: Callable[[str], Engine],
+                 engines: Optional[dict[str, Engine]] = None):
+        self.shard_map = shard_map
+        self.engine_factory = engine_factory
+        self._engines: dict[str, Engine] = dict(engines or {})
+        self._sessionmakers: dict[int, sessionmaker] = {}
+
+    @property
+    def shards(self) -> list[int]:
+        return sorted(self.shard_map["shards"])
+
+    @property
+    def open_shards(self) -> list[int]:
+        return self.shard_map["open"]
+
+    @property
+    def is_sharded(self) -> bool:
+        return len(self.shard_map["shards"]) > 1
+
+    def engine(self, shard: int) -> Engine:
+        url = self.shard_map["shards"].get(shard)
+        if url is None:
+            raise ShardNotFoundError(f"Shard {shard} is not configured")
+        if url not in self._engines:
+            self._engines[url] = self.engine_factory(url)
+        return self._engines[url]
+
+    def engines(self) -> dict[int, Engine]:
+        return {shard: self.engine(shard) for shard in self.shards}
+
+    def sessionmaker(self, shard: int) -> sessionmaker:
+        if shard not in self._sessionmakers:
+            self._sessionmakers[shard] = sessionmaker(autocommit=False, autoflush=False, bind=self.engine(shard))
+        return self._sessionmakers[shard]
+
+    def session(self, shard: int) -> Session:
+        return self.sessionmaker(shard)()
+
+    def session_for_id(self, entity_id: int) -> Session:
+        return self.session(shard_for_id(entity_id))
+
+    # ---- 라우팅 ----
+
+    def shard_for_params(self, params: dict) -> Optional[int]:
+        """user_id/goal_id/task_id ... 중 처음 찾은 정수 id의 샤드 (없으면 None)"""
+        for name in SHARD_KEY_PARAMS:
+            value = params.get(name)
+            if value is not None and str(value).isdigit():
+                return shard_for_id(int(value))
+        return None
+
+    def shard_for_new_user(self, email: Optional[str] = None) -> int:
+        """신규 사용자를 배치할 샤드 (이메일이 있으면 해시로 고정, 없으면 무작위)"""
+        candidates = self.open_shards
+        if email:
+            return candidates[zlib.crc32(email.lower().encode()) % len(candidates)]
+        return random.choice(candidates)
+
+    def bind_session(self, db: Session, shard: int) -> Session:
+        """아직 트랜잭션을 시작하지 않은 세션을 다른 샤드로 전환 (요청 본문에만 샤드 키가 있는 경우)"""
+        if db.in_transaction():
+            raise RuntimeError("Cannot move a session to another shard after it has started a transaction")
+        db.bind = self.engine(shard)
+        return db
+
+    # ---- scatter-gather ----
+
+    def scatter_gather(self, fn: Callable[[Session, int], Any], shards: Optional[Iterable[int]] = None,
+                       max_workers: int = 8) -> dict[int, Any]:
+        """모든(또는 지정한) 샤드에서 fn(session, shard)를 병렬 실행 → {shard: 결과}"""
+        shards = list(shards) if shards is not None else self.shards
+
+        def run(shard: int):
+            db = self.session(shard)
+            try:
+                return fn(db, shard)
+            finally:
+                db.close()
+
+        if len(shards) == 1:
+            return {shards[0]: run(shards[0])}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(shards)), thread_name_prefix="shard") as pool:
+            results = pool.map(run, shards)
+            return dict(zip(shards, results))
+
+    def dispose(self):
+        for engine in self._engines.values():
+            engine.dispose()
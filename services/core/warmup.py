@@ -0,0 +1,158 @@
+"""
+워커 부팅 warm-up (main.py lifespan에서 실행)
+
+gunicorn 워커마다 첫 요청이 떠안던 1회성 비용을 트래픽을 받기 전에 치릅니다.
+1. SQLAlchemy mapper 구성 (models.py 전체 relationship/backref 해석)
+2. 핫 경로 쿼리 컴파일 - @hot_read로 표시한 핸들러를 가장 최근 행 id로 한 번 실행
+   (ORM compile state + SQL 문자열이 엔진별 compiled cache에 들어가고, typed_response의 TypeAdapter도 생성됨)
+   읽기만 하고 세션은 롤백합니다. 데이터가 없으면 id 0으로 실행하므로 첫 쿼리만 컴파일됩니다.
+3. /api/openapi.json 사전 생성 - 큰 description을 포함한 스키마를 한 번 만들고
+   JSON bytes와 인코딩별(zstd/br/gzip) 최대 압축본을 메모리에 보관해 그대로 응답
+
+모든 단계가 끝나야 warmup_state.ready가 True가 되고 /api/ready가 200을 반환합니다.
+기본은 lifespan 안에서 끝까지 기다리므로(uvicorn은 그 전까지 요청을 받지 않음) 준비 전 요청이 없고,
+WARMUP_BACKGROUND=1이면 백그라운드 스레드에서 실행합니다. (/api/ready를 readiness probe로 사용)
+WARMUP=0이면 건너뜁니다. (openapi.json은 첫 요청 때 한 번 생성)
+"""
+import inspect
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session, configure_mappers
+
+from services.core.compression import available_encodings, compress, negotiate_encoding
+
+logger = logging.getLogger(__name__)
+
+# (핸들러, 인자) - 인자 값이 모델 클래스면 그 테이블의 최대 id로 대체
+_hot_reads: list[tuple[Callable, dict[str, Any]]] = []
+
+
+def hot_read(**params) -> Callable:
+    """워커 부팅 시 미리 실행해 쿼리를 컴파일해 둘 읽기 핸들러 표시 (가장 안쪽 데코레이터로 사용)
+
+        @hot_read(goal_id=SMALLSTEP_GOALS, fields=None)
+    """
+    def decorator(func: Callable) -> Callable:
+        _hot_reads.append((func, params))
+        return func
+
+    return decorator
+
+
+class WarmupState:
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.steps: dict[str, dict] = {}
+        self.errors: list[str] = []
+
+    def step(self, name: str, fn: Callable[[], Any]):
+        start = time.perf_counter()
+        try:
+            detail = fn()
+        except Exception as e:
+            logger.exception(f"warm-up step {name} failed")
+            self.errors.append(f"{name}: {e}")
+            detail = None
+        self.steps[name] = {"ms": round((time.perf_counter() - start) * 1000, 1), "detail": detail}
+
+    def to_dict(self) -> dict:
+        return {"ready": self.ready, "steps": self.steps, "errors": self.errors}
+
+
+warmup_state = WarmupState()
+
+
+# ---- 단계 ----
+
+def warm_hot_reads(sessionmakers: dict[str, Callable[[], Session]]) -> dict[str, int]:
+    """엔진(세션 팩토리)마다 @hot_read 핸들러 실행 → {엔진 이름: 성공한 핸들러 수}"""
+    result = {}
+    for name, make_session in sessionmakers.items():
+        db = make_session()
+        warmed = 0
+        try:
+            sample_ids: dict[Any, int] = {}
+            for handler, params in _hot_reads:
+                kwargs = {}
+                for key, value in params.items():
+                    if isinstance(value, type) and hasattr(value, "__table__"):
+                        if value not in sample_ids:
+                            sample_ids[value] = db.query(func.max(value.id)).scalar() or 0
+                        value = sample_ids[value]
+                    kwargs[key] = value
+                try:
+                    inspect.unwrap(handler)(db=db, **kwargs)
+                    warmed += 1
+                except HTTPException:
+                    warmed += 1  # 데이터 없음(404) - 첫 쿼리까지는 컴파일됨
+                except Exception as e:
+                    logger.warning(f"warm-up of {handler.__qualname__} on {name} failed: {e}")
+                finally:
+                    db.rollback()
+        finally:
+            db.close()
+        result[name] = warmed
+    return result
+
+
+class OpenAPICache:
+    """사전 생성한 openapi.json (원본 + 인코딩별 압축본)"""
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self.bodies: dict[Optional[str], bytes] = {}
+        self._lock = threading.Lock()
+
+    def render(self) -> dict[str, int]:
+        body = JSONResponse(self.app.openapi()).body
+        bodies = {None: body}
+        for encoding in available_encodings():
+            bodies[encoding] = compress(body, encoding, gzip_level=9, brotli_quality=11, zstd_level=19)
+        self.bodies = bodies
+        return {encoding or "identity": len(data) for encoding, data in bodies.items()}
+
+    def ensure_rendered(self) -> dict[str, int]:
+        """이미 만들어 둔 경우(preload 마스터에서 생성 후 fork) 다시 만들지 않음"""
+        if not self.bodies:
+            return self.render()
+        return {encoding or "identity": len(data) for encoding, data in self.bodies.items()}
+
+    def response(self, request: Request) -> Response:
+        if not self.bodies:
+            with self._lock:
+                if not self.bodies:
+                    self.render()
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), [e for e in self.bodies if e])
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(self.bodies[encoding], media_type="application/json", headers=headers)
+
+    def install(self):
+        """FastAPI 기본 openapi 라우트(요청마다 JSON 직렬화 + 압축)를 사전 생성본 응답으로 교체"""
+        url = self.app.openapi_url
+        self.app.router.routes = [route for route in self.app.router.routes if getattr(route, "path", None) != url]
+
+        async def openapi(request: Request) -> Response:
+            return self.response(request)
+
+        self.app.add_route(url, openapi, include_in_schema=False)
+
+
+def run_warmup(app: FastAPI, openapi_cache: OpenAPICache, sessionmakers: dict[str, Callable[[], Session]],
+               extra_steps: Optional[dict[str, Callable[[], Any]]] = None):
+    warmup_state.started_at = time.time()
+    for name, fn in (extra_steps or {}).items():
+        warmup_state.step(name, fn)
+    warmup_state.step("configure_mappers", configure_mappers)
+    warmup_state.step("hot_reads", lambda: warm_hot_reads(sessionmakers))
+    warmup_state.step("openapi", openapi_cache.ensure_rendered)
+    warmup_state.ready = True
+    logger.info(f"warm-up done: {warmup_state.steps}")
@@ -1,6 +1,7 @@
 """
 게이미피케이션 서비스 (v2)
 경험치(XP), 레벨, 연속 달성(Streak) 및 활동 로그 관리를 담당합니다.
+커밋은 호출자(TaskStateMachine 등)의 트랜잭션에 맡깁니다.
 """
 import logging
 from datetime import datetime, timedelta
@@ -8,6 +9,8 @@ import math
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from models import SMALLSTEP_USERS, SMALLSTEP_ACTIVITY_LOG
+from services.analytics import StreakBroken, XpAwarded, emit_on_commit
+from services.core.cache import invalidate_on_commit, user_tag
 
 logger = logging.getLogger(__name__)
 
@@ -28,85 +31,100 @@ class GamificationService:
             return 1
         return int(math.sqrt(xp / 100)) + 1
 
-    def award_task_completion_xp(self, user_id: int, task_id: int, goal_id: int) -> int:
-        """태스크 완료 시 XP 부여 및 로그 기록"""
-        user = self.db.query(SMALLSTEP_USERS).filter(SMALLSTEP_USERS.id == user_id).first()
+    def _lock_user(self, user_id: int) -> SMALLSTEP_USERS:
+        """XP/스트릭 갱신 전 사용자 행 잠금 (SELECT ... FOR UPDATE, 동시 갱신 유실 방지)"""
+        invalidate_on_commit(self.db, user_tag(user_id))
+        return (
+            self.db.query(SMALLSTEP_USERS)
+            .filter(SMALLSTEP_USERS.id == user_id)
+            .with_for_update()
+            .populate_existing()
+            .first()
+        )
+
+    def award_task_completion_xp(self, user_id: int, task_id: int, goal_id: int, completed_at: datetime = None) -> int:
+        """
+        태스크 완료 시 XP 부여 및 로그 기록
+        completed_at이 주어지면(오프라인 동기화) 해당 시각 기준으로 스트릭을 계산합니다.
+        """
+        user = self._lock_user(user_id)
         if not user:
             return 0
             
         xp_earned = XP_REWARD_TASK_COMPLETED
         
         # 스트릭 업데이트 (당일 첫 활동인 경우) 및 스트릭 보너스 계산
-        streak_bonus = self._update_streak_and_get_bonus(user)
+        streak_bonus = self._update_streak_and_get_bonus(user, completed_at)
         xp_earned += streak_bonus
         
         # XP 업데이트 및 레벨 계산
-        current_xp = user.experience_points or 0
-        new_xp = current_xp + xp_earned
-        user.experience_points = new_xp
-        user.level = self._calculate_level(new_xp)
+        self._add_xp(user, xp_earned, 'task', goal_id, streak_bonus)
         
         # 로그 기록
-        self._log_activity(user_id, task_id, goal_id, 'COMPLETED', xp_earned)
+        self._log_activity(user_id, task_id, goal_id, 'COMPLETED', xp_earned, completed_at)
         
-        self.db.commit()
+        self.db.flush()
         return xp_earned
 
-    def award_weekly_completion_bonus(self, user_id: int, goal_id: int):
-        """주간 모든 태스크 완료 보너스"""
-        user = self.db.query(SMALLSTEP_USERS).filter(SMALLSTEP_USERS.id == user_id).first()
+    def award_weekly_completion_bonus(self, user_id: int, goal_id: int, completed_at: datetime = None):
+        """주간 모든 태스크 완료 보너스 (completed_at: 마지막 태스크 완료 시각, 오프라인 동기화 시 전달)"""
+        user = self._lock_user(user_id)
         if user:
-            user.experience_points = (user.experience_points or 0) + XP_REWARD_WEEKLY_ALL_COMPLETED
-            user.level = self._calculate_level(user.experience_points)
-            self._log_activity(user_id, None, goal_id, 'WEEKLY_COMPLETED_BONUS', XP_REWARD_WEEKLY_ALL_COMPLETED)
-            self.db.commit()
+            self._add_xp(user, XP_REWARD_WEEKLY_ALL_COMPLETED, 'weekly_bonus', goal_id)
+            self._log_activity(user_id, None, goal_id, 'WEEKLY_COMPLETED_BONUS', XP_REWARD_WEEKLY_ALL_COMPLETED,
+                               completed_at)
+            self.db.flush()
 
-    def award_phase_completion_bonus(self, user_id: int, goal_id: int):
-        """Phase 완료 보너스"""
-        user = self.db.query(SMALLSTEP_USERS).filter(SMALLSTEP_USERS.id == user_id).first()
+    def award_phase_completion_bonus(self, user_id: int, goal_id: int, completed_at: datetime = None):
+        """Phase 완료 보너스 (completed_at: Phase를 끝낸 태스크의 완료 시각)"""
+        user = self._lock_user(user_id)
         if user:
-            user.experience_points = (user.experience_points or 0) + XP_REWARD_PHASE_COMPLETED
-            user.level = self._calculate_level(user.experience_points)
-            self._log_activity(user_id, None, goal_id, 'PHASE_COMPLETED_BONUS', XP_REWARD_PHASE_COMPLETED)
-            self.db.commit()
+            self._add_xp(user, XP_REWARD_PHASE_COMPLETED, 'phase_bonus', goal_id)
+            self._log_activity(user_id, None, goal_id, 'PHASE_COMPLETED_BONUS', XP_REWARD_PHASE_COMPLETED,
+                               completed_at)
+            self.db.flush()
 
-    def _update_streak_and_get_bonus(self, user: SMALLSTEP_USERS) -> int:
-        """스트릭을 업데이트하고 보너스 XP를 반환합니다."""
-        today = datetime.now().date()
-        yesterday = today - timedelta(days=1)
-        
-        # 오늘 이미 기록이 있는지 확인 (action이 COMPLETED인 것만)
-        today_start = datetime.combine(today, datetime.min.time())
-        yesterday_start = datetime.combine(yesterday, datetime.min.time())
+    def _add_xp(self, user: SMALLSTEP_USERS, amount: int, reason: str, goal_id: int, streak_bonus: int = 0):
+        """XP 가산 및 레벨 재계산, 커밋 시 xp_awarded 이벤트 기록"""
+        old_level = user.level or 1
+        user.experience_points = (user.experience_points or 0) + amount
+        user.level = self._calculate_level(user.experience_points)
+        emit_on_commit(self.db, XpAwarded(
+            user_id=user.id, goal_id=goal_id, reason=reason, amount=amount, streak_bonus=streak_bonus,
+            total_xp=user.experience_points, level=user.level, level_up=user.level > old_level,
+        ))
+
+    def _update_streak_and_get_bonus(self, user: SMALLSTEP_USERS, activity_at: datetime = None) -> int:
+        """
+        스트릭을 업데이트하고 보너스 XP를 반환합니다. (activity_at: 활동 시각, 기본 현재)
+        마지막 완료 기록 날짜 이후의 새 날짜일 때만 스트릭을 진행/초기화합니다.
+        오프라인 동기화로 그보다 이전 날짜의 완료가 들어오면 스트릭은 그대로 두고 보너스도 없습니다.
+        """
+        activity_day = (activity_at or datetime.now()).date()
         
-        today_logs = self.db.query(SMALLSTEP_ACTIVITY_LOG).filter(
+        # 마지막 완료 기록 시각 (ix_activity_log_user_action_completed 인덱스로 조회)
+        last_completed_at = self.db.query(func.max(SMALLSTEP_ACTIVITY_LOG.completed_at)).filter(
             SMALLSTEP_ACTIVITY_LOG.user_id == user.id,
-            SMALLSTEP_ACTIVITY_LOG.action == 'COMPLETED',
-            SMALLSTEP_ACTIVITY_LOG.completed_at >= today_start
-        ).count()
+            SMALLSTEP_ACTIVITY_LOG.action == 'COMPLETED'
+        ).scalar()
+        last_day = last_completed_at.date() if last_completed_at else None
         
-        if today_logs > 0:
-            # 이미 오늘 활동했으므로 스트릭 증가 안 함
+        if last_day is not None and activity_day <= last_day:
+            # 같은 날 이미 활동했거나 더 최근 활동이 있는 과거 날짜의 완료 → 스트릭 변화 없음
             return 0
-            
-        yesterday_logs = self.db.query(SMALLSTEP_ACTIVITY_LOG).filter(
-            SMALLSTEP_ACTIVITY_LOG.user_id == user.id,
-            SMALLSTEP_ACTIVITY_LOG.action == 'COMPLETED',
-            SMALLSTEP_ACTIVITY_LOG.completed_at >= yesterday_start,
-            SMALLSTEP_ACTIVITY_LOG.completed_at < today_start
-        ).count()
         
         current_streak = user.current_streak or 0
         longest_streak = user.longest_streak or 0
         
-        if yesterday_logs > 0:
+        if last_day == activity_day - timedelta(days=1):
             new_streak = current_streak + 1
         else:
-            # 연속이 끊겼으므로 명시적으로 0으로 초기화
-            user.current_streak = 0
-            self.db.commit()
-            # 오늘 첫 활동이므로 새로운 연속 시작
+            # 연속이 끊겼으므로 오늘 첫 활동으로 새로운 연속 시작
             new_streak = 1
+            if current_streak > 0:
+                emit_on_commit(self.db, StreakBroken(
+                    user_id=user.id, previous_streak=current_streak, longest_streak=longest_streak,
+                ))
             
         user.current_streak = new_streak
         if new_streak > longest_streak:
@@ -120,13 +138,15 @@ class GamificationService:
             
         return 0
 
-    def _log_activity(self, user_id: int, task_id: int, goal_id: int, action: str, xp_earned: int):
-        """활동 로그 기록"""
+    def _log_activity(self, user_id: int, task_id: int, goal_id: int, action: str, xp_earned: int,
+                      completed_at: datetime = None):
+        """활동 로그 기록 (completed_at 미지정 시 DB 기본값 current_timestamp)"""
         log = SMALLSTEP_ACTIVITY_LOG(
             user_id=user_id,
             task_id=task_id,
             goal_id=goal_id,
             action=action,
-            xp_earned=xp_earned
+            xp_earned=xp_earned,
+            completed_at=completed_at
         )
         self.db.add(log)
@@ -0,0 +1,77 @@
+"""
+키셋(커서) 페이지네이션 헬퍼
+OFFSET 대신 마지막 행의 정렬 키(예: completed_at, id) 이후만 조회하므로 페이지가 깊어져도 비용이 일정합니다.
+커서는 정렬 키 값을 JSON → base64url로 인코딩한 불투명 문자열입니다.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    """디코딩할 수 없거나 정렬 키 개수/값 형식이 맞지 않는 커서"""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """정렬 키 값 목록을 불투명 커서 문자열로 인코딩"""
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_value(value: Any) -> Any:
+    """커서의 정렬 키 값 하나를 복원 - int/float/str 또는 {"dt": ISO 문자열}만 허용 (SQL 비교에 그대로 바인딩되므로)"""
+    if isinstance(value, dict):
+        if set(value) != {"dt"} or not isinstance(value["dt"], str):
+            raise ValueError("invalid datetime cursor value")
+        return datetime.fromisoformat(value["dt"])
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("invalid cursor value")
+    return value
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """커서 문자열을 정렬 키 값 목록으로 복원 (형식이 잘못되면 InvalidCursorError)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError("invalid cursor payload")
+        values = [_decode_value(v) for v in payload]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("잘못된 커서입니다.") from e
+    return values
+
+
+def keyset_paginate(query: Query, columns: Sequence, cursor: Optional[str], limit: int,
+                    descending: bool = True, key=None) -> tuple[list, Optional[str]]:
+    """
+    columns 순서로 정렬하여 cursor 다음 limit개를 조회
+    (a, b) < (x, y)를 a < x OR (a = x AND b < y)로 풀어 써서 MySQL에서도 복합 인덱스 범위 스캔이 되도록 합니다.
+    key(row)는 행에서 정렬 키 값 목록을 꺼내는 함수 (기본: columns의 컬럼명으로 getattr)
+    반환: (행 목록, 다음 커서 또는 None)
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(columns))
+        conditions = []
+        for i, column in enumerate(columns):
+            boundary = column < values[i] if descending else column > values[i]
+            conditions.append(and_(*[columns[j] == values[j] for j in range(i)], boundary))
+        query = query.filter(or_(*conditions))
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(key(last) if key else [getattr(last, column.key) for column in columns])
+    return rows, next_cursor
@@ -0,0 +1,63 @@
+"""
+?fields= 희소 필드셋 헬퍼
+요청한 필드만 SELECT(load_only)하고 응답도 그 필드만 직렬화합니다.
+목록 화면처럼 id/제목/상태만 필요한 경우 goal_text, ai_context 같은 큰 컬럼 전송을 줄이기 위해 사용합니다.
+"""
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import load_only
+
+from services.core.responses import FastJSONResponse
+
+
+class InvalidFieldsError(ValueError):
+    """응답 스키마에 없는 필드 요청"""
+
+
+def parse_fields(fields: Optional[str], schema: type[BaseModel]) -> Optional[list[str]]:
+    """'id,title,status' → ['id', 'title', 'status'] (스키마에 없는 필드면 InvalidFieldsError, id는 항상 포함)"""
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in schema.model_fields]
+    if unknown:
+        raise InvalidFieldsError(f"알 수 없는 필드: {', '.join(unknown)}")
+    if "id" in schema.model_fields and "id" not in requested:
+        requested.insert(0, "id")
+    return requested
+
+
+def sparse_fields(schema: type[BaseModel]):
+    """라우터용 의존성 - ?fields= 를 파싱해 필드 목록(미지정 시 None) 반환, 잘못된 필드는 400"""
+    def dependency(fields: Optional[str] = Query(None, description="응답에 포함할 필드 (쉼표 구분, 예: id,title,status)")):
+        try:
+            return parse_fields(fields, schema)
+        except InvalidFieldsError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return dependency
+
+
+def with_fields(query, model, fields: Optional[list[str]], always: tuple = ()):
+    """
+    요청 필드 중 model의 컬럼만 load_only로 SELECT (PK는 SQLAlchemy가 항상 포함)
+    always: 응답에는 없어도 서버에서 읽어야 하는 컬럼 (예: 키셋 커서 정렬 키)
+    """
+    if not fields:
+        return query
+    names = list(dict.fromkeys([*fields, *always]))
+    columns = [getattr(model, f) for f in names if f in model.__mapper__.column_attrs]
+    return query.options(load_only(*columns)) if columns else query
+
+
+def narrow(obj: Any, fields: list[str]) -> dict:
+    """ORM 객체나 dict에서 요청 필드만 추출"""
+    if isinstance(obj, dict):
+        return {f: obj.get(f) for f in fields}
+    return {f: getattr(obj, f) for f in fields}
+
+
+def sparse_response(content: Any) -> FastJSONResponse:
+    """좁힌 payload를 response_model 재검증 없이 한 번만 직렬화하여 반환"""
+    return FastJSONResponse(content=content)
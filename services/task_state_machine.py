@@ -1,74 +1,274 @@
 """
 태스크 상태 머신 (v2)
 태스크의 상태 전환(LOCKED → AVAILABLE → COMPLETED/SKIPPED)을 관리합니다.
+전환 시 주간 계획/Phase의 진행 카운터(completed/skipped/remaining)도 함께 갱신합니다.
 """
 import logging
 from datetime import datetime
+from typing import Optional
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from models import SMALLSTEP_TASKS
+from models import SMALLSTEP_TASKS, SMALLSTEP_GOALS, SMALLSTEP_WEEKLY_PLANS, SMALLSTEP_PHASES
+from services.user_summary import UserSummaryService
+from services.analytics import TaskCompleted, TasksSkipped, emit_on_commit
+from services.core.cache import invalidate_on_commit, goal_tag, user_tag
+from services.gamification import GamificationService, XP_REWARD_WEEKLY_ALL_COMPLETED, XP_REWARD_PHASE_COMPLETED
 
 logger = logging.getLogger(__name__)
 
+class TaskNotFoundError(ValueError):
+    """완료 대상 태스크가 존재하지 않음"""
+
+
+class InvalidTaskStateError(ValueError):
+    """현재 상태에서 허용되지 않는 전환 (예: LOCKED/COMPLETED 태스크 완료 시도)"""
+
+    def __init__(self, task_id: int, status: str):
+        super().__init__(f"Cannot complete task {task_id} with status {status}")
+        self.task_id = task_id
+        self.status = status
+
+
 class TaskStateMachine:
     def __init__(self, db: Session):
         self.db = db
 
-    def complete_task(self, task_id: int) -> SMALLSTEP_TASKS:
+    def complete_task(self, task_id: int, commit: bool = True,
+                      completed_at: Optional[datetime] = None) -> SMALLSTEP_TASKS:
         """
-        태스크를 완료 처리하고 다음 태스크를 활성화
-        LOCKED 상태나 이미 완료된 상태면 에러 발생
+        태스크 완료 처리의 단일 진입점
+        완료 전환 → 다음 태스크 활성화 → 진행 카운터/요약 → XP·스트릭 → 주간 보너스/Phase 완료
+        를 하나의 트랜잭션에서 처리합니다.
+
+        완료 전환은 조건부 UPDATE(... WHERE status = 'AVAILABLE')로 수행하므로
+        동시에 같은 태스크를 완료하려는 요청 중 정확히 하나만 성공하고, XP도 한 번만 부여됩니다.
+        LOCKED 상태나 이미 완료된 상태면 InvalidTaskStateError 발생
+        completed_at을 주면(오프라인 완료) 해당 시각으로 기록하고 스트릭도 그 날짜 기준으로 계산합니다.
         """
-        task = self.db.query(SMALLSTEP_TASKS).filter(SMALLSTEP_TASKS.id == task_id).first()
-        if not task:
-            raise ValueError(f"Task {task_id} not found")
-            
-        if task.status != 'AVAILABLE':
-            raise ValueError(f"Cannot complete task {task_id} with status {task.status}")
+        task, _ = self._complete(task_id, self._normalize_completed_at(completed_at))
+        if commit:
+            self.db.commit()
+            self.db.refresh(task)
+        return task
 
-        # 1. 상태 변경
-        task.status = 'COMPLETED'
-        task.completed_at = datetime.now()
+    def _complete(self, task_id: int, completed_at: datetime) -> tuple[SMALLSTEP_TASKS, int]:
+        """완료 처리 본체 - (태스크, 부여된 XP) 반환, 커밋은 호출자 책임"""
+        # 1. 조건부 상태 전환 (AVAILABLE일 때만, rowcount로 선점 여부 확인)
+        result = self.db.execute(
+            update(SMALLSTEP_TASKS)
+            .where(SMALLSTEP_TASKS.id == task_id, SMALLSTEP_TASKS.status == 'AVAILABLE')
+            .values(status='COMPLETED', completed_at=completed_at)
+        )
+        if result.rowcount != 1:
+            status = self.db.query(SMALLSTEP_TASKS.status).filter(SMALLSTEP_TASKS.id == task_id).scalar()
+            if status is None:
+                raise TaskNotFoundError(f"Task {task_id} not found")
+            raise InvalidTaskStateError(task_id, status)
+
+        task = self.db.get(SMALLSTEP_TASKS, task_id)
 
         # 2. 다음 태스크 활성화
         self._activate_next_task(task)
-        
+
+        # 3. 진행 카운터 갱신
+        self.apply_progress(task.weekly_plan_id, completed=1)
+
+        user_id = self.db.query(SMALLSTEP_GOALS.user_id).filter(SMALLSTEP_GOALS.id == task.goal_id).scalar()
+        invalidate_on_commit(self.db, goal_tag(task.goal_id), user_tag(user_id) if user_id else None)
+        if not user_id:
+            return task, 0
+
+        # 4. 대시보드 요약 갱신
+        UserSummaryService(self.db).on_task_completed(user_id)
+
+        # 5. 게이미피케이션 연동 (XP 부여 및 스트릭 업데이트)
+        gamification_service = GamificationService(self.db)
+        xp_earned = gamification_service.award_task_completion_xp(
+            user_id=user_id,
+            task_id=task.id,
+            goal_id=task.goal_id,
+            completed_at=completed_at
+        )
+
+        # 6. 마지막 태스크 완료 체크 (주간 별도 XP + Phase 완료 검사)
+        if self.remaining_count(task.weekly_plan_id) == 0:
+            gamification_service.award_weekly_completion_bonus(
+                user_id=user_id, goal_id=task.goal_id, completed_at=completed_at
+            )
+            xp_earned += XP_REWARD_WEEKLY_ALL_COMPLETED
+
+            from services.weekly_scheduler import WeeklySchedulerService
+            phase_id = (
+                self.db.query(SMALLSTEP_WEEKLY_PLANS.phase_id)
+                .filter(SMALLSTEP_WEEKLY_PLANS.id == task.weekly_plan_id)
+                .scalar()
+            )
+            if phase_id and WeeklySchedulerService(self.db).check_phase_completion(
+                phase_id, commit=False, completed_at=completed_at
+            ):
+                xp_earned += XP_REWARD_PHASE_COMPLETED
+
+        emit_on_commit(self.db, TaskCompleted(
+            user_id=user_id, goal_id=task.goal_id, task_id=task.id, weekly_plan_id=task.weekly_plan_id,
+            completed_at=completed_at, xp_earned=xp_earned,
+        ))
+        return task, xp_earned
+
+    def complete_tasks_batch(self, user_id: int, items: list[tuple[int, Optional[datetime]]]) -> list[dict]:
+        """
+        오프라인 동기화용 일괄 완료 - [(task_id, completed_at), ...]를 한 트랜잭션으로 처리
+        스트릭이 실제 완료 날짜 순서대로 계산되도록 completed_at 오름차순으로 적용하고,
+        항목별로 SAVEPOINT를 사용해 실패한 항목만 되돌린 뒤 마지막에 한 번 커밋합니다.
+        결과는 요청 순서대로 {task_id, outcome, status, xp_earned, detail} 목록으로 반환
+        """
+        normalized = [(task_id, self._normalize_completed_at(completed_at)) for task_id, completed_at in items]
+
+        # 소유권 확인 (다른 사용자의 태스크는 존재하지 않는 것으로 취급)
+        task_ids = {task_id for task_id, _ in normalized}
+        owned = dict(
+            self.db.query(SMALLSTEP_TASKS.id, SMALLSTEP_TASKS.status)
+            .join(SMALLSTEP_GOALS, SMALLSTEP_TASKS.goal_id == SMALLSTEP_GOALS.id)
+            .filter(SMALLSTEP_GOALS.user_id == user_id, SMALLSTEP_TASKS.id.in_(task_ids))
+            .all()
+        )
+
+        results: dict[int, dict] = {}
+        for index, (task_id, completed_at) in sorted(enumerate(normalized), key=lambda item: (item[1][1], item[0])):
+            if task_id not in owned:
+                results[index] = {"task_id": task_id, "outcome": "not_found", "detail": "태스크를 찾을 수 없습니다."}
+                continue
+
+            savepoint = self.db.begin_nested()
+            try:
+                task, xp_earned = self._complete(task_id, completed_at)
+                savepoint.commit()
+                results[index] = {"task_id": task_id, "outcome": "completed", "status": task.status, "xp_earned": xp_earned}
+            except InvalidTaskStateError as e:
+                savepoint.rollback()
+                outcome = "already_completed" if e.status == 'COMPLETED' else "invalid_state"
+                results[index] = {"task_id": task_id, "outcome": outcome, "status": e.status}
+            except TaskNotFoundError:
+                savepoint.rollback()
+                results[index] = {"task_id": task_id, "outcome": "not_found", "detail": "태스크를 찾을 수 없습니다."}
+            except Exception as e:
+                savepoint.rollback()
+                logger.exception(f"Batch completion failed for task {task_id}")
+                results[index] = {"task_id": task_id, "outcome": "error", "detail": str(e)}
+
         self.db.commit()
-        self.db.refresh(task)
-        return task
+        return [results[index] for index in range(len(normalized))]
+
+    @staticmethod
+    def _normalize_completed_at(completed_at: Optional[datetime]) -> datetime:
+        """클라이언트 완료 시각을 서버 로컬 naive datetime으로 변환 (미래 시각은 현재로 보정)"""
+        now = datetime.now()
+        if completed_at is None:
+            return now
+        if completed_at.tzinfo is not None:
+            completed_at = completed_at.astimezone().replace(tzinfo=None)
+        return min(completed_at, now)
 
     def skip_remaining_tasks(self, weekly_plan_id: int) -> int:
         """
         특정 주간 계획 내의 처리되지 않은 태스크들을 스킵 처리
         주간 전환 시 호출됨
         """
-        tasks_to_skip = (
-            self.db.query(SMALLSTEP_TASKS)
-            .filter(
+        result = self.db.execute(
+            update(SMALLSTEP_TASKS)
+            .where(
                 SMALLSTEP_TASKS.weekly_plan_id == weekly_plan_id,
                 SMALLSTEP_TASKS.status.in_(['AVAILABLE', 'LOCKED'])
             )
-            .all()
+            .values(status='SKIPPED')
         )
-        
-        count = 0
-        for task in tasks_to_skip:
-            task.status = 'SKIPPED'
-            count += 1
-            
+        count = result.rowcount
+
+        self.apply_progress(weekly_plan_id, skipped=count)
+
+        owner = (
+            self.db.query(SMALLSTEP_GOALS.id, SMALLSTEP_GOALS.user_id)
+            .join(SMALLSTEP_WEEKLY_PLANS, SMALLSTEP_WEEKLY_PLANS.goal_id == SMALLSTEP_GOALS.id)
+            .filter(SMALLSTEP_WEEKLY_PLANS.id == weekly_plan_id)
+            .first()
+        )
+        if owner:
+            invalidate_on_commit(self.db, goal_tag(owner.id), user_tag(owner.user_id))
+            if count:
+                emit_on_commit(self.db, TasksSkipped(
+                    user_id=owner.user_id, goal_id=owner.id, weekly_plan_id=weekly_plan_id, count=count,
+                ))
+
         self.db.commit()
         return count
 
+    def register_plan_tasks(self, weekly_plan: SMALLSTEP_WEEKLY_PLANS, task_count: int):
+        """새 주간 계획에 생성된 태스크 수를 카운터 초기값으로 반영"""
+        weekly_plan.completed_count = 0
+        weekly_plan.skipped_count = 0
+        weekly_plan.remaining_count = task_count
+        self.db.execute(
+            update(SMALLSTEP_PHASES)
+            .where(SMALLSTEP_PHASES.id == weekly_plan.phase_id)
+            .values(remaining_task_count=SMALLSTEP_PHASES.remaining_task_count + task_count)
+        )
+
+    def apply_progress(self, weekly_plan_id: int, completed: int = 0, skipped: int = 0):
+        """
+        주간 계획과 소속 Phase의 진행 카운터를 원자적으로 갱신
+        (UPDATE ... SET col = col + n, 커밋은 호출자 책임)
+        """
+        processed = completed + skipped
+        if processed == 0:
+            return
+
+        self.db.execute(
+            update(SMALLSTEP_WEEKLY_PLANS)
+            .where(SMALLSTEP_WEEKLY_PLANS.id == weekly_plan_id)
+            .values(
+                completed_count=SMALLSTEP_WEEKLY_PLANS.completed_count + completed,
+                skipped_count=SMALLSTEP_WEEKLY_PLANS.skipped_count + skipped,
+                remaining_count=SMALLSTEP_WEEKLY_PLANS.remaining_count - processed,
+            )
+        )
+        phase_id = (
+            self.db.query(SMALLSTEP_WEEKLY_PLANS.phase_id)
+            .filter(SMALLSTEP_WEEKLY_PLANS.id == weekly_plan_id)
+            .scalar()
+        )
+        self.db.execute(
+            update(SMALLSTEP_PHASES)
+            .where(SMALLSTEP_PHASES.id == phase_id)
+            .values(
+                completed_task_count=SMALLSTEP_PHASES.completed_task_count + completed,
+                skipped_task_count=SMALLSTEP_PHASES.skipped_task_count + skipped,
+                remaining_task_count=SMALLSTEP_PHASES.remaining_task_count - processed,
+            )
+        )
+
+    def remaining_count(self, weekly_plan_id: int) -> int:
+        """주간 계획의 남은(AVAILABLE/LOCKED) 태스크 수 - 카운터 컬럼 조회"""
+        return (
+            self.db.query(SMALLSTEP_WEEKLY_PLANS.remaining_count)
+            .filter(SMALLSTEP_WEEKLY_PLANS.id == weekly_plan_id)
+            .scalar()
+        ) or 0
+
     def _activate_next_task(self, current_task: SMALLSTEP_TASKS):
-        """현재 태스크 다음 순서의 태스크를 찾아 활성화"""
-        next_task = (
-            self.db.query(SMALLSTEP_TASKS)
+        """현재 태스크 다음 순서의 태스크가 LOCKED이면 조건부 UPDATE로 활성화"""
+        next_task_id = (
+            self.db.query(SMALLSTEP_TASKS.id)
             .filter(
                 SMALLSTEP_TASKS.weekly_plan_id == current_task.weekly_plan_id,
                 SMALLSTEP_TASKS.task_order > current_task.task_order
             )
             .order_by(SMALLSTEP_TASKS.task_order)
-            .first()
+            .limit(1)
+            .scalar()
         )
-        
-        if next_task and next_task.status == 'LOCKED':
-            next_task.status = 'AVAILABLE'
+
+        if next_task_id:
+            self.db.execute(
+                update(SMALLSTEP_TASKS)
+                .where(SMALLSTEP_TASKS.id == next_task_id, SMALLSTEP_TASKS.status == 'LOCKED')
+                .values(status='AVAILABLE')
+            )
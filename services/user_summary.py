@@ -0,0 +1,141 @@
+"""
+사용자 요약 서비스 (v2)
+대시보드용 SMALLSTEP_USER_SUMMARY 읽기 모델을 쓰기 경로와 같은 트랜잭션에서 증분 갱신합니다.
+"""
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func, update
+from services.core.cache import invalidate_on_commit, user_tag
+from models import (
+    SMALLSTEP_USER_SUMMARY,
+    SMALLSTEP_GOALS,
+    SMALLSTEP_PHASES,
+    SMALLSTEP_TASKS,
+)
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COUNTERS = ('total_goals', 'completed_goals', 'completed_phases', 'completed_tasks')
+
+
+class UserSummaryService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, user_id: int) -> SMALLSTEP_USER_SUMMARY:
+        """
+        요약 행을 조회합니다. 행이 없으면 원본 테이블에서 계산한 값을 세션에 추가하지 않은 객체로 반환합니다.
+        (읽기 전용 - 복제본 세션에서도 사용 가능. 행 생성은 create/rebuild와 쓰기 경로의 increment가 담당)
+        """
+        summary = self.db.get(SMALLSTEP_USER_SUMMARY, user_id)
+        if summary is None:
+            summary = SMALLSTEP_USER_SUMMARY(user_id=user_id, **self.compute(user_id))
+        return summary
+
+    def increment(self, user_id: int, **deltas: int):
+        """
+        카운터를 원자적으로 증감 (UPDATE ... SET col = col + n)
+        커밋은 호출자의 쓰기 트랜잭션에 맡깁니다.
+        """
+        values = {
+            getattr(SMALLSTEP_USER_SUMMARY, name): getattr(SMALLSTEP_USER_SUMMARY, name) + delta
+            for name, delta in deltas.items()
+            if delta
+        }
+        if not values:
+            return
+        invalidate_on_commit(self.db, user_tag(user_id))
+
+        # 같은 트랜잭션의 미반영 변경을 먼저 flush (재계산 시 포함되도록)
+        self.db.flush()
+        result = self.db.execute(
+            update(SMALLSTEP_USER_SUMMARY)
+            .where(SMALLSTEP_USER_SUMMARY.user_id == user_id)
+            .values(values)
+        )
+        if result.rowcount == 0:
+            # 요약 행이 아직 없으면 현재 상태로 생성 (이번 변경분도 이미 반영됨)
+            self.rebuild(user_id)
+
+    def create(self, user_id: int) -> SMALLSTEP_USER_SUMMARY:
+        """신규 사용자용 빈 요약 행 생성"""
+        summary = SMALLSTEP_USER_SUMMARY(user_id=user_id)
+        self.db.add(summary)
+        return summary
+
+    def on_goal_created(self, user_id: int):
+        self.increment(user_id, total_goals=1)
+
+    def on_goal_status_changed(self, user_id: int, old_status: str, new_status: str):
+        if old_status == new_status:
+            return
+        if new_status == 'completed':
+            self.increment(user_id, completed_goals=1)
+        elif old_status == 'completed':
+            self.increment(user_id, completed_goals=-1)
+
+    def on_phase_completed(self, user_id: int):
+        self.increment(user_id, completed_phases=1)
+
+    def on_task_completed(self, user_id: int, count: int = 1):
+        self.increment(user_id, completed_tasks=count)
+
+    def compute(self, user_id: int) -> dict:
+        """원본 테이블(GOALS/PHASES/TASKS)에서 요약 값을 집계합니다."""
+        goal_row = (
+            self.db.query(
+                func.count(SMALLSTEP_GOALS.id),
+                func.coalesce(func.sum(case((SMALLSTEP_GOALS.status == 'completed', 1), else_=0)), 0),
+            )
+            .filter(SMALLSTEP_GOALS.user_id == user_id)
+            .one()
+        )
+        completed_phases = (
+            self.db.query(func.count(SMALLSTEP_PHASES.id))
+            .join(SMALLSTEP_GOALS)
+            .filter(SMALLSTEP_GOALS.user_id == user_id, SMALLSTEP_PHASES.status == 'COMPLETED')
+            .scalar()
+        )
+        completed_tasks = (
+            self.db.query(func.count(SMALLSTEP_TASKS.id))
+            .join(SMALLSTEP_GOALS)
+            .filter(SMALLSTEP_GOALS.user_id == user_id, SMALLSTEP_TASKS.status == 'COMPLETED')
+            .scalar()
+        )
+        return {
+            'total_goals': goal_row[0] or 0,
+            'completed_goals': int(goal_row[1] or 0),
+            'completed_phases': completed_phases or 0,
+            'completed_tasks': completed_tasks or 0,
+        }
+
+    def rebuild(self, user_id: int) -> SMALLSTEP_USER_SUMMARY:
+        """요약 행을 원본 테이블 기준으로 다시 계산 (커밋은 호출자 책임)"""
+        values = self.compute(user_id)
+        summary = self.db.get(SMALLSTEP_USER_SUMMARY, user_id)
+        if summary is None:
+            summary = SMALLSTEP_USER_SUMMARY(user_id=user_id, **values)
+            self.db.add(summary)
+        else:
+            for name, value in values.items():
+                setattr(summary, name, value)
+        self.db.flush()
+        return summary
+
+    def reconcile(self, user_id: int, fix: bool = True) -> dict:
+        """
+        요약 행과 원본 집계를 비교하여 차이(drift)를 반환
+        fix=True면 차이가 있을 때 요약 행을 교정합니다.
+        """
+        expected = self.compute(user_id)
+        summary = self.db.get(SMALLSTEP_USER_SUMMARY, user_id)
+        actual = {name: getattr(summary, name) for name in SUMMARY_COUNTERS} if summary else None
+        drift = {
+            name: (actual[name] if actual else None, expected[name])
+            for name in SUMMARY_COUNTERS
+            if actual is None or actual[name] != expected[name]
+        }
+        if drift and fix:
+            self.rebuild(user_id)
+            logger.warning(f"User summary drift fixed for user {user_id}: {drift}")
+        return drift
@@ -3,9 +3,15 @@
 주간 전환 로직(미완료 태스크 스킵 처리, 새 주간 계획 생성 등)을 관리합니다.
 """
 import logging
-from sqlalchemy.orm import Session
-from models import SMALLSTEP_WEEKLY_PLANS, SMALLSTEP_TASKS
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, aliased
+from models import SMALLSTEP_WEEKLY_PLANS, SMALLSTEP_PHASES, SMALLSTEP_GOALS
 from services.task_state_machine import TaskStateMachine
+from services.user_summary import UserSummaryService
+from services.analytics import GoalCompleted, PhaseCompleted, emit_on_commit
+from services.core.cache import invalidate_on_commit, goal_tag, user_tag
 from services.ai.weekly_planner import generate_weekly_plan
 
 logger = logging.getLogger(__name__)
@@ -31,56 +37,101 @@ class WeeklySchedulerService:
         new_plan = generate_weekly_plan(goal_id=goal_id, phase_id=phase_id, db=self.db)
         return new_plan
 
-    def check_phase_completion(self, phase_id: int) -> bool:
+    def check_phase_completion(self, phase_id: int, commit: bool = True,
+                               completed_at: Optional[datetime] = None) -> bool:
         """
-        현재 Phase가 완료 조건(모든 주간 계획의 태스크 완료)을
+        현재 Phase가 완료 조건(모든 주간 계획의 태스크 처리 완료)을
         충족했는지 검사하고, 충족 시 다음 Phase를 활성화합니다.
+        마지막 Phase였다면 목표 완료까지 함께 처리합니다.
+        completed_at은 Phase를 끝낸 태스크의 완료 시각으로, 보너스 활동 로그에 기록됩니다. (오프라인 동기화)
         """
-        from models import SMALLSTEP_PHASES
-        
-        phase = self.db.query(SMALLSTEP_PHASES).filter(SMALLSTEP_PHASES.id == phase_id).first()
-        if not phase or phase.status == 'COMPLETED':
-            return False
-            
-        plans = self.db.query(SMALLSTEP_WEEKLY_PLANS).filter(SMALLSTEP_WEEKLY_PLANS.phase_id == phase_id).all()
-        if not plans:
+        now = datetime.now()
+
+        # 1. 조건부 UPDATE 한 번으로 완료 판정 + 전환
+        #    (롤업 카운터 기준, 동시 호출 시에도 한 요청만 rowcount=1을 얻음)
+        result = self.db.execute(
+            update(SMALLSTEP_PHASES)
+            .where(
+                SMALLSTEP_PHASES.id == phase_id,
+                SMALLSTEP_PHASES.status != 'COMPLETED',
+                SMALLSTEP_PHASES.remaining_task_count == 0,
+                SMALLSTEP_PHASES.completed_task_count + SMALLSTEP_PHASES.skipped_task_count > 0,
+            )
+            .values(status='COMPLETED', completed_at=now)
+        )
+        if result.rowcount == 0:
             return False
-            
-        # 모든 주간 계획의 태스크 상태 검사
-        all_completed = True
-        for plan in plans:
-            tasks = self.db.query(SMALLSTEP_TASKS).filter(SMALLSTEP_TASKS.weekly_plan_id == plan.id).all()
-            if not tasks:
-                all_completed = False
-                break
-            for task in tasks:
-                if task.status not in ['COMPLETED', 'SKIPPED']:
-                    all_completed = False
-                    break
-            if not all_completed:
-                break
-                
-        if all_completed:
-            # 현재 Phase 완료 처리
-            phase.status = 'COMPLETED'
-            phase.completed_at = __import__('datetime').datetime.now()
-            
-            # 게이미피케이션 보너스 부여
-            from services.gamification import GamificationService
-            GamificationService(self.db).award_phase_completion_bonus(user_id=phase.goal.user_id, goal_id=phase.goal_id)
-            
-            # 다음 Phase 활성화
-            next_phase = (
-                self.db.query(SMALLSTEP_PHASES)
-                .filter(SMALLSTEP_PHASES.goal_id == phase.goal_id, SMALLSTEP_PHASES.phase_order > phase.phase_order)
-                .order_by(SMALLSTEP_PHASES.phase_order)
-                .first()
+
+        # 2. 목표/사용자/다음 Phase를 한 번의 조회로 수집
+        next_phase = aliased(SMALLSTEP_PHASES)
+        next_phase_id = (
+            select(next_phase.id)
+            .where(
+                next_phase.goal_id == SMALLSTEP_PHASES.goal_id,
+                next_phase.phase_order > SMALLSTEP_PHASES.phase_order,
             )
-            if next_phase:
-                next_phase.status = 'ACTIVE'
-                
+            .order_by(next_phase.phase_order)
+            .limit(1)
+            .scalar_subquery()
+        )
+        goal_id, user_id, next_id = (
+            self.db.query(SMALLSTEP_PHASES.goal_id, SMALLSTEP_GOALS.user_id, next_phase_id)
+            .join(SMALLSTEP_GOALS, SMALLSTEP_GOALS.id == SMALLSTEP_PHASES.goal_id)
+            .filter(SMALLSTEP_PHASES.id == phase_id)
+            .one()
+        )
+        invalidate_on_commit(self.db, goal_tag(goal_id), user_tag(user_id))
+        emit_on_commit(self.db, PhaseCompleted(user_id=user_id, goal_id=goal_id, phase_id=phase_id))
+
+        # 3. 다음 Phase 활성화 (PENDING일 때만)
+        if next_id:
+            self.db.execute(
+                update(SMALLSTEP_PHASES)
+                .where(SMALLSTEP_PHASES.id == next_id, SMALLSTEP_PHASES.status == 'PENDING')
+                .values(status='ACTIVE', started_at=now)
+            )
+
+        # 대시보드 요약 갱신 + 게이미피케이션 보너스 부여
+        UserSummaryService(self.db).on_phase_completed(user_id)
+        from services.gamification import GamificationService
+        GamificationService(self.db).award_phase_completion_bonus(
+            user_id=user_id, goal_id=goal_id, completed_at=completed_at
+        )
+
+        # 4. 마지막 Phase였다면 목표 완료 검사
+        if not next_id:
+            self.check_goal_completion(goal_id, user_id)
+
+        if commit:
             self.db.commit()
-            logger.info(f"Phase {phase_id} completed. Next phase activated if exists.")
-            return True
-            
-        return False
+        logger.info(f"Phase {phase_id} completed. Next phase: {next_id}")
+        return True
+
+    def check_goal_completion(self, goal_id: int, user_id: int) -> bool:
+        """
+        목표의 모든 Phase가 COMPLETED이면 목표를 completed로 전환
+        (조건부 UPDATE 한 번, 커밋은 호출자 책임)
+        """
+        unfinished_phase = (
+            select(SMALLSTEP_PHASES.id)
+            .where(SMALLSTEP_PHASES.goal_id == goal_id, SMALLSTEP_PHASES.status != 'COMPLETED')
+            .exists()
+        )
+        result = self.db.execute(
+            update(SMALLSTEP_GOALS)
+            .where(
+                SMALLSTEP_GOALS.id == goal_id,
+                SMALLSTEP_GOALS.status != 'completed',
+                ~unfinished_phase,
+            )
+            .values(status='completed')
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            return False
+
+        invalidate_on_commit(self.db, goal_tag(goal_id), user_tag(user_id))
+        emit_on_commit(self.db, GoalCompleted(user_id=user_id, goal_id=goal_id))
+        UserSummaryService(self.db).increment(user_id, completed_goals=1)
+        logger.info(f"Goal {goal_id} completed (all phases completed).")
+        return True